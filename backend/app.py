@@ -35,13 +35,31 @@ if __name__ == '__main__':
     port = int(os.environ.get("PORT", 5000))
     app.run(host="0.0.0.0", port=port, debug=False)
 '''
-from flask import Flask, request, jsonify
+from flask import Flask, abort, request, jsonify, g
 from flask_cors import CORS
 from routes import api_bp
+import calendar_queue
+import metrics
+import profiling
+import render_service
+import uploads
+import warmup
 import os
 import re
+import time
 
 app = Flask(__name__)
+# Multipart files spool to disk; bodies over the cap get a 413 before they are read
+app.request_class = uploads.UploadRequest
+app.config["MAX_CONTENT_LENGTH"] = uploads.MAX_REQUEST_BYTES
+
+# Shared with the ASGI app (async_api.py) so both answer preflights the same way
+CORS_ORIGIN_REGEX = r"https://.*\.vercel\.app$"
+CORS_ORIGINS = ["http://localhost:3000", "http://127.0.0.1:3000"]
+CORS_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"]
+CORS_ALLOW_HEADERS = ["Content-Type", "Authorization", "If-None-Match", profiling.TOKEN_HEADER]
+CORS_EXPOSE_HEADERS = ["Content-Disposition", "ETag", profiling.ID_HEADER]
+CORS_MAX_AGE = 86400  # cache preflight for a day
 
 # ✅ Allow any Vercel deploy of your app + localhost (regex), and handle common preflight bits
 CORS(
@@ -49,24 +67,48 @@ CORS(
     resources={
         r"/api/*": {
             # Accept any https://<anything>.vercel.app plus your old hashed URL and localhost
-            "origins": [
-                re.compile(r"https://.*\.vercel\.app$"),
-                "http://localhost:3000",
-                "http://127.0.0.1:3000",
-            ],
-            "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Authorization"],
-            "expose_headers": ["Content-Disposition"],
-            "max_age": 86400,            # cache preflight for a day
+            "origins": [re.compile(CORS_ORIGIN_REGEX), *CORS_ORIGINS],
+            "methods": CORS_METHODS,
+            "allow_headers": CORS_ALLOW_HEADERS,
+            "expose_headers": CORS_EXPOSE_HEADERS,
+            "max_age": CORS_MAX_AGE,
             "supports_credentials": False
         }
     }
 )
 
-# Simple request logging
+# Request logging for the dev server; under gunicorn the access log covers this
 @app.before_request
 def log_request_info():
-    print(f"[REQUEST] {request.method} {request.path} from {request.remote_addr}")
+    g.request_started = time.perf_counter()
+    app.logger.debug("%s %s from %s", request.method, request.path, request.remote_addr)
+
+@app.after_request
+def record_request_duration(response):
+    started = g.get("request_started")
+    if started is not None:
+        # Route pattern, not the raw path, to keep label cardinality bounded
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        metrics.REQUEST_SECONDS.observe(
+            time.perf_counter() - started,
+            method=request.method, endpoint=endpoint, status=str(response.status_code),
+        )
+    return response
+
+# Opt-in sampling profiler (PROFILE_TOKEN / PROFILE_SAMPLE_RATE); registers nothing when off
+profiling.init_app(app)
+
+# Refuse oversized bodies from Content-Length up front: views that catch Exception
+# would otherwise turn the RequestEntityTooLarge raised on reading into a 500
+@app.before_request
+def reject_oversized_body():
+    limit = request.max_content_length
+    if limit is not None and (request.content_length or 0) > limit:
+        abort(413)
+
+@app.errorhandler(413)
+def request_too_large(e):
+    return jsonify({"error": "UPLOAD_TOO_LARGE"}), 413
 
 # Health check (handy for quick tests)
 @app.route("/api/health", methods=["GET"])
@@ -86,6 +128,13 @@ def home():
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
+    # Pre-warm heavy imports and the PDF/DOCX worker processes (WARMUP=preload|background|off)
+    if warmup.WARMUP == "background":
+        warmup.start_background()
+    elif warmup.WARMUP == "preload":
+        warmup.preload()
+        render_service.start()
+    calendar_queue.resume()
     app.run(host="0.0.0.0", port=port, debug=True, use_reloader=False)
 
 
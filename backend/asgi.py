@@ -0,0 +1,30 @@
+# backend/asgi.py
+# ------------------------------------------------------------
+# ASGI entry point. /api/parse-resume and /api/generate-elevator-pitch
+# are served natively async (async_api.py); every other route goes to
+# the Flask app through a WSGI adapter with its own thread pool.
+#
+#   gunicorn -c gunicorn.conf.py -k uvicorn.workers.UvicornWorker asgi:app
+#   uvicorn asgi:app --host 0.0.0.0 --port $PORT --workers 4
+#
+# The gunicorn form keeps preload_app / post_fork from gunicorn.conf.py.
+# ------------------------------------------------------------
+import os
+
+from a2wsgi import WSGIMiddleware
+
+import async_api
+from wsgi import app as flask_app  # runs the WARMUP preload and gunicorn log wiring
+
+# Threads for the synchronous Flask routes (render, export, assets, ...)
+WSGI_THREADS = int(os.getenv("WSGI_THREADS", "8"))
+
+_flask = WSGIMiddleware(flask_app, workers=WSGI_THREADS)
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "http" and scope["path"] not in async_api.PATHS:
+        await _flask(scope, receive, send)
+    else:
+        # Async routes plus lifespan events
+        await async_api.app(scope, receive, send)
@@ -0,0 +1,218 @@
+# backend/asset_store.py
+import base64
+import hashlib
+import io
+import os
+import re
+import threading
+from collections import OrderedDict
+
+# ------------------------------------------------------------
+# Content-addressed image store for logos / profile pictures.
+# Images are normalized + downsized once with Pillow, written to
+# disk under their sha256, and the decoded bytes of the most recently
+# used ones (up to ASSET_CACHE_MAX_BYTES per process) are kept in
+# memory so generator requests only carry a short asset id. Evicted
+# assets are read back from disk on their next use.
+# ------------------------------------------------------------
+
+ASSET_STORE_DIR = os.getenv(
+    "ASSET_STORE_DIR",
+    os.path.join(os.path.dirname(__file__), "data", "assets"),
+)
+MAX_ASSET_DIMENSION = int(os.getenv("MAX_ASSET_DIMENSION", "512"))
+MAX_ASSET_UPLOAD_BYTES = int(os.getenv("MAX_ASSET_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+ASSET_CACHE_MAX_BYTES = int(os.getenv("ASSET_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Upload hashes remembered per process (repeat uploads skip Pillow)
+ASSET_ALIAS_ENTRIES = int(os.getenv("ASSET_ALIAS_ENTRIES", "4096"))
+
+ASSET_ID = re.compile(r"^[0-9a-f]{64}$")
+ASSET_URL_PREFIX = "asset:"
+
+_EXT_BY_MIME = {"image/png": "png", "image/jpeg": "jpg"}
+_MIME_BY_EXT = {v: k for k, v in _EXT_BY_MIME.items()}
+
+_lock = threading.Lock()
+_assets = OrderedDict()       # asset_id -> {"bytes", "mime", "width", "height"}, LRU order
+_assets_size = 0
+_raw_aliases = OrderedDict()  # sha256(raw upload) -> asset_id, skips re-normalizing repeats
+
+
+class InvalidAsset(ValueError):
+    """Raised when an upload cannot be decoded as an image."""
+
+
+def _normalize(raw: bytes):
+    """Decode, orient, downsize and re-encode an image. Returns (bytes, mime, w, h)."""
+    from PIL import Image, ImageOps
+
+    try:
+        img = Image.open(io.BytesIO(raw))
+        img.load()
+    except Exception as e:
+        raise InvalidAsset(f"Could not decode image: {e}")
+
+    img = ImageOps.exif_transpose(img)
+    has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+    img = img.convert("RGBA" if has_alpha else "RGB")
+    img.thumbnail((MAX_ASSET_DIMENSION, MAX_ASSET_DIMENSION), Image.LANCZOS)
+
+    out = io.BytesIO()
+    if has_alpha:
+        img.save(out, format="PNG", optimize=True)
+        mime = "image/png"
+    else:
+        img.save(out, format="JPEG", quality=85, optimize=True)
+        mime = "image/jpeg"
+    return out.getvalue(), mime, img.width, img.height
+
+
+def _path_for(asset_id: str, mime: str) -> str:
+    return os.path.join(ASSET_STORE_DIR, f"{asset_id}.{_EXT_BY_MIME[mime]}")
+
+
+def _load_from_disk(asset_id: str):
+    from PIL import Image
+
+    for ext, mime in _MIME_BY_EXT.items():
+        path = os.path.join(ASSET_STORE_DIR, f"{asset_id}.{ext}")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                data = f.read()
+            with Image.open(io.BytesIO(data)) as img:
+                width, height = img.size
+            return {"bytes": data, "mime": mime, "width": width, "height": height}
+    return None
+
+
+def _cached_size(record: dict) -> int:
+    """Bytes a cached record holds: the image plus its data: URI once one was built."""
+    return len(record["bytes"]) + len(record.get("data_uri", ""))
+
+
+def _evict():
+    """Drops least recently used records past ASSET_CACHE_MAX_BYTES. Call with _lock held."""
+    global _assets_size
+    while _assets_size > ASSET_CACHE_MAX_BYTES and len(_assets) > 1:
+        _, evicted = _assets.popitem(last=False)
+        _assets_size -= _cached_size(evicted)
+
+
+def _remember(asset_id: str, record: dict):
+    """Caches a record, evicting least recently used ones past ASSET_CACHE_MAX_BYTES. Call with _lock held."""
+    global _assets_size
+    old = _assets.pop(asset_id, None)
+    if old is not None:
+        _assets_size -= _cached_size(old)
+    _assets[asset_id] = record
+    _assets_size += _cached_size(record)
+    _evict()
+
+
+def decode_base64_image(b64: str) -> bytes:
+    """Accepts plain base64 or a data: URI and returns the raw bytes."""
+    if b64.startswith("data:"):
+        b64 = b64.split(",", 1)[1]
+    try:
+        return base64.b64decode(b64, validate=True)
+    except Exception as e:
+        raise InvalidAsset(f"Invalid base64 image: {e}")
+
+
+def put_asset(raw: bytes) -> dict:
+    """Stores an image and returns its metadata (including the content-hash id)."""
+    if not raw:
+        raise InvalidAsset("Empty image upload.")
+    if len(raw) > MAX_ASSET_UPLOAD_BYTES:
+        raise InvalidAsset("Image upload is too large.")
+
+    raw_key = hashlib.sha256(raw).hexdigest()
+    with _lock:
+        asset_id = _raw_aliases.get(raw_key)
+    if asset_id is not None:
+        # Reloaded from disk if it has left the in-memory cache
+        described = describe_asset(asset_id)
+        if described:
+            return described
+
+    data, mime, width, height = _normalize(raw)
+    asset_id = hashlib.sha256(data).hexdigest()
+
+    path = _path_for(asset_id, mime)
+    if not os.path.exists(path):
+        os.makedirs(ASSET_STORE_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    with _lock:
+        _remember(asset_id, {"bytes": data, "mime": mime, "width": width, "height": height})
+        _raw_aliases[raw_key] = asset_id
+        while len(_raw_aliases) > ASSET_ALIAS_ENTRIES:
+            _raw_aliases.popitem(last=False)
+    return describe_asset(asset_id)
+
+
+def get_asset(asset_id: str):
+    """Returns the cached asset record, loading it from disk on first use or after eviction."""
+    if not asset_id or not ASSET_ID.match(asset_id):
+        return None
+    with _lock:
+        record = _assets.get(asset_id)
+        if record:
+            _assets.move_to_end(asset_id)
+    if record:
+        return record
+    record = _load_from_disk(asset_id)
+    if record:
+        with _lock:
+            _remember(asset_id, record)
+    return record
+
+
+def describe_asset(asset_id: str):
+    record = get_asset(asset_id)
+    if not record:
+        return None
+    return {
+        "assetId": asset_id,
+        "mimeType": record["mime"],
+        "width": record["width"],
+        "height": record["height"],
+        "size": len(record["bytes"]),
+    }
+
+
+def asset_url(asset_id: str) -> str:
+    """URL understood by `asset_url_fetcher` (used as <img src> in the PDF template)."""
+    return f"{ASSET_URL_PREFIX}{asset_id}"
+
+
+def asset_data_uri(asset_id: str):
+    """data: URI for standalone HTML output; kept with the cached record (and counted in its size)."""
+    global _assets_size
+    record = get_asset(asset_id)
+    if not record:
+        return None
+    uri = record.get("data_uri")
+    if uri is None:
+        uri = f"data:{record['mime']};base64,{base64.b64encode(record['bytes']).decode('ascii')}"
+        with _lock:
+            # Only a record still in the cache keeps it; an evicted one is garbage already
+            if _assets.get(asset_id) is record and "data_uri" not in record:
+                record["data_uri"] = uri
+                _assets_size += len(uri)
+                _evict()
+    return uri
+
+
+def asset_url_fetcher(url, *args, **kwargs):
+    """WeasyPrint url_fetcher serving asset: URLs straight from the in-memory cache."""
+    if url.startswith(ASSET_URL_PREFIX):
+        record = get_asset(url[len(ASSET_URL_PREFIX):])
+        if not record:
+            raise ValueError(f"Unknown asset: {url}")
+        return {"string": record["bytes"], "mime_type": record["mime"]}
+    from weasyprint import default_url_fetcher
+    return default_url_fetcher(url, *args, **kwargs)
@@ -0,0 +1,155 @@
+# backend/async_api.py
+import asyncio
+import functools
+import logging
+import time
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+import app as flask_app_module
+import llm_requests
+import metrics
+import profiling
+import uploads
+
+# ------------------------------------------------------------
+# Native async versions of the LLM-bound endpoints. Each request
+# awaits Gemini on the event loop instead of parking a WSGI thread
+# for the whole call, so one worker process can hold hundreds of
+# parses / pitches in flight. asgi.py routes these paths here and
+# everything else to the Flask app. Validation and response shapes
+# come from llm_requests, shared with the Flask views.
+# ------------------------------------------------------------
+
+# Shares the Flask app's handlers under gunicorn (see wsgi.py)
+logger = logging.getLogger(__name__)
+
+
+def _reply(result):
+    """JSONResponse for a (status, body) pair from llm_requests."""
+    status, body = result
+    return JSONResponse(body, status_code=status)
+
+
+class _BodyTooLarge(Exception):
+    """The request body ran past its cap while it was being read."""
+
+
+def _capped(request, limit):
+    """
+    The same request, except that reading its body raises _BodyTooLarge as soon
+    as more than `limit` bytes have arrived (chunked bodies carry no Content-Length).
+    """
+    received = 0
+
+    async def receive():
+        nonlocal received
+        message = await request.receive()
+        if message["type"] == "http.request":
+            received += len(message.get("body", b""))
+            if received > limit:
+                raise _BodyTooLarge()
+        return message
+
+    return Request(request.scope, receive)
+
+
+def _timed(view):
+    """Records request latency for the async routes (the Flask app does its own)."""
+    @functools.wraps(view)
+    async def wrapper(request):
+        started = time.perf_counter()
+        status = "500"
+        try:
+            response = await view(request)
+            status = str(response.status_code)
+            return response
+        finally:
+            metrics.REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                method=request.method, endpoint=request.url.path, status=status,
+            )
+    return wrapper
+
+
+@_timed
+async def parse_resume(request):
+    # Refuse oversized bodies from Content-Length before reading them
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > uploads.MAX_UPLOAD_BYTES:
+        return JSONResponse({"error": "UPLOAD_TOO_LARGE"}, status_code=413)
+
+    # Multipart files spool to disk past python-multipart's in-memory threshold;
+    # a body without Content-Length is cut off once it passes the cap
+    try:
+        form = await _capped(request, uploads.MAX_UPLOAD_BYTES).form()
+    except _BodyTooLarge:
+        return JSONResponse({"error": "UPLOAD_TOO_LARGE"}, status_code=413)
+    try:
+        file = form.get("file")
+        # A file input left empty arrives as a plain field (filename="")
+        filename = None if file is None else "" if isinstance(file, str) else file.filename
+        error = llm_requests.check_upload(filename, getattr(file, "size", None))
+        if error:
+            return _reply(error)
+
+        kind, error = await asyncio.to_thread(llm_requests.sniff_upload, file.file)
+        if error:
+            return _reply(error)
+
+        from file_parser import parse_resume_stream_async
+
+        thumbnail_id = await asyncio.to_thread(llm_requests.start_thumbnail, kind, file.file)
+        result = await parse_resume_stream_async(file.filename, file.file, kind)
+        return _reply(llm_requests.parse_result(result, thumbnail_id))
+    except Exception:
+        logger.error("Unexpected error in async /api/parse-resume", exc_info=True)
+        return _reply(llm_requests.PARSE_FAILED)
+    finally:
+        await form.close()
+
+
+@_timed
+async def generate_elevator_pitch(request):
+    try:
+        try:
+            payload = await request.json() or {}
+        except ValueError:
+            payload = {}
+
+        resume_data, error = await asyncio.to_thread(llm_requests.pitch_input, payload)
+        if error:
+            return _reply(error)
+
+        from gemini_utils import generate_elevator_pitch_async
+        return _reply(llm_requests.pitch_result(await generate_elevator_pitch_async(resume_data)))
+    except Exception:
+        logger.error("Elevator pitch generation failed", exc_info=True)
+        return _reply(llm_requests.PITCH_FAILED)
+
+
+app = Starlette(
+    routes=[
+        Route("/api/parse-resume", parse_resume, methods=["POST"]),
+        Route("/api/generate-elevator-pitch", generate_elevator_pitch, methods=["POST"]),
+    ],
+    middleware=[
+        *profiling.asgi_middleware(),
+        Middleware(
+            CORSMiddleware,
+            allow_origin_regex=flask_app_module.CORS_ORIGIN_REGEX,
+            allow_origins=flask_app_module.CORS_ORIGINS,
+            allow_methods=flask_app_module.CORS_METHODS,
+            allow_headers=flask_app_module.CORS_ALLOW_HEADERS,
+            expose_headers=flask_app_module.CORS_EXPOSE_HEADERS,
+            max_age=flask_app_module.CORS_MAX_AGE,
+        )
+    ],
+)
+
+PATHS = frozenset(route.path for route in app.routes)
@@ -0,0 +1,78 @@
+# backend/benchmarks/bench_docx_engine.py
+"""
+Compares docx_engine.generate_docx against document_generator.generate_docx_from_data.
+
+Run from the backend folder:
+    python benchmarks/bench_docx_engine.py --entries 40 --iterations 50
+"""
+import argparse
+import copy
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from document_generator import generate_docx_from_data  # noqa: E402
+from docx_engine import generate_docx, warm_up  # noqa: E402
+
+
+def sample_resume(entries):
+    bullet = "Improved <strong>throughput</strong> of the <em>ingestion</em> pipeline by 40%<br>"
+    return {
+        "personal": {
+            "name": "Jordan Example",
+            "email": "jordan@example.com",
+            "phone": "555-0100",
+            "location": "Austin, TX",
+            "legalStatus": "Citizen",
+        },
+        "styleOptions": {"fontFamily": "Calibri, sans-serif", "fontSize": 11, "accentColor": "#34495e"},
+        "summary": "Engineer with <strong>10 years</strong> of experience.",
+        "experience": [
+            {"jobTitle": f"Engineer {i}", "company": "Acme", "dates": "2015 - 2020", "description": bullet * 6}
+            for i in range(entries)
+        ],
+        "education": [{"degree": "BS Computer Science", "institution": "State University", "graduationYear": "2014", "gpa": "3.8"}],
+        "skills": [{"category": f"Group {i}", "skills_list": "Python, Go, SQL, Docker"} for i in range(8)],
+        "projects": [{"title": f"Project {i}", "date": "2021", "description": bullet * 3} for i in range(entries // 2)],
+        "publications": [],
+        "certifications": [{"name": "AWS SAA", "issuer": "Amazon", "date": "2022"}],
+    }
+
+
+def bench(fn, data, iterations):
+    timings = []
+    for _ in range(iterations):
+        payload = copy.deepcopy(data)
+        start = time.perf_counter()
+        fn(payload)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=20, help="experience entries in the sample resume")
+    parser.add_argument("--iterations", type=int, default=30)
+    args = parser.parse_args()
+
+    data = sample_resume(args.entries)
+    warm_up()
+    generate_docx_from_data(copy.deepcopy(data))
+
+    results = {
+        "legacy (python-docx)": bench(lambda d: generate_docx_from_data(d).getvalue(), data, args.iterations),
+        "template engine": bench(generate_docx, data, args.iterations),
+    }
+
+    print(f"{'generator':<24}{'mean ms':>10}{'p50 ms':>10}{'min ms':>10}")
+    for name, t in results.items():
+        print(f"{name:<24}{statistics.mean(t):>10.2f}{statistics.median(t):>10.2f}{min(t):>10.2f}")
+    legacy, engine = (statistics.median(t) for t in results.values())
+    print(f"speedup (p50): {legacy / engine:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
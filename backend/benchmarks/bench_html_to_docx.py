@@ -0,0 +1,78 @@
+# backend/benchmarks/bench_html_to_docx.py
+"""
+Microbenchmark for html_to_docx on long, heavily formatted descriptions.
+
+Compares the streaming converter (XML sink used by docx_engine) against a
+BeautifulSoup tree walk, the approach the old _inline_html used, across
+growing input sizes and nesting depths.
+
+Run from the backend folder:
+    python benchmarks/bench_html_to_docx.py
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+import html_to_docx  # noqa: E402
+from docx_engine import _XmlSink  # noqa: E402
+
+
+def description(items, depth):
+    """`items` list entries, each wrapped in `depth` levels of inline formatting."""
+    open_tags = "".join(("<strong>", "<em>", "<span>", "<a href='#'>")[i % 4] for i in range(depth))
+    close_tags = "".join(("</strong>", "</em>", "</span>", "</a>")[i % 4] for i in reversed(range(depth)))
+    li = f"<li>Led {open_tags}migration of 40 services{close_tags} to Kubernetes &amp; cut cost 30%<br>on time</li>"
+    return f"<p>Summary of <strong>impact</strong>:</p><ul>{li * items}</ul><p>Tech: <em>Python</em>, Go</p>"
+
+
+def soup_walk(html):
+    out = []
+
+    def walk(nodes):
+        for n in nodes:
+            if isinstance(n, str):
+                out.append(str(n))
+            elif getattr(n, "contents", None):
+                walk(n.contents)
+
+    walk(BeautifulSoup(html, "html.parser").contents)
+    return out
+
+
+def streaming(html):
+    sink = _XmlSink()
+    html_to_docx.convert(html, sink)
+    return sink.xml()
+
+
+def timed(fn, html, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(html)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'items':>6}{'depth':>7}{'KB':>8}{'stream ms':>12}{'soup ms':>10}{'us/KB':>9}")
+    for items, depth in [(10, 2), (100, 2), (1000, 2), (100, 8), (100, 32), (100, 128)]:
+        html = description(items, depth)
+        kb = len(html) / 1024
+        stream_ms = timed(streaming, html, args.iterations)
+        soup_ms = timed(soup_walk, html, args.iterations)
+        print(f"{items:>6}{depth:>7}{kb:>8.1f}{stream_ms:>12.2f}{soup_ms:>10.2f}{stream_ms * 1000 / kb:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# backend/benchmarks/bench_job_search.py
+"""
+Job search latency at scale.
+
+Loads --postings synthetic jobs into a throwaway store (JOB_STORE_PATH is
+pointed at a temporary file), then times search() for a fixed set of
+queries with and without facet filters, page 2 through the cursor, and a
+single put_jobs() of a new requisition (write + index update). The
+per-query result cache is cleared before each search, so the numbers are
+for scoring, not cache hits (per-term scores stay cached, as in a worker).
+
+Run from the backend folder:
+    python benchmarks/bench_job_search.py
+    python benchmarks/bench_job_search.py --postings 250000 --queries 500
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+TITLES = ["Software Engineer", "Data Scientist", "Product Manager", "DevOps Engineer", "Frontend Developer",
+          "Backend Developer", "Machine Learning Engineer", "QA Analyst", "Site Reliability Engineer",
+          "Technical Recruiter", "Engineering Manager", "Security Analyst"]
+LEVELS = ["Junior", "Senior", "Staff", "Principal", "Lead", ""]
+SKILLS = ["python", "java", "go", "rust", "typescript", "react", "kubernetes", "aws", "gcp", "azure", "sql",
+          "postgres", "spark", "airflow", "terraform", "docker", "pytorch", "tensorflow", "graphql", "kafka",
+          "redis", "linux", "c++", "c#", "node", "django", "flask", "scala", "tableau", "excel"]
+WORDS = ["build", "scalable", "systems", "team", "customers", "platform", "data", "pipelines", "services",
+         "design", "ship", "features", "mentor", "engineers", "collaborate", "cross-functional", "growth",
+         "reliability", "performance", "product", "roadmap", "analytics", "cloud", "infrastructure"]
+LOCATIONS = ["Remote", "New York, NY", "San Francisco, CA", "Austin, TX", "Seattle, WA", "London, UK",
+             "Bangalore, India", "Toronto, ON", "Berlin, Germany", "Chicago, IL"]
+EMPLOYMENT_TYPES = ["Full-time", "Part-time", "Contract", "Internship"]
+# Long tail of rarer words (Zipf-like weights), as in real posting text
+TAIL = [f"term{i}" for i in range(5000)]
+TAIL_WEIGHTS = [1 / (i + 1) for i in range(len(TAIL))]
+QUERIES = ["python", "senior python aws", "react typescript frontend", "machine learning pytorch",
+           "kubernetes terraform", "data pipelines spark airflow", "engineering manager", "security",
+           "java kafka", "site reliability linux", "go", "product roadmap analytics"]
+
+
+def synthetic_jobs(n, seed):
+    rng = random.Random(seed)
+    for i in range(n):
+        skills = rng.sample(SKILLS, 5)
+        words = [rng.choice(WORDS + skills) for _ in range(30)] + rng.choices(TAIL, TAIL_WEIGHTS, k=30)
+        yield {
+            "id": f"job-{i}",
+            "title": f"{rng.choice(LEVELS)} {rng.choice(TITLES)}".strip(),
+            "company": f"Company {rng.randrange(2000)}",
+            "location": rng.choice(LOCATIONS),
+            "employmentType": rng.choice(EMPLOYMENT_TYPES),
+            "requirements": [f"Experience with {s}" for s in skills],
+            "description": " ".join(words),
+            "benefits": ["Health insurance", "401k"],
+            "createdAt": 1_700_000_000 + i,
+        }
+
+
+def _percentiles(samples_ms):
+    samples_ms = sorted(samples_ms)
+
+    def pick(q):
+        return samples_ms[min(len(samples_ms) - 1, int(q * len(samples_ms)))]
+
+    return f"p50 {pick(0.50):7.2f} ms  p95 {pick(0.95):7.2f} ms  p99 {pick(0.99):7.2f} ms" \
+           f"  mean {statistics.fmean(samples_ms):7.2f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--postings", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200, help="searches per case")
+    parser.add_argument("--batch", type=int, default=5000, help="postings per put_jobs() while loading")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["JOB_STORE_PATH"] = os.path.join(tmp.name, "jobs.sqlite3")
+    import job_search
+
+    started = time.perf_counter()
+    batch = []
+    for job in synthetic_jobs(args.postings, args.seed):
+        batch.append(job)
+        if len(batch) >= args.batch:
+            job_search.put_jobs(batch)
+            batch = []
+    if batch:
+        job_search.put_jobs(batch)
+    print(f"Loaded {args.postings} postings in {time.perf_counter() - started:.1f}s "
+          f"({len(job_search._index.postings)} terms)")
+
+    rng = random.Random(args.seed)
+    cases = {
+        "query": lambda q: job_search.search(q),
+        "query + location": lambda q: job_search.search(q, {"location": rng.choice(LOCATIONS)}),
+        "query + both facets": lambda q: job_search.search(
+            q, {"location": rng.choice(LOCATIONS), "employmentType": rng.choice(EMPLOYMENT_TYPES)}),
+        "query, page 2": lambda q: job_search.search(q, cursor=job_search.search(q)["nextCursor"]),
+        "browse (no query) + location": lambda q: job_search.search("", {"location": rng.choice(LOCATIONS)}),
+    }
+    for name, run in cases.items():
+        samples = []
+        for i in range(args.queries):
+            query = QUERIES[i % len(QUERIES)]
+            # Score every time; only the page-2 case is meant to reuse its first page
+            job_search._results.clear()
+            t0 = time.perf_counter()
+            run(query)
+            samples.append((time.perf_counter() - t0) * 1000)
+        print(f"{name:30s} {_percentiles(samples)}")
+
+    samples = []
+    for i in range(min(args.queries, 100)):
+        job = next(synthetic_jobs(1, args.seed + i))
+        job["id"] = f"new-{i}"
+        t0 = time.perf_counter()
+        job_search.put_jobs([job])
+        samples.append((time.perf_counter() - t0) * 1000)
+    print(f"{'put_jobs (1 requisition)':30s} {_percentiles(samples)}")
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
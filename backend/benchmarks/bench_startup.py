@@ -0,0 +1,132 @@
+# backend/benchmarks/bench_startup.py
+"""
+Cold-start measurement for the API.
+
+1. Import-time breakdown: runs `python -X importtime -c "import app"` in a
+   fresh interpreter and lists the slowest modules by cumulative time.
+2. Time to first health response: starts `python app.py` on a free port and
+   polls /api/health until it answers 200 (median over --runs).
+
+Run from the backend folder:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --warmup off --runs 5 --record startup.jsonl
+
+--record appends one JSON line per run of this script (git revision, import
+time, health latency) so startup can be tracked across releases.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_breakdown(module, top):
+    """Returns (total_ms, [(cumulative_ms, self_ms, name)]) for `import module`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us) / 1000, int(self_us) / 1000, name.rstrip()))
+
+    total = next((r[0] for r in rows if r[2].strip() == module), 0.0)
+    rows.sort(reverse=True)
+    return total, rows[:top]
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def time_to_health(warmup, timeout):
+    """Seconds from spawning `python app.py` until /api/health returns 200."""
+    port = _free_port()
+    env = dict(os.environ, PORT=str(port), WARMUP=warmup)
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "app.py"], cwd=BACKEND_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        url = f"http://127.0.0.1:{port}/api/health"
+        while time.perf_counter() - start < timeout:
+            if proc.poll() is not None:
+                raise SystemExit(f"app.py exited with {proc.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as r:
+                    if r.status == 200:
+                        return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError, socket.timeout):
+                time.sleep(0.02)
+        raise SystemExit(f"/api/health did not answer within {timeout}s")
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--warmup", default="off", choices=["preload", "background", "off"])
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--record", help="append a JSON summary line to this file")
+    args = parser.parse_args()
+
+    total, rows = import_breakdown(args.module, args.top)
+    print(f"import {args.module}: {total:.1f} ms")
+    print(f"{'cumul ms':>10}{'self ms':>10}  module")
+    for cumulative, self_ms, name in rows:
+        print(f"{cumulative:>10.1f}{self_ms:>10.1f}  {name}")
+
+    samples = [time_to_health(args.warmup, args.timeout) for _ in range(args.runs)]
+    health = statistics.median(samples)
+    print(f"\ntime to first /api/health (WARMUP={args.warmup}): "
+          f"median {health * 1000:.0f} ms over {args.runs} runs "
+          f"(min {min(samples) * 1000:.0f}, max {max(samples) * 1000:.0f})")
+
+    if args.record:
+        record = {
+            "revision": _git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": sys.version.split()[0],
+            "warmup": args.warmup,
+            "importMs": round(total, 1),
+            "healthMs": round(health * 1000, 1),
+        }
+        with open(args.record, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+# backend/benchmarks/bench_suite.py
+"""
+Benchmark suite with regression thresholds.
+
+Runs each case over a deterministic synthetic corpus (benchmarks/corpus.py)
+and measures throughput (documents/s, median of --repeats passes) and peak
+traced memory per document (tracemalloc, in a separate pass so tracing does
+not skew the timings). Results are compared against a stored baseline;
+the exit status is 1 when any case loses more than --max-throughput-drop
+of its throughput or grows its peak memory by more than --max-memory-growth.
+
+Run from the backend folder:
+    python benchmarks/bench_suite.py --update-baseline      # record a baseline
+    python benchmarks/bench_suite.py                        # compare against it
+    python benchmarks/bench_suite.py --cases extract_pdf,custom_parser
+
+Baselines are machine specific: record them on the machine (or CI runner)
+that runs the comparison.
+"""
+import argparse
+import copy
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import corpus  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+
+
+# -----------------------------
+# Cases: name -> setup(resumes) returning (inputs, fn)
+# -----------------------------
+def _custom_parser(resumes):
+    from custom_parser import parse_resume_data_custom
+    return [corpus.to_text(r) for r in resumes], parse_resume_data_custom
+
+
+def _extract(kind, render):
+    def setup(resumes):
+        from file_parser import extract_text
+        return [render(r) for r in resumes], lambda blob: extract_text(kind, io.BytesIO(blob))
+    return setup
+
+
+def _generate_docx(resumes):
+    from document_generator import generate_docx_from_data
+    return [r["data"] for r in resumes], lambda d: generate_docx_from_data(copy.deepcopy(d)).getvalue()
+
+
+def _docx_engine(resumes):
+    from docx_engine import generate_docx
+    return [r["data"] for r in resumes], generate_docx
+
+
+def _generate_pdf(resumes):
+    from document_generator import generate_pdf_from_data
+    return [r["data"] for r in resumes], lambda d: generate_pdf_from_data(copy.deepcopy(d))
+
+
+CASES = {
+    "custom_parser": _custom_parser,
+    "extract_pdf": _extract("pdf", corpus.to_pdf),
+    "extract_docx": _extract("docx", corpus.to_docx),
+    "generate_docx": _generate_docx,
+    "docx_engine": _docx_engine,
+    "generate_pdf": _generate_pdf,
+}
+
+
+def measure(inputs, fn, repeats):
+    for item in inputs:  # warm-up: imports, template caches, fonts
+        fn(item)
+
+    rates = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for item in inputs:
+            fn(item)
+        rates.append(len(inputs) / (time.perf_counter() - start))
+
+    tracemalloc.start()
+    peak = 0
+    try:
+        for item in inputs:
+            tracemalloc.reset_peak()
+            fn(item)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+
+    return {"docsPerSec": round(statistics.median(rates), 2), "peakKiB": round(peak / 1024, 1)}
+
+
+def compare(results, baseline, max_drop, max_growth):
+    """Returns a list of human-readable regressions."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get("cases", {}).get(name)
+        if not base or "skipped" in result:
+            continue
+        floor = base["docsPerSec"] * (1 - max_drop)
+        if result["docsPerSec"] < floor:
+            regressions.append(
+                f"{name}: throughput {result['docsPerSec']:.1f}/s < {floor:.1f}/s "
+                f"(baseline {base['docsPerSec']:.1f}/s, max drop {max_drop:.0%})"
+            )
+        ceiling = base["peakKiB"] * (1 + max_growth)
+        if result["peakKiB"] > ceiling:
+            regressions.append(
+                f"{name}: peak memory {result['peakKiB']:.0f} KiB > {ceiling:.0f} KiB "
+                f"(baseline {base['peakKiB']:.0f} KiB, max growth {max_growth:.0%})"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", help=f"comma-separated subset of {','.join(CASES)}")
+    parser.add_argument("--count", type=int, default=12, help="resumes in the corpus")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--max-throughput-drop", type=float,
+                        default=float(os.getenv("BENCH_MAX_THROUGHPUT_DROP", "0.20")))
+    parser.add_argument("--max-memory-growth", type=float,
+                        default=float(os.getenv("BENCH_MAX_MEMORY_GROWTH", "0.25")))
+    args = parser.parse_args()
+
+    names = args.cases.split(",") if args.cases else list(CASES)
+    unknown = set(names) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+
+    resumes = corpus.build_corpus(args.count, args.seed)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = {}
+    print(f"{'case':<16}{'docs/s':>10}{'base':>10}{'peak KiB':>11}{'base':>10}")
+    for name in names:
+        try:
+            inputs, fn = CASES[name](resumes)
+            results[name] = measure(inputs, fn, args.repeats)
+        except (ImportError, OSError) as e:
+            # e.g. WeasyPrint without its system libraries
+            results[name] = {"skipped": f"{type(e).__name__}: {e}".splitlines()[0]}
+            print(f"{name:<16}  skipped ({results[name]['skipped'][:60]})")
+            continue
+        base = baseline.get("cases", {}).get(name, {})
+        r = results[name]
+        print(f"{name:<16}{r['docsPerSec']:>10.1f}{base.get('docsPerSec', float('nan')):>10.1f}"
+              f"{r['peakKiB']:>11.0f}{base.get('peakKiB', float('nan')):>10.0f}")
+
+    if args.update_baseline:
+        cases = dict(baseline.get("cases", {}))
+        cases.update({k: v for k, v in results.items() if "skipped" not in v})
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "corpus": {"count": args.count, "seed": args.seed},
+                "cases": cases,
+            }, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline first.")
+        return 0
+    if baseline.get("corpus") != {"count": args.count, "seed": args.seed}:
+        print(f"\nWarning: baseline was recorded with corpus {baseline.get('corpus')}")
+
+    regressions = compare(results, baseline, args.max_throughput_drop, args.max_memory_growth)
+    if regressions:
+        print("\nRegressions:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
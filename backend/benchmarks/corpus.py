@@ -0,0 +1,262 @@
+# backend/benchmarks/corpus.py
+"""
+Deterministic synthetic resume corpus for the benchmark suite.
+
+Every resume is derived from (seed, index), so the same arguments always
+produce the same content. Resumes vary in length (short / medium / long),
+in which optional sections they have, and in formatting (bullet lists,
+paragraphs, inline bold / italic). Each one can be emitted as:
+
+  - builder JSON  (the payload the generators take)
+  - plain text    (what custom_parser / the LLM prompt see)
+  - DOCX / PDF    (what file_parser extracts from)
+
+Write a corpus to disk:
+    python benchmarks/corpus.py --out /tmp/corpus --count 24
+"""
+import argparse
+import datetime
+import html
+import io
+import json
+import os
+import random
+import zipfile
+
+SIZES = {
+    # size: (experience entries, bullets per entry, projects, skill categories)
+    "short": (1, 2, 0, 2),
+    "medium": (3, 4, 2, 4),
+    "long": (8, 8, 5, 7),
+}
+
+_FIRST = ["Ava", "Liam", "Maya", "Noah", "Priya", "Omar", "Sofia", "Chen", "Elena", "Kwame"]
+_LAST = ["Patel", "Nguyen", "Garcia", "Okafor", "Schmidt", "Kim", "Rossi", "Haddad", "Silva", "Brown"]
+_CITIES = ["Austin, TX", "Newark, NJ", "Seattle, WA", "Chicago, IL", "Denver, CO", "Raleigh, NC"]
+_TITLES = ["Software Engineer", "Data Analyst", "DevOps Engineer", "Product Manager",
+           "Backend Developer", "QA Engineer", "Cloud Architect", "ML Engineer"]
+_COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Tech",
+              "Hooli", "Vandelay Imports"]
+_VERBS = ["Led", "Built", "Designed", "Migrated", "Automated", "Optimized", "Launched", "Scaled"]
+_OBJECTS = ["a payments service", "the CI pipeline", "40 microservices", "a reporting dashboard",
+            "the data warehouse", "an internal CLI", "the onboarding flow", "a search index"]
+_RESULTS = ["cutting latency 35%", "saving $120k a year", "for 2M users", "with zero downtime",
+            "ahead of schedule", "raising test coverage to 90%", "across three regions"]
+_SKILLS = {
+    "Programming Languages": ["Python", "Go", "Java", "TypeScript", "SQL", "Rust", "C#"],
+    "Cloud Platforms": ["AWS", "GCP", "Azure", "Kubernetes", "Terraform"],
+    "Databases": ["PostgreSQL", "MySQL", "Redis", "MongoDB", "BigQuery"],
+    "Frameworks": ["Flask", "Django", "React", "Spring Boot", "FastAPI"],
+    "Tools": ["Git", "Docker", "Jenkins", "Grafana", "Jira"],
+    "Soft Skills": ["Mentoring", "Stakeholder management", "Technical writing"],
+    "Operating Systems": ["Linux", "macOS", "Windows Server"],
+}
+_DEGREES = ["BS Computer Science", "MS Data Science", "BA Economics", "MEng Software Engineering"]
+_SCHOOLS = ["State University", "Institute of Technology", "City College", "Tech University"]
+_FIXED_TIME = datetime.datetime(2024, 1, 1)
+
+
+def _sentence(rng):
+    return f"{rng.choice(_VERBS)} {rng.choice(_OBJECTS)}, {rng.choice(_RESULTS)}"
+
+
+def _years(rng):
+    start = rng.randint(2008, 2021)
+    end = "Present" if rng.random() < 0.3 else str(min(start + rng.randint(1, 4), 2025))
+    return f"{start} - {end}"
+
+
+def generate_resume(seed=0, size="medium", index=0):
+    """Returns {"data": <builder JSON>, "blocks": <structured content for text/docx/pdf>}."""
+    rng = random.Random(f"{seed}:{size}:{index}")
+    n_exp, n_bullets, n_proj, n_skills = SIZES[size]
+    fmt = rng.choice(["bullets", "paragraphs", "mixed"])
+    rich = rng.random() < 0.5  # inline <strong>/<em>
+
+    def rich_text(text):
+        if not rich:
+            return html.escape(text)
+        words = html.escape(text).split(" ")
+        i = rng.randrange(len(words))
+        words[i] = f"<strong>{words[i]}</strong>" if rng.random() < 0.5 else f"<em>{words[i]}</em>"
+        return " ".join(words)
+
+    def description(bullets):
+        as_list = fmt == "bullets" or (fmt == "mixed" and rng.random() < 0.5)
+        if as_list:
+            return "<ul>" + "".join(f"<li>{rich_text(b)}</li>" for b in bullets) + "</ul>"
+        return "".join(f"<p>{rich_text(b)}.</p>" for b in bullets)
+
+    name = f"{rng.choice(_FIRST)} {rng.choice(_LAST)}"
+    personal = {
+        "name": name,
+        "email": f"{name.lower().replace(' ', '.')}{index}@example.com",
+        "phone": f"(555) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+        "location": rng.choice(_CITIES),
+        "legalStatus": rng.choice(["US Citizen", "Green Card", "Prefer not to say"]),
+    }
+    summary = [_sentence(rng) for _ in range(2 if size == "short" else 4)]
+
+    experience = []
+    for i in range(n_exp):
+        bullets = [_sentence(rng) for _ in range(n_bullets)]
+        experience.append({
+            "id": f"exp-{i}", "jobTitle": rng.choice(_TITLES), "company": rng.choice(_COMPANIES),
+            "dates": _years(rng), "bullets": bullets,
+        })
+
+    education = [{
+        "id": "edu-0", "degree": rng.choice(_DEGREES), "institution": rng.choice(_SCHOOLS),
+        "graduationYear": str(rng.randint(2005, 2022)), "gpa": f"{rng.uniform(3.0, 4.0):.1f}",
+        "bullets": [_sentence(rng)] if size != "short" else [],
+    }]
+
+    skills = []
+    for i, category in enumerate(rng.sample(sorted(_SKILLS), n_skills)):
+        skills.append({"id": f"skill-{i}", "category": category,
+                       "skills_list": ", ".join(rng.sample(_SKILLS[category], 3))})
+
+    projects = []
+    for i in range(n_proj):
+        projects.append({"id": f"proj-{i}", "title": f"{rng.choice(_OBJECTS).title()} Rewrite",
+                         "date": str(rng.randint(2015, 2025)),
+                         "bullets": [_sentence(rng) for _ in range(max(2, n_bullets // 2))]})
+
+    certifications = []
+    if rng.random() < 0.6:
+        certifications.append({"id": "cert-0", "name": "AWS Certified Solutions Architect",
+                               "issuer": "Amazon", "date": str(rng.randint(2018, 2025))})
+
+    data = {
+        "personal": personal,
+        "summary": description(summary) if fmt != "bullets" else "<p>" + rich_text(". ".join(summary)) + ".</p>",
+        "experience": [
+            {k: v for k, v in e.items() if k != "bullets"} | {"description": description(e["bullets"])}
+            for e in experience
+        ],
+        "education": [
+            {k: v for k, v in e.items() if k != "bullets"} | {"achievements": description(e["bullets"]) if e["bullets"] else ""}
+            for e in education
+        ],
+        "skills": skills,
+        "projects": [
+            {k: v for k, v in p.items() if k != "bullets"} | {"description": description(p["bullets"])}
+            for p in projects
+        ],
+        "publications": [],
+        "certifications": certifications,
+        "styleOptions": {"fontFamily": rng.choice(["Calibri", "Arial", "Georgia"]),
+                         "fontSize": rng.choice([10, 11, 12]), "accentColor": "#34495e"},
+    }
+    blocks = {"personal": personal, "summary": summary, "experience": experience,
+              "education": education, "skills": skills, "projects": projects,
+              "certifications": certifications}
+    return {"data": data, "blocks": blocks}
+
+
+def to_lines(resume):
+    """Plain-text resume as (text, style) lines; style is "title", "heading", "bullet" or None."""
+    b = resume["blocks"]
+    p = b["personal"]
+    lines = [(p["name"].upper(), "title"),
+             (f"{p['email']} | {p['phone']} | {p['location']}", None),
+             ("SUMMARY", "heading"), (". ".join(b["summary"]) + ".", None),
+             ("EXPERIENCE", "heading")]
+    for e in b["experience"]:
+        lines.append((f"{e['jobTitle']} at {e['company']} ({e['dates']})", None))
+        lines.extend((f"- {x}", "bullet") for x in e["bullets"])
+    lines.append(("EDUCATION", "heading"))
+    for e in b["education"]:
+        lines.append((f"{e['degree']}, {e['institution']} ({e['graduationYear']}) GPA: {e['gpa']}", None))
+        lines.extend((f"- {x}", "bullet") for x in e["bullets"])
+    lines.append(("SKILLS", "heading"))
+    lines.extend((f"{s['category']}: {s['skills_list']}", None) for s in b["skills"])
+    if b["projects"]:
+        lines.append(("PROJECTS", "heading"))
+        for pr in b["projects"]:
+            lines.append((f"{pr['title']} ({pr['date']})", None))
+            lines.extend((f"- {x}", "bullet") for x in pr["bullets"])
+    if b["certifications"]:
+        lines.append(("CERTIFICATIONS", "heading"))
+        lines.extend((f"{c['name']}, {c['issuer']} ({c['date']})", None) for c in b["certifications"])
+    return lines
+
+
+def to_text(resume):
+    return "\n".join(text for text, _ in to_lines(resume)) + "\n"
+
+
+def to_docx(resume):
+    from docx import Document
+
+    doc = Document()
+    for text, style in to_lines(resume):
+        if style == "title":
+            doc.add_heading(text, level=0)
+        elif style == "heading":
+            doc.add_heading(text, level=1)
+        elif style == "bullet":
+            doc.add_paragraph(text[2:], style="List Bullet")
+        else:
+            doc.add_paragraph(text)
+    doc.core_properties.created = doc.core_properties.modified = _FIXED_TIME
+    out = io.BytesIO()
+    doc.save(out)
+
+    # python-docx stamps zip entries with the current time; pin them
+    pinned = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(out.getvalue())) as src, \
+            zipfile.ZipFile(pinned, "w", zipfile.ZIP_DEFLATED) as dst:
+        for info in src.infolist():
+            dst.writestr(zipfile.ZipInfo(info.filename, date_time=(1980, 1, 1, 0, 0, 0)),
+                         src.read(info.filename), zipfile.ZIP_DEFLATED)
+    return pinned.getvalue()
+
+
+def to_pdf(resume):
+    import fitz  # PyMuPDF
+
+    doc = fitz.open()
+    page, y = None, 0
+    for text, style in to_lines(resume):
+        size = {"title": 16, "heading": 12}.get(style, 10)
+        if page is None or y > 770:
+            page, y = doc.new_page(), 60
+        page.insert_text((72 if style != "bullet" else 84, y), text[:110], fontsize=size,
+                         fontname="hebo" if style in ("title", "heading") else "helv")
+        y += size + 6
+    # Fixed metadata so identical content gives identical bytes
+    doc.set_metadata({"creationDate": "D:20240101000000", "modDate": "D:20240101000000",
+                      "producer": "bench-corpus", "creator": "bench-corpus"})
+    return doc.tobytes(garbage=3, deflate=True, no_new_id=True)
+
+
+def build_corpus(count=24, seed=1234):
+    """`count` resumes cycling through SIZES."""
+    sizes = list(SIZES)
+    return [generate_resume(seed, sizes[i % len(sizes)], i) for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--count", type=int, default=24)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    for i, resume in enumerate(build_corpus(args.count, args.seed)):
+        base = os.path.join(args.out, f"resume_{i:03d}")
+        with open(f"{base}.json", "w") as f:
+            json.dump(resume["data"], f, indent=2)
+        with open(f"{base}.txt", "w") as f:
+            f.write(to_text(resume))
+        with open(f"{base}.docx", "wb") as f:
+            f.write(to_docx(resume))
+        with open(f"{base}.pdf", "wb") as f:
+            f.write(to_pdf(resume))
+    print(f"Wrote {args.count} resumes to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+# backend/benchmarks/fake_calendar.py
+"""
+Local stand-in for the Google Calendar API, so event creation can be
+exercised and timed without OAuth or a real calendar. It answers
+
+  POST /calendar/v3/calendars/<calendarId>/events   (events.insert; 409 on a reused id)
+  GET  /calendar/v3/calendars/<calendarId>/events/<eventId>
+  POST /calendar/v3/freeBusy                        (freebusy.query)
+  POST /batch/calendar/v3                           (multipart/mixed batch of the above)
+
+keeps created events in memory, and counts HTTP round trips vs. events
+at GET /stats. Free/busy answers come from the stored events (by attendee)
+plus, with --busy-per-day N, N pseudo-random meetings per calendar per
+weekday, derived from the calendar id so answers are stable. Latency (per HTTP request) and per-insert error rate are
+configurable as in fake_llm.py.
+
+    python benchmarks/fake_calendar.py --port 8091 --latency const:0.15
+    CALENDAR_API_ROOT=http://127.0.0.1:8091/ python -c "import google_calendar_utils as g; ..."
+
+Compare one-at-a-time inserts with batched ones:
+    python benchmarks/fake_calendar.py --compare 100
+"""
+import argparse
+import datetime
+import email.parser
+import email.policy
+import itertools
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+from fake_llm import parse_distribution  # noqa: E402
+
+_EVENTS_PATH = re.compile(r"^/calendar/v3/calendars/(?P<calendar>[^/]+)/events$")
+_EVENT_PATH = re.compile(r"^/calendar/v3/calendars/(?P<calendar>[^/]+)/events/(?P<event>[^/]+)$")
+_REASONS = {200: "OK", 403: "Forbidden", 404: "Not Found", 409: "Conflict", 429: "Too Many Requests",
+            500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class Calendar:
+    """In-memory events plus request counters, shared by the handler threads."""
+
+    def __init__(self, latency="const:0", error_rate=0.0, error_status=(503,), seed=None, busy_per_day=0):
+        self.latency = parse_distribution(latency) if isinstance(latency, str) else latency
+        self.error_rate = error_rate
+        self.error_status = tuple(error_status)
+        self.busy_per_day = busy_per_day
+        self.events = {}  # calendarId -> [event]
+        self.stats = {"httpRequests": 0, "batchRequests": 0, "inserts": 0, "freebusyQueries": 0, "errors": 0}
+        self._rng = random.Random(seed)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def count(self, key, n=1):
+        with self._lock:
+            self.stats[key] += n
+
+    def delay(self):
+        with self._lock:
+            return self.latency(self._rng)
+
+    def insert(self, calendar_id, body):
+        """(status, payload) for one events.insert."""
+        with self._lock:
+            self.stats["inserts"] += 1
+            if self._rng.random() < self.error_rate:
+                self.stats["errors"] += 1
+                status = self._rng.choice(self.error_status)
+                return status, {"error": {"code": status, "message": f"Injected {status}",
+                                          "errors": [{"reason": "rateLimitExceeded" if status in (403, 429)
+                                                      else "backendError"}]}}
+            event_id = body.get("id") or f"evt{next(self._ids):08d}"
+            if any(e["id"] == event_id for e in self.events.get(calendar_id, [])):
+                return 409, {"error": {"code": 409, "message": "The requested identifier already exists.",
+                                       "errors": [{"reason": "duplicate"}]}}
+            event = dict(body, id=event_id, status="confirmed", kind="calendar#event",
+                         htmlLink=f"https://calendar.example.test/event?eid={event_id}")
+            if (body.get("conferenceData") or {}).get("createRequest"):
+                event["hangoutLink"] = f"https://meet.example.test/{event_id}"
+            self.events.setdefault(calendar_id, []).append(event)
+            return 200, event
+
+
+    def _synthetic_busy(self, calendar_id, start, end):
+        """busy_per_day meetings (30-90 min, 08:00-18:00 UTC) per weekday, stable per calendar and day."""
+        day = start.date()
+        blocks = []
+        while day <= end.date():
+            rng = random.Random(f"{calendar_id}:{day}")
+            if day.weekday() < 5:
+                for _ in range(self.busy_per_day):
+                    minute = rng.randrange(8 * 60, 18 * 60, 15)
+                    begin = datetime.datetime.combine(day, datetime.time(minute // 60, minute % 60),
+                                                      datetime.timezone.utc)
+                    blocks.append((begin, begin + datetime.timedelta(minutes=rng.choice((30, 45, 60, 90)))))
+            day += datetime.timedelta(days=1)
+        return blocks
+
+    def freebusy(self, body):
+        """(status, payload) for one freebusy.query."""
+        self.count("freebusyQueries")
+        start, end = _when(body.get("timeMin")), _when(body.get("timeMax"))
+        if start is None or end is None:
+            return 400, {"error": {"code": 400, "message": "Missing timeMin or timeMax"}}
+        items = body.get("items") or []
+        if len(items) > 50:
+            return 400, {"error": {"code": 400, "message": "Too many calendars", "errors": [{"reason": "tooManyCalendarsRequestedForFreeBusy"}]}}
+
+        with self._lock:
+            events = [e for evts in self.events.values() for e in evts]
+        calendars = {}
+        for item in items:
+            cid = item.get("id", "")
+            blocks = self._synthetic_busy(cid, start, end) if self.busy_per_day else []
+            for event in events:
+                if cid in {a.get("email") for a in event.get("attendees", [])}:
+                    begin = _when((event.get("start") or {}).get("dateTime"))
+                    finish = _when((event.get("end") or {}).get("dateTime"))
+                    if begin and finish:
+                        blocks.append((begin, finish))
+            calendars[cid] = {"busy": [
+                {"start": max(b, start).isoformat(), "end": min(f, end).isoformat()}
+                for b, f in sorted(blocks) if f > start and b < end
+            ]}
+        return 200, {"kind": "calendar#freeBusy", "timeMin": body["timeMin"], "timeMax": body["timeMax"],
+                     "calendars": calendars}
+
+
+    def get(self, calendar_id, event_id):
+        with self._lock:
+            for event in self.events.get(calendar_id, []):
+                if event["id"] == event_id:
+                    return 200, event
+        return 404, {"error": {"code": 404, "message": "Not Found"}}
+
+
+def _when(value):
+    """RFC 3339 string -> aware datetime (naive values taken as UTC), or None."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=datetime.timezone.utc)
+
+
+def _split_http(message):
+    """Raw HTTP message text -> (first line, headers dict, body)."""
+    parts = re.split(r"\r?\n\r?\n", message, maxsplit=1)
+    head, body = parts[0], parts[1] if len(parts) > 1 else ""
+    lines = head.splitlines()
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return lines[0] if lines else "", headers, body
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    calendar: Calendar = None  # set by make_server
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type="application/json"):
+        data = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        match = _EVENT_PATH.match(path)
+        if path == "/stats":
+            with self.calendar._lock:
+                stats = dict(self.calendar.stats)
+            self._send(200, stats)
+        elif match:
+            self._send(*self.calendar.get(match.group("calendar"), match.group("event")))
+        else:
+            self._send(404, {"error": {"code": 404, "message": "Not Found"}})
+
+    def do_POST(self):
+        path = self.path.split("?")[0]
+        raw = self._body()
+        self.calendar.count("httpRequests")
+        time.sleep(self.calendar.delay())
+
+        match = _EVENTS_PATH.match(path)
+        if match:
+            try:
+                body = json.loads(raw or b"{}")
+            except ValueError:
+                self._send(400, {"error": {"code": 400, "message": "Invalid JSON payload"}})
+                return
+            status, payload = self.calendar.insert(match.group("calendar"), body)
+            self._send(status, payload)
+        elif path == "/calendar/v3/freeBusy":
+            try:
+                body = json.loads(raw or b"{}")
+            except ValueError:
+                self._send(400, {"error": {"code": 400, "message": "Invalid JSON payload"}})
+                return
+            self._send(*self.calendar.freebusy(body))
+        elif path.startswith("/batch/calendar/v3"):
+            self._batch(raw)
+        else:
+            self._send(404, {"error": {"code": 404, "message": "Not Found"}})
+
+    def _batch(self, raw):
+        self.calendar.count("batchRequests")
+        message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+            f"Content-Type: {self.headers.get('Content-Type')}\r\n\r\n".encode("utf-8") + raw
+        )
+        boundary = f"batch_{uuid.uuid4().hex}"
+        out = []
+        for part in message.iter_parts():
+            content_id = str(part.get("Content-ID", "")).strip("<>")
+            request_line, _, body = _split_http(part.get_payload())
+            method, target = (request_line.split(" ") + ["", ""])[:2]
+            match = _EVENTS_PATH.match(target.split("?")[0])
+            try:
+                if method == "POST" and match:
+                    status, payload = self.calendar.insert(match.group("calendar"), json.loads(body or "{}"))
+                elif method == "POST" and target.split("?")[0] == "/calendar/v3/freeBusy":
+                    status, payload = self.calendar.freebusy(json.loads(body or "{}"))
+                else:
+                    status, payload = 404, {"error": {"code": 404, "message": f"Unsupported {method} {target}"}}
+            except ValueError:
+                status, payload = 400, {"error": {"code": 400, "message": "Invalid JSON payload"}}
+            out.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+                f"Content-Type: application/json; charset=UTF-8\r\n\r\n{json.dumps(payload)}\r\n"
+            )
+        out.append(f"--{boundary}--\r\n")
+        self._send(200, "".join(out).encode("utf-8"), f"multipart/mixed; boundary={boundary}")
+
+
+def make_server(host="127.0.0.1", port=0, calendar=None):
+    handler = type("BoundHandler", (Handler,), {"calendar": calendar or Calendar()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.calendar = handler.calendar
+    return server
+
+
+def start_in_thread(**kwargs):
+    """Starts a stand-in on a daemon thread; returns (server, api_root)."""
+    server = make_server(kwargs.pop("host", "127.0.0.1"), kwargs.pop("port", 0), Calendar(**kwargs))
+    threading.Thread(target=server.serve_forever, name="fake-calendar", daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}/"
+
+
+def compare(count, args):
+    """Times `count` single inserts vs. one create_calendar_events call against a stand-in."""
+    server, root = start_in_thread(latency=args.latency, error_rate=args.error_rate,
+                                   error_status=args.error_status, seed=args.seed)
+    os.environ["CALENDAR_API_ROOT"] = root
+    os.environ.setdefault("CALENDAR_TOKEN_PATH", os.path.join(BENCH_DIR, ".no-token.pickle"))
+    sys.path.insert(0, os.path.dirname(BENCH_DIR))
+    import datetime
+    import google_calendar_utils as gcal
+
+    start = datetime.datetime(2025, 1, 6, 9, 0)
+    events = [{"summary": f"Interview {i}", "description": "", "attendees": ["candidate@example.com"],
+               "start_time": start + datetime.timedelta(hours=i), "end_time": start + datetime.timedelta(hours=i, minutes=45)}
+              for i in range(count)]
+
+    t0 = time.perf_counter()
+    single_failed = 0
+    for e in events:
+        try:
+            gcal.create_calendar_event(e["summary"], e["description"], e["start_time"], e["end_time"], e["attendees"])
+        except Exception:
+            single_failed += 1
+    single = time.perf_counter() - t0
+    single_requests = server.calendar.stats["httpRequests"]
+
+    t0 = time.perf_counter()
+    results = gcal.create_calendar_events(events)
+    batched = time.perf_counter() - t0
+    batch_requests = server.calendar.stats["httpRequests"] - single_requests
+
+    failed = sum(1 for r in results if "error" in r)
+    print(f"\n{count} events  single: {single:.2f}s / {single_requests} requests ({single_failed} failed)"
+          f"   batched: {batched:.2f}s / {batch_requests} requests ({failed} failed)")
+    server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8091)
+    parser.add_argument("--latency", default="const:0", type=parse_distribution,
+                        help="per-HTTP-request delay distribution (see fake_llm.py)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of inserts that fail")
+    parser.add_argument("--error-status", default="503", type=lambda s: [int(x) for x in s.split(",")])
+    parser.add_argument("--busy-per-day", type=int, default=0,
+                        help="synthetic meetings per calendar per weekday in free/busy answers")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--compare", type=int, metavar="N", help="benchmark N single vs. batched inserts and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(args.compare, args)
+        return
+
+    server = make_server(args.host, args.port, Calendar(args.latency, args.error_rate, args.error_status,
+                                                                 args.seed, args.busy_per_day))
+    print(f"Calendar stand-in listening on http://{args.host}:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+# backend/benchmarks/fake_llm.py
+"""
+Local stand-in for the LLM providers, for load tests that must not hit
+(or pay for) the real APIs. One threaded HTTP server speaks all three
+wire formats the backend uses:
+
+  Gemini   POST /v1beta/models/<model>:generateContent
+           POST /v1beta/models/<model>:streamGenerateContent   (?alt=sse or JSON array)
+  Ollama   POST /api/generate                                  ("stream": true -> NDJSON)
+  Azure    POST .../chat/completions                           ("stream": true -> SSE)
+
+Replies are synthetic but shaped like the real thing: prompts asking for
+the resume JSON schema get a corpus resume, "versions" prompts get three
+rewrites, anything else gets a paragraph of text.
+
+Latency is drawn per request from a distribution (time to first byte;
+streamed replies add --chunk-interval between chunks):
+    const:0.8   uniform:0.2,1.5   normal:1.0,0.3   lognormal:1.0,0.5   exp:0.8
+A fraction of requests fail with a provider-style error body (--error-rate,
+--error-status), and --bad-json-rate returns truncated JSON where JSON was asked for.
+
+Point the backend at it:
+    python benchmarks/fake_llm.py --port 8089 --latency lognormal:1.2,0.4 --error-rate 0.02
+    GEMINI_API_KEY=fake GEMINI_API_ENDPOINT=http://127.0.0.1:8089 \\
+    OLLAMA_API_URL=http://127.0.0.1:8089/api/generate \\
+    AZURE_AI_ENDPOINT=http://127.0.0.1:8089/azure AZURE_AI_KEY=fake  gunicorn -c gunicorn.conf.py wsgi:app
+
+GET /stats returns request / injected-error counts per provider.
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from corpus import generate_resume  # noqa: E402
+
+_GEMINI_STATUS = {400: "INVALID_ARGUMENT", 429: "RESOURCE_EXHAUSTED", 500: "INTERNAL", 503: "UNAVAILABLE"}
+
+
+def parse_distribution(spec):
+    """"kind:a,b" -> function(rng) returning a delay in seconds (never negative)."""
+    kind, _, params = spec.partition(":")
+    args = [float(x) for x in params.split(",") if x.strip()]
+    try:
+        if kind == "const":
+            value, = args
+            draw = lambda rng: value  # noqa: E731
+        elif kind == "uniform":
+            low, high = args
+            draw = lambda rng: rng.uniform(low, high)  # noqa: E731
+        elif kind == "normal":
+            mean, sd = args
+            draw = lambda rng: rng.gauss(mean, sd)  # noqa: E731
+        elif kind == "lognormal":
+            median, sigma = args
+            draw = lambda rng: rng.lognormvariate(math.log(median), sigma)  # noqa: E731
+        elif kind == "exp":
+            mean, = args
+            draw = lambda rng: rng.expovariate(1.0 / mean)  # noqa: E731
+        else:
+            raise ValueError(kind)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"bad latency distribution {spec!r}") from None
+    return lambda rng: max(0.0, draw(rng))
+
+
+class Behaviour:
+    """Latency / failure settings shared by all handler threads."""
+
+    def __init__(self, latency="const:0.5", error_rate=0.0, error_status=(500,), bad_json_rate=0.0,
+                 chunks=8, chunk_interval=0.05, seed=None):
+        self.latency = parse_distribution(latency) if isinstance(latency, str) else latency
+        self.error_rate = error_rate
+        self.error_status = tuple(error_status)
+        self.bad_json_rate = bad_json_rate
+        self.chunks = max(1, chunks)
+        self.chunk_interval = chunk_interval
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._counter = itertools.count()
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+
+    def draw(self):
+        """(delay, error status or None, truncate json?, resume index) for one request."""
+        with self._rng_lock:
+            delay = self.latency(self._rng)
+            status = self._rng.choice(self.error_status) if self._rng.random() < self.error_rate else None
+            bad_json = self._rng.random() < self.bad_json_rate
+        return delay, status, bad_json, next(self._counter)
+
+    def count(self, provider, outcome):
+        with self._stats_lock:
+            per = self._stats.setdefault(provider, {})
+            per[outcome] = per.get(outcome, 0) + 1
+
+    def stats(self):
+        with self._stats_lock:
+            return {p: dict(v) for p, v in self._stats.items()}
+
+
+def _reply_text(prompt, wants_json, index, bad_json):
+    """Synthetic completion for `prompt`."""
+    if "versions" in prompt:
+        body = json.dumps({"versions": [f"Rewritten version {i + 1} of the section." for i in range(3)]})
+    elif wants_json or "schema" in prompt:
+        size = ("short", "medium", "long")[index % 3]
+        data = generate_resume(seed=index, size=size, index=index)["data"]
+        data.pop("styleOptions", None)
+        body = json.dumps(data)
+    else:
+        return ("Results-driven engineer with a track record of shipping reliable services, "
+                "scaling teams and turning ambiguous requirements into measurable outcomes.")
+    return body[: len(body) // 2] if bad_json else body
+
+
+def _split(text, n):
+    step = max(1, math.ceil(len(text) / n))
+    return [text[i:i + step] for i in range(0, len(text), step)] or [""]
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    behaviour: Behaviour = None  # set by make_server
+
+    def log_message(self, format, *args):  # keep load-test output readable
+        pass
+
+    # ---------- plumbing ----------
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            return json.loads(raw or b"{}")
+        except ValueError:
+            return {}
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _start_stream(self, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+    def _stream(self, pieces):
+        for i, piece in enumerate(pieces):
+            if i:
+                time.sleep(self.behaviour.chunk_interval)
+            self.wfile.write(piece.encode("utf-8"))
+            self.wfile.flush()
+
+    def _error(self, provider, status):
+        message = f"Injected {status} from the {provider} stand-in"
+        headers = {"Retry-After": "1"} if status == 429 else None
+        if provider == "gemini":
+            payload = {"error": {"code": status, "message": message,
+                                 "status": _GEMINI_STATUS.get(status, "UNKNOWN")}}
+        elif provider == "ollama":
+            payload = {"error": message}
+        else:
+            payload = {"error": {"code": str(status), "message": message}}
+        self._send_json(status, payload, headers)
+
+    # ---------- routing ----------
+    def do_GET(self):
+        if self.path.split("?")[0] == "/stats":
+            self._send_json(200, self.behaviour.stats())
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        path, _, query = self.path.partition("?")
+        if path.startswith("/v1beta/models/") or path.startswith("/v1/models/"):
+            provider = "gemini"
+        elif path == "/api/generate":
+            provider = "ollama"
+        elif path.endswith("/chat/completions"):
+            provider = "azure"
+        else:
+            self._send_json(404, {"error": "not found"})
+            return
+
+        body = self._read_json()
+        delay, status, bad_json, index = self.behaviour.draw()
+        time.sleep(delay)
+        if status:
+            self.behaviour.count(provider, str(status))
+            self._error(provider, status)
+            return
+        self.behaviour.count(provider, "ok")
+        getattr(self, f"_{provider}")(path, query, body, bad_json, index)
+
+    # ---------- providers ----------
+    def _gemini(self, path, query, body, bad_json, index):
+        prompt = " ".join(
+            part.get("text", "")
+            for content in body.get("contents", []) for part in content.get("parts", [])
+        )
+        config = body.get("generationConfig") or body.get("generation_config") or {}
+        wants_json = "json" in str(config.get("responseMimeType") or config.get("response_mime_type") or "")
+        model = path.rsplit("/", 1)[-1].split(":")[0]
+        text = _reply_text(prompt, wants_json, index, bad_json)
+
+        def chunk(piece, last):
+            candidate = {"content": {"parts": [{"text": piece}], "role": "model"}, "index": 0}
+            if last:
+                candidate["finishReason"] = "STOP"
+            return {"candidates": [candidate], "modelVersion": model,
+                    "usageMetadata": {"promptTokenCount": len(prompt) // 4,
+                                      "candidatesTokenCount": len(text) // 4,
+                                      "totalTokenCount": (len(prompt) + len(text)) // 4}}
+
+        if not path.endswith(":streamGenerateContent"):
+            self._send_json(200, chunk(text, True))
+            return
+        pieces = _split(text, self.behaviour.chunks)
+        events = [chunk(p, i == len(pieces) - 1) for i, p in enumerate(pieces)]
+        if "alt=sse" in query:
+            self._start_stream("text/event-stream")
+            self._stream(f"data: {json.dumps(e)}\r\n\r\n" for e in events)
+        else:
+            # REST streaming without SSE is one JSON array written incrementally
+            self._start_stream("application/json")
+            self._stream(("[" if i == 0 else ",\r\n") + json.dumps(e) for i, e in enumerate(events))
+            self.wfile.write(b"]")
+
+    def _ollama(self, path, query, body, bad_json, index):
+        model = body.get("model", "llama3:latest")
+        text = _reply_text(body.get("prompt", ""), body.get("format") == "json", index, bad_json)
+        created = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        final = {"model": model, "created_at": created, "response": "", "done": True,
+                 "done_reason": "stop", "eval_count": len(text) // 4}
+
+        if body.get("stream", True) is False:
+            self._send_json(200, dict(final, response=text))
+            return
+        self._start_stream("application/x-ndjson")
+        lines = [{"model": model, "created_at": created, "response": p, "done": False}
+                 for p in _split(text, self.behaviour.chunks)]
+        self._stream(json.dumps(line) + "\n" for line in lines + [final])
+
+    def _azure(self, path, query, body, bad_json, index):
+        messages = body.get("messages") or []
+        prompt = " ".join(str(m.get("content", "")) for m in messages if isinstance(m, dict))
+        wants_json = (body.get("response_format") or {}).get("type") == "json_object"
+        text = _reply_text(prompt, wants_json, index, bad_json)
+        model = body.get("model") or "stand-in"
+        base = {"id": f"chatcmpl-{index}", "created": int(time.time()), "model": model}
+
+        if not body.get("stream"):
+            self._send_json(200, dict(
+                base, object="chat.completion",
+                choices=[{"index": 0, "message": {"role": "assistant", "content": text},
+                          "finish_reason": "stop"}],
+                usage={"prompt_tokens": len(prompt) // 4, "completion_tokens": len(text) // 4,
+                       "total_tokens": (len(prompt) + len(text)) // 4},
+            ))
+            return
+        pieces = _split(text, self.behaviour.chunks)
+        events = [dict(base, object="chat.completion.chunk",
+                       choices=[{"index": 0, "delta": {"content": p},
+                                 "finish_reason": "stop" if i == len(pieces) - 1 else None}])
+                  for i, p in enumerate(pieces)]
+        self._start_stream("text/event-stream")
+        self._stream([f"data: {json.dumps(e)}\n\n" for e in events] + ["data: [DONE]\n\n"])
+
+
+def make_server(host="127.0.0.1", port=0, behaviour=None):
+    """ThreadingHTTPServer with its own Behaviour; port 0 picks a free one (see server_address)."""
+    handler = type("BoundHandler", (Handler,), {"behaviour": behaviour or Behaviour()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.behaviour = handler.behaviour
+    return server
+
+
+def start_in_thread(**kwargs):
+    """Starts a stand-in server on a daemon thread; returns (server, base_url)."""
+    server = make_server(kwargs.pop("host", "127.0.0.1"), kwargs.pop("port", 0), Behaviour(**kwargs))
+    threading.Thread(target=server.serve_forever, name="fake-llm", daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+def add_behaviour_arguments(parser):
+    group = parser.add_argument_group("LLM stand-in")
+    group.add_argument("--latency", default="const:0.5", type=parse_distribution,
+                       help="time-to-first-byte distribution (default const:0.5)")
+    group.add_argument("--error-rate", type=float, default=0.0)
+    group.add_argument("--error-status", default="500",
+                       help="comma-separated statuses injected errors pick from (e.g. 429,500,503)")
+    group.add_argument("--bad-json-rate", type=float, default=0.0)
+    group.add_argument("--chunks", type=int, default=8, help="pieces per streamed reply")
+    group.add_argument("--chunk-interval", type=float, default=0.05, help="seconds between streamed pieces")
+    group.add_argument("--seed", type=int)
+
+
+def behaviour_kwargs(args):
+    return {
+        "latency": args.latency, "error_rate": args.error_rate,
+        "error_status": [int(s) for s in args.error_status.split(",") if s.strip()],
+        "bad_json_rate": args.bad_json_rate, "chunks": args.chunks,
+        "chunk_interval": args.chunk_interval, "seed": args.seed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    add_behaviour_arguments(parser)
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, Behaviour(**behaviour_kwargs(args)))
+    print(f"LLM stand-in listening on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+# backend/benchmarks/loadtest.py
+"""
+End-to-end load test against the API with the LLM providers replaced by
+the local stand-in (fake_llm.py), so runs are free, repeatable and can
+dial in provider latency and failures.
+
+By default this starts the stand-in on a free port, starts the API
+(gunicorn, or uvicorn for the ASGI app) with GEMINI_API_ENDPOINT /
+OLLAMA_API_URL / AZURE_AI_ENDPOINT pointed at it, then runs
+--concurrency closed-loop clients against a mix of
+
+    parse-resume      multipart PDF / DOCX upload from the benchmark corpus
+    elevator-pitch    {"resumeData": <builder JSON>}
+    generate-pdf      builder JSON
+    generate-docx     builder JSON
+
+and reports throughput, p50/p95/p99 latency and an error breakdown per
+endpoint. Run from the backend folder:
+
+    python benchmarks/loadtest.py --concurrency 32 --duration 30
+    python benchmarks/loadtest.py --server asgi --mix parse-resume=3,elevator-pitch=1 \\
+        --latency lognormal:1.5,0.4 --error-rate 0.05 --error-status 429,503
+    python benchmarks/loadtest.py --base-url http://127.0.0.1:5000   # API already running
+
+With --base-url nothing is started; the target must already be wired to
+a stand-in (or a real provider). Renders hit the render cache after the
+first pass over the corpus; --unique makes every render payload distinct.
+"""
+import argparse
+import collections
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+import corpus  # noqa: E402
+import fake_llm  # noqa: E402
+
+ENDPOINTS = {
+    "parse-resume": "/api/parse-resume",
+    "elevator-pitch": "/api/generate-elevator-pitch",
+    "generate-pdf": "/api/generate-pdf",
+    "generate-docx": "/api/generate-docx",
+}
+SERVERS = {
+    "gunicorn": [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"],
+    "asgi": [sys.executable, "-m", "uvicorn", "asgi:app", "--host", "127.0.0.1", "--port", "{port}"],
+    "flask": [sys.executable, "app.py"],
+}
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def parse_mix(spec):
+    """"parse-resume=3,generate-pdf=1" -> {name: weight}."""
+    mix = {}
+    for item in spec.split(","):
+        name, _, weight = item.strip().partition("=")
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"unknown endpoint {name!r} (one of {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Payloads:
+    """Pre-built request bodies so the clients measure the API, not corpus generation."""
+
+    def __init__(self, count, seed, unique):
+        resumes = corpus.build_corpus(count, seed)
+        self.json = [r["data"] for r in resumes]
+        self.files = []
+        for i, resume in enumerate(resumes):
+            try:
+                if i % 2 == 0:
+                    self.files.append((f"resume_{i}.pdf", corpus.to_pdf(resume), "application/pdf"))
+                else:
+                    self.files.append((f"resume_{i}.docx", corpus.to_docx(resume),
+                                       "application/vnd.openxmlformats-officedocument.wordprocessingml.document"))
+            except ImportError as e:
+                print(f"skipping upload corpus entry {i}: {e}")
+        self.unique = unique
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def _next(self):
+        with self._lock:
+            self._counter += 1
+            return self._counter
+
+    def request(self, endpoint, rng):
+        """Keyword arguments for requests.Session.post."""
+        if endpoint == "parse-resume":
+            if not self.files:
+                raise RuntimeError("no upload corpus (python-docx / PyMuPDF missing)")
+            name, body, mimetype = rng.choice(self.files)
+            return {"files": {"file": (name, body, mimetype)}}
+        data = rng.choice(self.json)
+        if endpoint == "elevator-pitch":
+            return {"json": {"resumeData": data}}
+        if self.unique:
+            data = dict(data, summary=f"{data.get('summary', '')}<p>run {self._next()}</p>")
+        return {"json": data}  # the generators take the resume fields top-level
+
+
+class Results:
+    def __init__(self):
+        self.latencies = collections.defaultdict(list)
+        self.errors = collections.defaultdict(collections.Counter)
+        self._lock = threading.Lock()
+
+    def add(self, endpoint, seconds, error=None):
+        with self._lock:
+            self.latencies[endpoint].append(seconds)
+            if error:
+                self.errors[endpoint][error] += 1
+
+
+def _error_label(response):
+    if response.ok:
+        return None
+    try:
+        code = response.json().get("error")
+    except ValueError:
+        code = None
+    return f"{response.status_code} {code}" if isinstance(code, str) else str(response.status_code)
+
+
+def run_clients(base_url, mix, payloads, concurrency, duration, total, timeout, seed):
+    """Closed-loop clients: each sends its next request as soon as the last one returns."""
+    results = Results()
+    names, weights = list(mix), list(mix.values())
+    deadline = time.perf_counter() + duration if duration else None
+    remaining = [total] if total else None
+    remaining_lock = threading.Lock()
+
+    def take():
+        if deadline is not None and time.perf_counter() >= deadline:
+            return False
+        if remaining is not None:
+            with remaining_lock:
+                if remaining[0] <= 0:
+                    return False
+                remaining[0] -= 1
+        return True
+
+    def client(worker):
+        rng = random.Random(f"{seed}:{worker}")
+        session = requests.Session()
+        while take():
+            endpoint = rng.choices(names, weights)[0]
+            kwargs = payloads.request(endpoint, rng)
+            started = time.perf_counter()
+            try:
+                response = session.post(base_url + ENDPOINTS[endpoint], timeout=timeout, **kwargs)
+                response.content  # include the body transfer in the latency
+                error = _error_label(response)
+            except requests.RequestException as e:
+                error = type(e).__name__
+            results.add(endpoint, time.perf_counter() - started, error)
+        session.close()
+
+    threads = [threading.Thread(target=client, args=(i,), daemon=True) for i in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, time.perf_counter() - started
+
+
+def summarize(results, elapsed):
+    rows = {}
+    everything = []
+    for endpoint in sorted(results.latencies):
+        values = sorted(results.latencies[endpoint])
+        everything.extend(values)
+        errors = results.errors.get(endpoint, {})
+        rows[endpoint] = {
+            "requests": len(values),
+            "errors": sum(errors.values()),
+            "throughput": round(len(values) / elapsed, 2),
+            "p50Ms": round(percentile(values, 50) * 1000, 1),
+            "p95Ms": round(percentile(values, 95) * 1000, 1),
+            "p99Ms": round(percentile(values, 99) * 1000, 1),
+            "errorBreakdown": dict(errors),
+        }
+    everything.sort()
+    rows["total"] = {
+        "requests": len(everything),
+        "errors": sum(sum(e.values()) for e in results.errors.values()),
+        "throughput": round(len(everything) / elapsed, 2) if elapsed else 0.0,
+        "p50Ms": round(percentile(everything, 50) * 1000, 1),
+        "p95Ms": round(percentile(everything, 95) * 1000, 1),
+        "p99Ms": round(percentile(everything, 99) * 1000, 1),
+        "errorBreakdown": dict(sum((collections.Counter(e) for e in results.errors.values()), collections.Counter())),
+    }
+    return rows
+
+
+def print_report(rows, elapsed, concurrency, llm_stats):
+    print(f"\n{concurrency} clients for {elapsed:.1f}s")
+    print(f"{'endpoint':<16}{'reqs':>7}{'errors':>8}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, row in rows.items():
+        print(f"{name:<16}{row['requests']:>7}{row['errors']:>8}{row['throughput']:>9.1f}"
+              f"{row['p50Ms']:>10.1f}{row['p95Ms']:>10.1f}{row['p99Ms']:>10.1f}")
+    broken = {name: row["errorBreakdown"] for name, row in rows.items() if row["errorBreakdown"] and name != "total"}
+    if broken:
+        print("\nerrors:")
+        for name, breakdown in broken.items():
+            for label, n in sorted(breakdown.items(), key=lambda kv: -kv[1]):
+                print(f"  {name:<16}{label:<40}{n:>6}")
+    if llm_stats:
+        print("\nLLM stand-in:")
+        for provider, outcomes in sorted(llm_stats.items()):
+            print(f"  {provider:<10}" + "  ".join(f"{k}={v}" for k, v in sorted(outcomes.items())))
+
+
+def start_api(server, llm_url, env_overrides, startup_timeout):
+    """Starts the API in a subprocess wired to the stand-in; returns (process, base_url)."""
+    port = _free_port()
+    env = dict(
+        os.environ,
+        PORT=str(port),
+        GEMINI_API_KEY=os.getenv("GEMINI_API_KEY", "load-test"),
+        GEMINI_API_ENDPOINT=llm_url,
+        OLLAMA_API_URL=f"{llm_url}/api/generate",
+        AZURE_AI_ENDPOINT=f"{llm_url}/azure",
+        AZURE_AI_KEY=os.getenv("AZURE_AI_KEY", "load-test"),
+    )
+    env.update(env_overrides)
+    cmd = [part.format(port=port) for part in SERVERS[server]]
+    proc = subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    while time.perf_counter() - start < startup_timeout:
+        if proc.poll() is not None:
+            raise SystemExit(f"{' '.join(cmd)} exited with {proc.returncode}")
+        try:
+            if requests.get(f"{base_url}/api/health", timeout=1).status_code == 200:
+                return proc, base_url
+        except requests.RequestException:
+            time.sleep(0.1)
+    stop_api(proc)
+    raise SystemExit(f"API did not answer /api/health within {startup_timeout}s")
+
+
+def stop_api(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="target an already running API instead of starting one")
+    parser.add_argument("--server", default="gunicorn", choices=sorted(SERVERS))
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="extra environment for the started API (e.g. WEB_CONCURRENCY=4)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(",".join(ENDPOINTS)),
+                        help="endpoint=weight list (default: all four, equal weight)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds (0 = use --requests)")
+    parser.add_argument("--requests", type=int, default=0, help="stop after this many requests")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-request client timeout")
+    parser.add_argument("--warmup-requests", type=int, default=0,
+                        help="requests sent (and not reported) before measuring")
+    parser.add_argument("--corpus", type=int, default=12, help="distinct resumes to cycle through")
+    parser.add_argument("--unique", action="store_true", help="make every render payload distinct")
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument("--json", help="also write the summary as JSON to this file")
+    fake_llm.add_behaviour_arguments(parser)
+    args = parser.parse_args()
+    if args.seed is None:
+        args.seed = 1234  # shared by the corpus, the clients and the stand-in
+    if not args.duration and not args.requests:
+        parser.error("set --duration or --requests")
+
+    payloads = Payloads(args.corpus, args.seed, args.unique)
+    llm_server = proc = None
+    try:
+        base_url = args.base_url
+        if not base_url:
+            llm_server, llm_url = fake_llm.start_in_thread(**fake_llm.behaviour_kwargs(args))
+            overrides = dict(item.split("=", 1) for item in args.env)
+            proc, base_url = start_api(args.server, llm_url, overrides, args.startup_timeout)
+            print(f"API ({args.server}) at {base_url}, LLM stand-in at {llm_url}")
+
+        if args.warmup_requests:
+            run_clients(base_url, args.mix, payloads, args.concurrency, 0, args.warmup_requests,
+                        args.timeout, args.seed)
+        results, elapsed = run_clients(base_url, args.mix, payloads, args.concurrency,
+                                       args.duration, args.requests, args.timeout, args.seed)
+        rows = summarize(results, elapsed)
+        llm_stats = llm_server.behaviour.stats() if llm_server else None
+        print_report(rows, elapsed, args.concurrency, llm_stats)
+
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump({"concurrency": args.concurrency, "elapsedSeconds": round(elapsed, 2),
+                           "mix": args.mix, "endpoints": rows, "llm": llm_stats}, f, indent=2)
+    finally:
+        if proc:
+            stop_api(proc)
+        if llm_server:
+            llm_server.shutdown()
+            llm_server.server_close()
+
+
+if __name__ == "__main__":
+    main()
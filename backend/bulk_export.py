@@ -0,0 +1,170 @@
+# backend/bulk_export.py
+import concurrent.futures
+import io
+import json
+import os
+import time
+import zipfile
+
+import render_cache
+import render_service
+import resume_model
+from render_service import RenderQueueFull, RenderTimeout
+
+# ------------------------------------------------------------
+# Bulk export: render many resumes with bounded parallelism and
+# stream them out as a zip while entries complete. At most
+# BULK_EXPORT_PARALLELISM documents are held in memory at once and
+# each chunk is handed to the client as soon as it is written.
+# ------------------------------------------------------------
+
+BULK_EXPORT_PARALLELISM = int(os.getenv("BULK_EXPORT_PARALLELISM", "4"))
+BULK_EXPORT_MAX_ITEMS = int(os.getenv("BULK_EXPORT_MAX_ITEMS", "500"))
+
+FORMATS = ("pdf", "docx")
+
+
+class _ZipSink(io.RawIOBase):
+    """Write-only, non-seekable sink; ZipFile then emits data descriptors instead of seeking back."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _entry_name(item, ext, used):
+    personal = item.get("personal", {}) if isinstance(item, dict) else {}
+    base = "_".join(((personal or {}).get("name") or "resume").split()) or "resume"
+    name = f"{base}.{ext}"
+    n = 2
+    while name in used:
+        name = f"{base}_{n}.{ext}"
+        n += 1
+    used.add(name)
+    return name
+
+
+def _submit(item, fmt):
+    """Returns a future for one item; cache hits and references resolve immediately."""
+    if "etag" in item:
+        body = render_cache.get(item["etag"])
+        future = concurrent.futures.Future()
+        if body is None:
+            future.set_exception(KeyError(f"Unknown or expired etag: {item['etag']}"))
+        else:
+            future.set_result(body)
+        return future
+
+    key = render_cache.cache_key(item, fmt)
+    body = render_cache.get(key)
+    if body is not None:
+        future = concurrent.futures.Future()
+        future.set_result(body)
+        return future
+
+    def _store(f):
+        if not f.cancelled() and f.exception() is None:
+            render_cache.put(key, f.result())
+
+    future = render_service.submit(fmt, item)
+    future.add_done_callback(_store)
+    return future
+
+
+def iter_rendered(items, fmt, parallelism=None):
+    """
+    Yields (index, bytes or exception) in completion order, never holding more than
+    `parallelism` renders. An item not back within RENDER_TIMEOUT + RENDER_TIMEOUT_GRACE
+    of being submitted is cancelled and yields RenderTimeout; other requests' renders
+    are left alone. An item the pool keeps refusing for that long yields RenderQueueFull.
+    """
+    parallelism = max(1, parallelism or BULK_EXPORT_PARALLELISM)
+    budget = render_service.RENDER_TIMEOUT + render_service.RENDER_TIMEOUT_GRACE
+    pending = list(enumerate(items))
+    pending.reverse()
+    in_flight = {}  # future -> (index, deadline)
+    refused_since = None  # when the pool first turned the next pending item away
+
+    try:
+        while pending or in_flight:
+            while pending and len(in_flight) < parallelism:
+                index, item = pending[-1]
+                fmt_for_item = item.get("format", fmt) if isinstance(item, dict) else fmt
+                try:
+                    in_flight[_submit(item, fmt_for_item)] = (index, time.monotonic() + budget)
+                except RenderQueueFull as e:
+                    now = time.monotonic()
+                    refused_since = now if refused_since is None else refused_since
+                    if now - refused_since >= budget:
+                        pending.pop()
+                        refused_since = None
+                        yield index, e
+                        continue
+                    if in_flight:
+                        break  # wait for one of ours to finish, then retry
+                    time.sleep(0.1)
+                    continue
+                pending.pop()
+                refused_since = None
+
+            if not in_flight:
+                continue
+            next_deadline = min(deadline for _, deadline in in_flight.values())
+            done, _ = concurrent.futures.wait(
+                in_flight,
+                timeout=max(0.0, next_deadline - time.monotonic()),
+                return_when=concurrent.futures.FIRST_COMPLETED,
+            )
+
+            for future in done:
+                index, _ = in_flight.pop(future)
+                try:
+                    yield index, future.result()
+                except Exception as e:
+                    yield index, e
+
+            # Give up on this export's overdue items only (cancelled if still queued)
+            now = time.monotonic()
+            for future, (index, deadline) in list(in_flight.items()):
+                if deadline <= now and not future.done():
+                    del in_flight[future]
+                    future.cancel()
+                    yield index, RenderTimeout(f"Render exceeded {render_service.RENDER_TIMEOUT:g}s")
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+
+def stream_zip(items, fmt, parallelism=None):
+    """Generator of zip archive chunks for `items` (resume payloads or {"etag": ...} references)."""
+    sink = _ZipSink()
+    used = set()
+    manifest = []
+
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as zf:
+        for index, result in iter_rendered(items, fmt, parallelism):
+            if isinstance(result, Exception):
+                manifest.append({"index": index, "ok": False, "error": type(result).__name__})
+            else:
+                # Named from the bytes themselves: an etag may point at any cached format
+                kind = resume_model.output_format(result)
+                name = _entry_name(items[index], resume_model.EXTENSIONS[kind], used)
+                zf.writestr(name, result)
+                manifest.append({"index": index, "ok": True, "file": name,
+                                 "mimeType": resume_model.MIMETYPES[kind]})
+            yield sink.drain()
+
+        manifest.sort(key=lambda m: m["index"])
+        zf.writestr("manifest.json", json.dumps(manifest, indent=2))
+    yield sink.drain()
@@ -0,0 +1,326 @@
+# backend/calendar_queue.py
+import base64
+import datetime
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+
+import metrics
+
+# ------------------------------------------------------------
+# Durable background queue for Calendar event creation.
+# Scheduling requests enqueue a job (one SQLite row) and return at
+# once; worker threads claim due jobs, insert the event and record
+# the outcome. Each job id is a base32hex string that is also the
+# Calendar event id and Meet requestId, so a retry after a lost
+# response finds the event instead of creating a second one.
+# Retryable failures (429 / 5xx / rate limits / network) back off
+# exponentially with jitter up to CALENDAR_QUEUE_MAX_ATTEMPTS.
+#
+# The database is shared by every gunicorn worker: claims happen
+# in BEGIN IMMEDIATE transactions, and a job whose worker died is
+# picked up again once its lease runs out.
+# ------------------------------------------------------------
+
+CALENDAR_QUEUE_PATH = os.getenv(
+    "CALENDAR_QUEUE_PATH",
+    os.path.join(os.path.dirname(__file__), "data", "calendar_queue.sqlite3"),
+)
+CALENDAR_QUEUE_WORKERS = int(os.getenv("CALENDAR_QUEUE_WORKERS", "2"))
+CALENDAR_QUEUE_MAX_ATTEMPTS = int(os.getenv("CALENDAR_QUEUE_MAX_ATTEMPTS", "6"))
+CALENDAR_QUEUE_BACKOFF_BASE = float(os.getenv("CALENDAR_QUEUE_BACKOFF_BASE", "2"))
+CALENDAR_QUEUE_BACKOFF_MAX = float(os.getenv("CALENDAR_QUEUE_BACKOFF_MAX", "300"))
+CALENDAR_QUEUE_LEASE_SECONDS = float(os.getenv("CALENDAR_QUEUE_LEASE_SECONDS", "120"))
+CALENDAR_QUEUE_POLL_SECONDS = float(os.getenv("CALENDAR_QUEUE_POLL_SECONDS", "1"))
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+_RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+_RATE_LIMIT_REASONS = ("rateLimitExceeded", "userRateLimitExceeded", "quotaExceeded")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS calendar_jobs (
+    id              TEXT PRIMARY KEY,
+    payload         TEXT NOT NULL,
+    status          TEXT NOT NULL,
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    lease_until     REAL,
+    result          TEXT,
+    error           TEXT,
+    created_at      REAL NOT NULL,
+    updated_at      REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS calendar_jobs_due ON calendar_jobs (status, next_attempt_at);
+"""
+
+JOBS = metrics.Counter(
+    "recruitedge_calendar_jobs_total",
+    "Calendar queue job attempts by outcome (done, retry, failed).",
+    ("outcome",),
+)
+
+_local = threading.local()
+_lock = threading.Lock()
+_wake = threading.Event()
+_stop = threading.Event()
+_workers = []
+
+
+def _connect():
+    """This thread's connection (sqlite3 connections are not shared across threads)."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(CALENDAR_QUEUE_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(CALENDAR_QUEUE_PATH, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def job_id(idempotency_key=None):
+    """
+    26-char base32hex id (0-9, a-v), valid as a Calendar event id. The same
+    idempotency key always maps to the same id.
+    """
+    raw = hashlib.sha256(idempotency_key.encode("utf-8")).digest() if idempotency_key else uuid.uuid4().bytes
+    return base64.b32hexencode(raw[:16]).decode("ascii").rstrip("=").lower()
+
+
+def _serialize(event):
+    def _iso(value):
+        return value if isinstance(value, str) else value.isoformat()
+
+    return json.dumps(dict(event, start_time=_iso(event["start_time"]), end_time=_iso(event["end_time"])))
+
+
+def _row(row):
+    if row is None:
+        return None
+    return {
+        "jobId": row["id"],
+        "status": row["status"],
+        "attempts": row["attempts"],
+        "nextAttemptAt": row["next_attempt_at"] if row["status"] == QUEUED else None,
+        "result": json.loads(row["result"]) if row["result"] else None,
+        "error": row["error"],
+        "createdAt": row["created_at"],
+        "updatedAt": row["updated_at"],
+    }
+
+
+class IdempotencyConflict(Exception):
+    """An idempotency key was reused for a different event."""
+
+    def __init__(self, jid):
+        super().__init__(f"Idempotency key already used for a different event (job {jid})")
+        self.job_id = jid
+
+
+def _when(event, field):
+    value = event.get(field)
+    if not value:
+        raise ValueError(f"Event is missing {field}")
+    if isinstance(value, datetime.datetime):
+        return value
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be an ISO 8601 date-time") from None
+
+
+def validate(event: dict):
+    """Raises ValueError if `event` can't be queued."""
+    if not event.get("summary"):
+        raise ValueError("Event is missing summary")
+    start, end = _when(event, "start_time"), _when(event, "end_time")
+    if (start.tzinfo is None) != (end.tzinfo is None):
+        raise ValueError("start_time and end_time must both have a UTC offset or neither")
+    if end <= start:
+        raise ValueError("end_time must be after start_time")
+    attendees = event.get("attendees", [])
+    if not isinstance(attendees, list) or not all(
+        isinstance(email, str) and "@" in email.strip("@") for email in attendees
+    ):
+        raise ValueError("attendees must be a list of email addresses")
+
+
+def enqueue_many(items) -> list:
+    """
+    Queues creation of each (event, idempotency key or None) in one transaction;
+    events are google_calendar_utils.create_calendar_events entries. Every event is
+    validated first (ValueError) and a key reused for a different event raises
+    IdempotencyConflict, both before anything is queued. Re-enqueueing the same
+    event with the same key returns the existing job.
+    """
+    items = list(items)
+    for event, _ in items:
+        validate(event)
+
+    now = time.time()
+    conn = _connect()
+    jids = []
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for event, idempotency_key in items:
+            jid = job_id(idempotency_key)
+            payload = _serialize(event)
+            inserted = conn.execute(
+                "INSERT OR IGNORE INTO calendar_jobs (id, payload, status, next_attempt_at, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (jid, payload, QUEUED, now, now, now),
+            ).rowcount
+            if not inserted:
+                (stored,) = conn.execute("SELECT payload FROM calendar_jobs WHERE id = ?", (jid,)).fetchone()
+                if json.loads(stored) != json.loads(payload):
+                    raise IdempotencyConflict(jid)
+            jids.append(jid)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    start()
+    _wake.set()
+    return [get_job(jid) for jid in jids]
+
+
+def enqueue(event: dict, idempotency_key: str = None) -> dict:
+    """Queues one event; see enqueue_many."""
+    return enqueue_many([(event, idempotency_key)])[0]
+
+
+def get_job(jid: str):
+    """Job status dict, or None for an unknown id."""
+    row = _connect().execute("SELECT * FROM calendar_jobs WHERE id = ?", (jid,)).fetchone()
+    return _row(row)
+
+
+def _claim():
+    """Marks the next due job as running (or re-claims one whose lease expired)."""
+    conn = _connect()
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute(
+            "SELECT * FROM calendar_jobs"
+            " WHERE (status = ? AND next_attempt_at <= ?) OR (status = ? AND lease_until < ?)"
+            " ORDER BY next_attempt_at LIMIT 1",
+            (QUEUED, now, RUNNING, now),
+        ).fetchone()
+        if row is not None:
+            conn.execute(
+                "UPDATE calendar_jobs SET status = ?, attempts = attempts + 1, lease_until = ?, updated_at = ?"
+                " WHERE id = ?",
+                (RUNNING, now + CALENDAR_QUEUE_LEASE_SECONDS, now, row["id"]),
+            )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return row
+
+
+def _finish(jid, status, result=None, error=None, next_attempt_at=None):
+    now = time.time()
+    _connect().execute(
+        "UPDATE calendar_jobs SET status = ?, result = ?, error = ?, lease_until = NULL,"
+        " next_attempt_at = COALESCE(?, next_attempt_at), updated_at = ? WHERE id = ?",
+        (status, json.dumps(result) if result is not None else None, error, next_attempt_at, now, jid),
+    )
+
+
+def _retryable(exc):
+    from googleapiclient.errors import HttpError
+
+    if isinstance(exc, HttpError):
+        status = exc.resp.status
+        if status in _RETRYABLE_STATUS:
+            return True
+        return status == 403 and any(reason in str(exc) for reason in _RATE_LIMIT_REASONS)
+    # Socket / httplib2 transport errors
+    return isinstance(exc, (OSError, TimeoutError)) or type(exc).__module__.startswith("httplib2")
+
+
+def backoff(attempt):
+    """Seconds before retry number `attempt` (1-based): full jitter over an exponential cap."""
+    return random.uniform(0, min(CALENDAR_QUEUE_BACKOFF_MAX, CALENDAR_QUEUE_BACKOFF_BASE * 2 ** (attempt - 1)))
+
+
+def _run_job(row):
+    import google_calendar_utils as gcal
+
+    jid = row["id"]
+    try:
+        with metrics.time_stage("calendar_insert"):
+            event = gcal.insert_event(json.loads(row["payload"]), event_id=jid)
+    except Exception as e:
+        if _retryable(e) and row["attempts"] + 1 < CALENDAR_QUEUE_MAX_ATTEMPTS:
+            JOBS.inc(outcome="retry")
+            _finish(jid, QUEUED, error=str(e), next_attempt_at=time.time() + backoff(row["attempts"] + 1))
+        else:
+            JOBS.inc(outcome="failed")
+            _finish(jid, FAILED, error=str(e))
+        return
+    JOBS.inc(outcome="done")
+    _finish(jid, DONE, result={
+        "eventId": event.get("id"),
+        "htmlLink": event.get("htmlLink"),
+        "hangoutLink": event.get("hangoutLink"),
+    })
+
+
+def _work():
+    while not _stop.is_set():
+        try:
+            row = _claim()
+        except sqlite3.OperationalError as e:
+            print(f"Calendar queue claim failed: {e}")
+            row = None
+        if row is None:
+            # Sleep until an enqueue wakes us or the next poll (retries, other processes)
+            _wake.wait(CALENDAR_QUEUE_POLL_SECONDS)
+            _wake.clear()
+            continue
+        _run_job(row)
+
+
+def start():
+    """Starts the worker threads (once per process; call after fork)."""
+    with _lock:
+        if _workers or CALENDAR_QUEUE_WORKERS <= 0:
+            return
+        _stop.clear()
+        for i in range(CALENDAR_QUEUE_WORKERS):
+            worker = threading.Thread(target=_work, name=f"calendar-queue-{i}", daemon=True)
+            worker.start()
+            _workers.append(worker)
+
+
+def resume():
+    """Starts the workers if an earlier process left unfinished jobs behind."""
+    if not os.path.exists(CALENDAR_QUEUE_PATH):
+        return
+    pending = _connect().execute(
+        "SELECT 1 FROM calendar_jobs WHERE status IN (?, ?) LIMIT 1", (QUEUED, RUNNING)
+    ).fetchone()
+    if pending:
+        start()
+
+
+def shutdown(timeout=5):
+    """Stops the workers; a job in flight finishes or is re-claimed after its lease."""
+    with _lock:
+        workers = list(_workers)
+        _workers.clear()
+    _stop.set()
+    _wake.set()
+    for worker in workers:
+        worker.join(timeout)
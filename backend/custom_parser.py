@@ -302,6 +302,8 @@ def parse_resume_data_custom(raw_resume_text: str) -> dict:
     # Process the last buffered section
     if current_section and section_content_buffer:
         process_buffer(current_section, section_content_buffer)
-        
-    return resume_data
+
+    # Canonical skill ids next to the free-text skills_list, as for AI-parsed resumes
+    from skill_normalizer import normalize_resume
+    return normalize_resume(resume_data)
     
\ No newline at end of file
@@ -0,0 +1,270 @@
+# backend/dedup_index.py
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+import metrics
+
+# ------------------------------------------------------------
+# Near-duplicate resume detection. Each ingested resume gets a
+# MinHash signature (DEDUP_NUM_PERM 32-bit minimums over word
+# shingles of its normalized extracted text) split into LSH bands of
+# DEDUP_BAND_ROWS values. Two resumes land in the same bucket of some
+# band with high probability once their Jaccard similarity is past
+# roughly (1 / bands) ** (1 / rows), so a new resume is compared only
+# with the few stored resumes sharing a bucket, never with the whole
+# pool. Email and phone are exact keys on top of that: the same
+# person re-applying with a rewritten resume still shows up.
+#
+# Text with no words has no shingles: its signature is all
+# 0xFFFFFFFF, it gets no band rows and never counts as a text match
+# (only email / phone can flag it).
+#
+# Signatures, bands and keys live in SQLite (DEDUP_INDEX_PATH), shared
+# by every worker and updated one resume at a time.
+# ------------------------------------------------------------
+
+DEDUP_INDEX_PATH = os.getenv(
+    "DEDUP_INDEX_PATH",
+    os.path.join(os.path.dirname(__file__), "data", "dedup.sqlite3"),
+)
+DEDUP_NUM_PERM = int(os.getenv("DEDUP_NUM_PERM", "128"))
+DEDUP_BAND_ROWS = int(os.getenv("DEDUP_BAND_ROWS", "8"))
+DEDUP_SHINGLE_WORDS = int(os.getenv("DEDUP_SHINGLE_WORDS", "3"))
+# Estimated Jaccard similarity at which a text match is reported
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.8"))
+
+# Multiply-shift hashing: h(x) = ((a * x + b) mod 2**64) >> 32, a odd
+_MAX_HASH = (1 << 32) - 1
+_SEED = 1
+_SHINGLE_BASE = 1_000_003
+
+_WORD = re.compile(r"[a-z0-9]+")
+_EMAIL = re.compile(r"[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}", re.I)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dedup_docs (
+    id         TEXT PRIMARY KEY,
+    signature  BLOB NOT NULL,
+    email      TEXT,
+    phone      TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS dedup_docs_email ON dedup_docs (email) WHERE email IS NOT NULL;
+CREATE INDEX IF NOT EXISTS dedup_docs_phone ON dedup_docs (phone) WHERE phone IS NOT NULL;
+CREATE TABLE IF NOT EXISTS dedup_bands (
+    band   INTEGER NOT NULL,
+    bucket BLOB NOT NULL,
+    doc_id TEXT NOT NULL,
+    PRIMARY KEY (band, bucket, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS dedup_bands_doc ON dedup_bands (doc_id);
+"""
+
+_local = threading.local()
+_params = None
+
+
+def _permutations():
+    """(a, b) uint64 vectors of the DEDUP_NUM_PERM hash functions (fixed seed: signatures must stay comparable)."""
+    global _params
+    if _params is None:
+        import numpy as np
+
+        rng = np.random.RandomState(_SEED)
+        a = rng.randint(0, 1 << 63, size=DEDUP_NUM_PERM, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        b = rng.randint(0, 1 << 63, size=DEDUP_NUM_PERM, dtype=np.uint64)
+        _params = (a, b)
+    return _params
+
+
+def normalize_text(text):
+    """Lowercase words only: layout, punctuation and bullet styles don't make two resumes differ."""
+    return " ".join(_WORD.findall((text or "").lower()))
+
+
+def normalize_email(email):
+    email = (email or "").strip().lower()
+    return email if _EMAIL.fullmatch(email) else None
+
+
+def normalize_phone(phone):
+    """Last 10 digits (drops country codes and formatting), or None for fewer than 7 digits."""
+    digits = re.sub(r"\D", "", phone or "")
+    return digits[-10:] if len(digits) >= 7 else None
+
+
+def shingle_hashes(text):
+    """Distinct 32-bit hashes of the DEDUP_SHINGLE_WORDS-word shingles (uint64 array)."""
+    import numpy as np
+
+    words = normalize_text(text).split()
+    hashed = np.fromiter((zlib.crc32(w.encode("utf-8")) for w in words), dtype=np.uint64, count=len(words))
+    n = DEDUP_SHINGLE_WORDS
+    if len(hashed) > n:
+        # Polynomial combination of the word hashes at each offset (uint64 wraps around)
+        combined = hashed[:len(hashed) - n + 1].copy()
+        for i in range(1, n):
+            combined = combined * np.uint64(_SHINGLE_BASE) + hashed[i:len(hashed) - n + 1 + i]
+        hashed = combined
+    elif len(hashed):
+        combined = np.uint64(0)
+        for value in hashed:
+            combined = combined * np.uint64(_SHINGLE_BASE) + value
+        hashed = np.array([combined], dtype=np.uint64)
+    return np.unique(hashed & np.uint64(_MAX_HASH))
+
+
+def signature(text):
+    """MinHash signature (uint32 array of DEDUP_NUM_PERM values) of the text's shingles (all _MAX_HASH if none)."""
+    import numpy as np
+
+    a, b = _permutations()
+    hashed = shingle_hashes(text)
+    if not len(hashed):
+        return np.full(DEDUP_NUM_PERM, _MAX_HASH, dtype=np.uint32)
+    # (perm x shingle) table of hash values (uint64 arithmetic wraps), min per permutation
+    values = (a[:, None] * hashed[None, :] + b[:, None]) >> np.uint64(32)
+    return values.min(axis=1).astype(np.uint32)
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity: the share of equal signature positions."""
+    return float((sig_a == sig_b).mean())
+
+
+def is_empty(sig):
+    """True for the signature of text without shingles, which says nothing about content."""
+    return bool((sig == _MAX_HASH).all())
+
+
+def _bands(sig):
+    """(band, bucket bytes) rows of a signature; none for an empty one."""
+    if is_empty(sig):
+        return []
+    raw = sig.astype("<u4").tobytes()
+    width = DEDUP_BAND_ROWS * 4
+    return [(band, raw[band * width:(band + 1) * width]) for band in range(len(raw) // width)]
+
+
+def _connect():
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(DEDUP_INDEX_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(DEDUP_INDEX_PATH, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def _matches(conn, sig, email, phone, exclude=None):
+    import numpy as np
+
+    found = {}  # doc id -> {"reasons": set, "similarity": float}
+
+    def _hit(doc_id, reason):
+        if doc_id != exclude:
+            found.setdefault(doc_id, {"reasons": set(), "similarity": None})["reasons"].add(reason)
+
+    if email:
+        for (doc_id,) in conn.execute("SELECT id FROM dedup_docs WHERE email = ?", (email,)):
+            _hit(doc_id, "email")
+    if phone:
+        for (doc_id,) in conn.execute("SELECT id FROM dedup_docs WHERE phone = ?", (phone,)):
+            _hit(doc_id, "phone")
+
+    # LSH candidates: anything sharing a bucket in at least one band
+    empty = is_empty(sig)
+    candidates = set()
+    for band, bucket in _bands(sig):
+        candidates.update(doc_id for (doc_id,) in conn.execute(
+            "SELECT doc_id FROM dedup_bands WHERE band = ? AND bucket = ?", (band, bucket)))
+    candidates.discard(exclude)
+    candidates |= set(found)
+    if candidates:
+        ids = list(candidates)
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            rows = conn.execute(
+                f"SELECT id, signature FROM dedup_docs WHERE id IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            for doc_id, blob in rows:
+                stored = np.frombuffer(blob, dtype="<u4")
+                if empty or is_empty(stored):
+                    continue
+                score = similarity(sig, stored)
+                if score >= DEDUP_THRESHOLD:
+                    _hit(doc_id, "text")
+                if doc_id in found:
+                    found[doc_id]["similarity"] = round(score, 4)
+
+    return sorted(
+        ({"candidateId": doc_id, "similarity": hit["similarity"], "reasons": sorted(hit["reasons"])}
+         for doc_id, hit in found.items()),
+        key=lambda m: (-(m["similarity"] or 0), m["candidateId"]),
+    )
+
+
+def check(text, email=None, phone=None):
+    """Stored resumes that look like duplicates of this one, without indexing it."""
+    with metrics.time_stage("dedup_check"):
+        return _matches(_connect(), signature(text), normalize_email(email), normalize_phone(phone))
+
+
+def add(doc_id, text, email=None, phone=None):
+    """
+    Indexes a resume (replacing an earlier entry with the same id) and returns the
+    duplicates it already had in the index: [{"candidateId", "similarity", "reasons"}],
+    reasons being "text" (similar content), "email" and/or "phone" (same contact).
+    """
+    sig = signature(text)
+    email, phone = normalize_email(email), normalize_phone(phone)
+    conn = _connect()
+    with metrics.time_stage("dedup_check"):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            matches = _matches(conn, sig, email, phone, exclude=doc_id)
+            conn.execute("DELETE FROM dedup_bands WHERE doc_id = ?", (doc_id,))
+            conn.execute(
+                "INSERT OR REPLACE INTO dedup_docs (id, signature, email, phone, created_at) VALUES (?, ?, ?, ?, ?)",
+                (doc_id, sig.astype("<u4").tobytes(), email, phone, time.time()),
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO dedup_bands (band, bucket, doc_id) VALUES (?, ?, ?)",
+                [(band, bucket, doc_id) for band, bucket in _bands(sig)],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    return matches
+
+
+def duplicates_of(doc_id):
+    """Duplicates of an indexed resume, or None if `doc_id` isn't indexed."""
+    import numpy as np
+
+    conn = _connect()
+    row = conn.execute("SELECT signature, email, phone FROM dedup_docs WHERE id = ?", (doc_id,)).fetchone()
+    if row is None:
+        return None
+    return _matches(conn, np.frombuffer(row[0], dtype="<u4"), row[1], row[2], exclude=doc_id)
+
+
+def remove(doc_id):
+    """True if the resume was indexed."""
+    conn = _connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DELETE FROM dedup_bands WHERE doc_id = ?", (doc_id,))
+        removed = conn.execute("DELETE FROM dedup_docs WHERE id = ?", (doc_id,)).rowcount
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return bool(removed)
@@ -1,12 +1,15 @@
 # backend/document_generator.py
 import io, base64, re, os
-from bs4 import BeautifulSoup
 from jinja2 import Environment, FileSystemLoader
 from weasyprint import HTML
 
 from docx import Document
 from docx.shared import Pt, Inches, RGBColor
 
+import html_to_docx
+import metrics
+from asset_store import asset_url, asset_url_fetcher, get_asset
+
 # ------------------------------------------------------------
 # Helpers (sanitization, minimal HTML -> DOCX runs, safe images)
 # ------------------------------------------------------------
@@ -33,25 +36,52 @@ def _add_b64_image(paragraph, b64, width_inches=1.3, name="image.png"):
         # Skip bad/corrupt images instead of crashing generation
         pass
 
-def _inline_html(p, html):
-    """Very small subset of inline HTML -> DOCX runs."""
-    if not html:
-        return
-    soup = BeautifulSoup(html, "html.parser")
-    for n in soup.contents:
-        tag = getattr(n, "name", None)
-        if tag == "strong":
-            r = p.add_run(n.get_text()); r.bold = True
-        elif tag == "em":
-            r = p.add_run(n.get_text()); r.italic = True
-        elif tag == "br":
-            p.add_run().add_break()
-        elif tag == "a":
-            r = p.add_run(n.get_text()); r.font.underline = True; r.font.color.rgb = RGBColor(0,0,255)
-        elif isinstance(n, str):
-            p.add_run(n)
-        elif getattr(n, "contents", None):
-            _inline_html(p, str(n))
+def _add_image(paragraph, data, asset_key, b64_key, width_inches, name):
+    """Add an image by asset reference (preferred) or inline base64."""
+    record = get_asset(data.get(asset_key))
+    if record:
+        bio = io.BytesIO(record["bytes"])
+        bio.name = name
+        paragraph.add_run().add_picture(bio, width=Inches(width_inches))
+    elif data.get(b64_key):
+        _add_b64_image(paragraph, data[b64_key], width_inches, name)
+
+def _image_src(data, asset_key, b64_key):
+    """<img src> for the PDF template: asset: URL when referenced, else the data URI."""
+    if get_asset(data.get(asset_key)):
+        return asset_url(data[asset_key])
+    return data.get(b64_key) or None
+
+class _DocxSink:
+    """html_to_docx sink writing python-docx runs and (list) paragraphs."""
+
+    def __init__(self, doc, paragraph):
+        self.doc = doc
+        self.p = paragraph
+
+    def run(self, text, bold, italic, underline, link):
+        r = self.p.add_run(text)
+        if bold:
+            r.bold = True
+        if italic:
+            r.italic = True
+        if link:
+            r.font.color.rgb = RGBColor(0, 0, 255)
+        if underline or link:
+            r.font.underline = True
+
+    def line_break(self):
+        self.p.add_run().add_break()
+
+    def paragraph(self, style):
+        if self.p.runs:
+            self.p = self.doc.add_paragraph(style=style)
+        else:
+            self.p.style = style
+
+def _inline_html(doc, p, html):
+    """Rich-text HTML -> DOCX runs, starting in paragraph `p`; lists become List Bullet/Number paragraphs."""
+    html_to_docx.convert(html, _DocxSink(doc, p))
 
 # ------------------------------------------------------------
 # DOCX GENERATION (returns BytesIO buffer, not a Document)
@@ -76,8 +106,7 @@ def generate_docx_from_data(data: dict) -> io.BytesIO:
     table.autofit = True
     left, mid, right = table.rows[0].cells
 
-    if data.get("pamtenLogoBase64"):
-        _add_b64_image(left.paragraphs[0], data["pamtenLogoBase64"], 1.2, "logo.png")
+    _add_image(left.paragraphs[0], data, "pamtenLogoAssetId", "pamtenLogoBase64", 1.2, "logo.png")
 
     person = data.get("personal", {}) or {}
     p = mid.paragraphs[0]
@@ -93,8 +122,7 @@ def generate_docx_from_data(data: dict) -> io.BytesIO:
         contacts.append(legal)
     mid.add_paragraph(" | ".join([c for c in contacts if c]))
 
-    if data.get("profilePicBase64"):
-        _add_b64_image(right.paragraphs[0], data["profilePicBase64"], 1.1, "profile.jpg")
+    _add_image(right.paragraphs[0], data, "profilePicAssetId", "profilePicBase64", 1.1, "profile.jpg")
 
     doc.add_paragraph()  # spacer
 
@@ -102,7 +130,7 @@ def generate_docx_from_data(data: dict) -> io.BytesIO:
     if data.get("summary"):
         doc.add_heading("Summary", level=2)
         p = doc.add_paragraph()
-        _inline_html(p, data.get("summary"))
+        _inline_html(doc, p, data.get("summary"))
 
     # Generic sections
     for section, hdr in [
@@ -134,7 +162,7 @@ def generate_docx_from_data(data: dict) -> io.BytesIO:
             if section == "experience":
                 p.add_run(_clean(it.get("jobTitle"))).bold = True
                 p.add_run(f"\n{_clean(it.get('company'))} | {_clean(it.get('dates'))}\n").italic = True
-                _inline_html(p, it.get("description"))
+                _inline_html(doc, p, it.get("description"))
             elif section == "education":
                 p.add_run(_clean(it.get("degree"))).bold = True
                 p.add_run(f", {_clean(it.get('institution'))}\n")
@@ -144,7 +172,7 @@ def generate_docx_from_data(data: dict) -> io.BytesIO:
             elif section == "projects":
                 p.add_run(_clean(it.get("title"))).bold = True
                 p.add_run(f" ({_clean(it.get('date'))})\n").italic = True
-                _inline_html(p, it.get("description"))
+                _inline_html(doc, p, it.get("description"))
             elif section == "publications":
                 p.add_run(_clean(it.get("title"))).bold = True
                 p.add_run(f" ({_clean(it.get('date'))})\n").italic = True
@@ -173,16 +201,38 @@ def clean_text(text: str) -> str:
     cleaned_text = "\n".join(line.strip() for line in cleaned_text.split("\n"))
     return cleaned_text.strip()
 
-def generate_pdf_from_data(data):
+_template = None
+
+def _get_template():
+    """Load resume_template.html once per process."""
+    global _template
+    if _template is None:
+        env = Environment(loader=FileSystemLoader(os.path.join(os.path.dirname(__file__), "assets")))
+        _template = env.get_template("resume_template.html")
+    return _template
+
+def warm_up():
+    """Pre-load the template, fonts and python-docx package so the first real render is fast."""
+    _get_template()
+    generate_docx_from_data({})
+    HTML(string="<p>warm-up</p>").write_pdf()
+
+def render_html(data) -> str:
+    """Resume template -> HTML string (images as asset: URLs or inline data URIs)."""
     data = data or {}
-    data["pamtenLogoSrc"] = data.get("pamtenLogoBase64") or None
-    data["profilePicSrc"] = data.get("profilePicBase64") or None
+    data["pamtenLogoSrc"] = _image_src(data, "pamtenLogoAssetId", "pamtenLogoBase64")
+    data["profilePicSrc"] = _image_src(data, "profilePicAssetId", "profilePicBase64")
 
     if data.get("skills"):
         for skill in data["skills"]:
             skill["skills_list"] = clean_text(skill.get("skills_list", ""))
 
-    env = Environment(loader=FileSystemLoader(os.path.join(os.path.dirname(__file__), "assets")))
-    template = env.get_template("resume_template.html")
-    rendered_html = template.render(**data)
-    return HTML(string=rendered_html).write_pdf()
+    with metrics.time_stage("template_render"):
+        return _get_template().render(**data)
+
+def html_to_pdf(rendered_html: str) -> bytes:
+    with metrics.time_stage("pdf_serialize"):
+        return HTML(string=rendered_html, url_fetcher=asset_url_fetcher).write_pdf()
+
+def generate_pdf_from_data(data):
+    return html_to_pdf(render_html(data))
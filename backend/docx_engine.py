@@ -0,0 +1,428 @@
+# backend/docx_engine.py
+import io
+import re
+import struct
+import threading
+import zipfile
+import zlib
+from xml.sax.saxutils import escape, quoteattr
+
+from docx import Document
+from docx.image.image import Image as DocxImage
+from docx.shared import Inches, Pt, RGBColor
+
+import html_to_docx
+import metrics
+from asset_store import decode_base64_image, get_asset
+from document_generator import _clean
+
+# ------------------------------------------------------------
+# Template-cloning DOCX generator. The python-docx default template
+# is loaded once; its parts are cached already deflated, styles.xml
+# is cached per (font, size), and each request only builds
+# document.xml from pre-serialized WordprocessingML fragments.
+# Output matches generate_docx_from_data section for section.
+# ------------------------------------------------------------
+
+_FONT_SENTINEL = "__RESUME_FONT__"
+_SIZE_SENTINEL_PT = 1638  # -> <w:sz w:val="3276"/>, never used by the real template
+_SIZE_SENTINEL = f'<w:sz w:val="{_SIZE_SENTINEL_PT * 2}"/>'
+
+_DOS_DATE = (0 << 9) | (1 << 5) | 1  # 1980-01-01, keeps output byte-for-byte deterministic
+_DOS_TIME = 0
+
+SECTIONS = [
+    ("experience", "Experience"),
+    ("education", "Education"),
+    ("skills", "Skills"),
+    ("projects", "Projects"),
+    ("publications", "Publications"),
+    ("certifications", "Certifications"),
+]
+
+
+# -----------------------------
+# Minimal zip writer for pre-deflated parts
+# -----------------------------
+def _entry(name, data, compress=True):
+    raw = zlib.compressobj(6, zlib.DEFLATED, -15)
+    body = raw.compress(data) + raw.flush() if compress else data
+    return (name.encode("utf-8"), 8 if compress else 0, zlib.crc32(data), body, len(data))
+
+
+def _write_zip(entries) -> bytes:
+    out = io.BytesIO()
+    central = []
+    for name, method, crc, body, size in entries:
+        offset = out.tell()
+        out.write(struct.pack(
+            "<IHHHHHIIIHH", 0x04034B50, 20, 0, method, _DOS_TIME, _DOS_DATE,
+            crc, len(body), size, len(name), 0,
+        ))
+        out.write(name)
+        out.write(body)
+        central.append(struct.pack(
+            "<IHHHHHHIIIHHHHHII", 0x02014B50, 20, 20, 0, method, _DOS_TIME, _DOS_DATE,
+            crc, len(body), size, len(name), 0, 0, 0, 0, 0, offset,
+        ) + name)
+    cd_offset = out.tell()
+    for record in central:
+        out.write(record)
+    out.write(struct.pack(
+        "<IHHHHIIH", 0x06054B50, 0, 0, len(central), len(central),
+        out.tell() - cd_offset, cd_offset, 0,
+    ))
+    return out.getvalue()
+
+
+# -----------------------------
+# Template loading (once per process)
+# -----------------------------
+class _Template:
+    def __init__(self):
+        doc = Document()
+        normal = doc.styles["Normal"]
+        normal.font.name = _FONT_SENTINEL
+        normal.font.size = Pt(_SIZE_SENTINEL_PT)
+        buf = io.BytesIO()
+        doc.save(buf)
+
+        with zipfile.ZipFile(buf) as zf:
+            parts = {info.filename: zf.read(info.filename) for info in zf.infolist()}
+
+        styles = parts.pop("word/styles.xml").decode("utf-8")
+        if styles.count(_SIZE_SENTINEL) != 1 or _FONT_SENTINEL not in styles:
+            raise RuntimeError("Unexpected styles.xml layout in DOCX template")
+        before, after = styles.split(_SIZE_SENTINEL)
+        self.styles_fragments = (before.split(_FONT_SENTINEL), after.split(_FONT_SENTINEL))
+
+        document = parts.pop("word/document.xml").decode("utf-8")
+        body_open = document.index("<w:body>") + len("<w:body>")
+        self.document_head = document[:body_open]
+        self.document_tail = document[document.index("<w:sectPr"):]
+
+        section = re.search(r'<w:pgSz w:w="(\d+)"[^>]*/>.*?<w:pgMar[^>]*w:right="(\d+)"[^>]*w:left="(\d+)"', self.document_tail)
+        page_w, right, left = (int(g) for g in section.groups())
+        self.column_width = (page_w - right - left) // 3
+
+        self.rels = parts.pop("word/_rels/document.xml.rels").decode("utf-8")
+        self.next_rid = max(int(n) for n in re.findall(r'Id="rId(\d+)"', self.rels)) + 1
+        self.content_types = parts.pop("[Content_Types].xml").decode("utf-8")
+        self.static_entries = [_entry(name, data) for name, data in parts.items()]
+
+        self._styles_cache = {}
+        self._lock = threading.Lock()
+
+    def styles_entry(self, font_name, size_half_points):
+        key = (font_name, size_half_points)
+        with self._lock:
+            cached = self._styles_cache.get(key)
+        if cached:
+            return cached
+        font = escape(font_name, {'"': "&quot;"})
+        before, after = self.styles_fragments
+        xml = font.join(before) + f'<w:sz w:val="{size_half_points}"/>' + font.join(after)
+        entry = _entry("word/styles.xml", xml.encode("utf-8"))
+        with self._lock:
+            if len(self._styles_cache) > 64:
+                self._styles_cache.clear()
+            self._styles_cache[key] = entry
+        return entry
+
+
+_template = None
+_template_lock = threading.Lock()
+
+
+def _get_template():
+    global _template
+    if _template is None:
+        with _template_lock:
+            if _template is None:
+                _template = _Template()
+    return _template
+
+
+def warm_up():
+    _get_template()
+    generate_docx({})
+
+
+# -----------------------------
+# WordprocessingML fragments
+# -----------------------------
+def _text_xml(text):
+    """run text -> <w:t>/<w:br/>/<w:tab/> sequence, mirroring python-docx's run.text setter."""
+    out = []
+    for piece in re.split(r"(\t|\r\n|\n|\r)", text):
+        if piece == "\t":
+            out.append("<w:tab/>")
+        elif piece in ("\n", "\r", "\r\n"):
+            out.append("<w:br/>")
+        elif piece:
+            space = ' xml:space="preserve"' if piece != piece.strip() else ""
+            out.append(f"<w:t{space}>{escape(piece)}</w:t>")
+    return "".join(out)
+
+
+def _run(text="", bold=False, italic=False, color=None, size=None, underline=False, br=False):
+    props = []
+    if bold:
+        props.append("<w:b/>")
+    if italic:
+        props.append("<w:i/>")
+    if color:
+        props.append(f'<w:color w:val="{color}"/>')
+    if size:
+        props.append(f'<w:sz w:val="{size}"/>')
+    if underline:
+        props.append('<w:u w:val="single"/>')
+    rpr = f"<w:rPr>{''.join(props)}</w:rPr>" if props else ""
+    return f"<w:r>{rpr}{'<w:br/>' if br else ''}{_text_xml(text)}</w:r>"
+
+
+def _paragraph(runs="", style=None):
+    ppr = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+    if not ppr and not runs:
+        return "<w:p/>"
+    return f"<w:p>{ppr}{runs}</w:p>"
+
+
+def _heading(text):
+    return _paragraph(_run(text), style="Heading2")
+
+
+class _XmlSink:
+    """html_to_docx sink collecting WordprocessingML paragraphs."""
+
+    def __init__(self, lead_runs=""):
+        self.paragraphs = []
+        self.runs = [lead_runs] if lead_runs else []
+        self.style = None
+
+    def run(self, text, bold, italic, underline, link):
+        self.runs.append(_run(text, bold=bold, italic=italic, color="0000FF" if link else None, underline=underline or link))
+
+    def line_break(self):
+        self.runs.append(_run(br=True))
+
+    def paragraph(self, style):
+        if self.runs:
+            self._flush()
+        self.style = style.replace(" ", "") if style else None  # style name -> styleId
+
+    def _flush(self):
+        self.paragraphs.append(_paragraph("".join(self.runs), self.style))
+        self.runs = []
+        self.style = None
+
+    def xml(self):
+        self._flush()
+        return "".join(self.paragraphs)
+
+
+def _rich_paragraphs(lead_runs, html):
+    """Paragraph starting with `lead_runs` followed by rich-text HTML (lists add paragraphs)."""
+    sink = _XmlSink(lead_runs)
+    html_to_docx.convert(html, sink)
+    return sink.xml()
+
+
+# -----------------------------
+# Images
+# -----------------------------
+class _Media:
+    """Collects image parts + relationships for one document."""
+
+    def __init__(self, template):
+        self.template = template
+        self.rels = []
+        self.entries = []
+        self.extensions = set()
+        self._by_sha1 = {}
+        self._next_rid = template.next_rid
+        self._doc_pr_id = 0
+
+    def drawing(self, blob, width_inches):
+        try:
+            image = DocxImage.from_blob(blob)
+        except Exception:
+            return ""  # corrupt image: skip, like _add_b64_image
+        rid = self._by_sha1.get(image.sha1)
+        if rid is None:
+            rid = f"rId{self._next_rid}"
+            self._next_rid += 1
+            name = f"media/image{len(self.entries) + 1}.{image.ext}"
+            self.rels.append(
+                f'<Relationship Id="{rid}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/image" Target="{name}"/>'
+            )
+            self.entries.append(_entry(f"word/{name}", blob, compress=False))
+            self.extensions.add((image.ext, image.content_type))
+            self._by_sha1[image.sha1] = rid
+
+        cx, cy = image.scaled_dimensions(Inches(width_inches), None)
+        self._doc_pr_id += 1
+        return (
+            '<w:r><w:drawing><wp:inline xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+            'xmlns:pic="http://schemas.openxmlformats.org/drawingml/2006/picture">'
+            f'<wp:extent cx="{cx}" cy="{cy}"/><wp:docPr id="{self._doc_pr_id}" name="Picture {self._doc_pr_id}"/>'
+            '<wp:cNvGraphicFramePr><a:graphicFrameLocks noChangeAspect="1"/></wp:cNvGraphicFramePr>'
+            '<a:graphic><a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/picture"><pic:pic>'
+            f'<pic:nvPicPr><pic:cNvPr id="0" name={quoteattr(image.filename)}/><pic:cNvPicPr/></pic:nvPicPr>'
+            f'<pic:blipFill><a:blip r:embed="{rid}"/><a:stretch><a:fillRect/></a:stretch></pic:blipFill>'
+            f'<pic:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm><a:prstGeom prst="rect"/></pic:spPr>'
+            '</pic:pic></a:graphicData></a:graphic></wp:inline></w:drawing></w:r>'
+        )
+
+    def image(self, data, asset_key, b64_key, width_inches):
+        record = get_asset(data.get(asset_key))
+        if record:
+            return self.drawing(record["bytes"], width_inches)
+        if data.get(b64_key):
+            try:
+                return self.drawing(decode_base64_image(data[b64_key]), width_inches)
+            except Exception:
+                return ""
+        return ""
+
+    def package_entries(self):
+        t = self.template
+        rels = t.rels
+        if self.rels:
+            rels = rels.replace("</Relationships>", "".join(self.rels) + "</Relationships>")
+        types = t.content_types
+        missing = [
+            f'<Default Extension="{ext}" ContentType="{ct}"/>'
+            for ext, ct in sorted(self.extensions)
+            if f'Extension="{ext}"' not in types
+        ]
+        if missing:
+            types = types.replace("<Default ", "".join(missing) + "<Default ", 1)
+        return [
+            _entry("[Content_Types].xml", types.encode("utf-8")),
+            _entry("word/_rels/document.xml.rels", rels.encode("utf-8")),
+        ] + self.entries
+
+
+# -----------------------------
+# Document body
+# -----------------------------
+def _header_table(data, media, accent, column_width):
+    person = data.get("personal", {}) or {}
+
+    logo = media.image(data, "pamtenLogoAssetId", "pamtenLogoBase64", 1.2)
+    contacts = [
+        _clean(person.get("email")),
+        _clean(person.get("phone")),
+        _clean(person.get("location")),
+    ]
+    legal = _clean(person.get("legalStatus"))
+    if legal and legal.lower() != "prefer not to say":
+        contacts.append(legal)
+    middle = (
+        _paragraph(_run(_clean(person.get("name")), bold=True, color=accent, size=48))
+        + _paragraph(_run(" | ".join([c for c in contacts if c])))
+    )
+    picture = media.image(data, "profilePicAssetId", "profilePicBase64", 1.1)
+
+    def cell(content):
+        return f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{column_width}"/></w:tcPr>{content}</w:tc>'
+
+    grid = f'<w:gridCol w:w="{column_width}"/>' * 3
+    return (
+        '<w:tbl><w:tblPr><w:tblW w:type="auto" w:w="0"/><w:tblLayout w:type="autofit"/>'
+        '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" w:noHBand="0" w:noVBand="1" w:val="04A0"/>'
+        f"</w:tblPr><w:tblGrid>{grid}</w:tblGrid><w:tr>"
+        + cell(_paragraph(logo))
+        + cell(middle)
+        + cell(_paragraph(picture))
+        + "</w:tr></w:tbl>"
+    )
+
+
+def _section_item(section, it):
+    if section == "experience":
+        return _rich_paragraphs(
+            _run(_clean(it.get("jobTitle")), bold=True)
+            + _run(f"\n{_clean(it.get('company'))} | {_clean(it.get('dates'))}\n", italic=True),
+            it.get("description"),
+        )
+    if section == "education":
+        tail = _clean(it.get("graduationYear"))
+        if it.get("gpa"):
+            tail += f" | GPA: {_clean(it.get('gpa'))}"
+        return _paragraph(
+            _run(_clean(it.get("degree")), bold=True)
+            + _run(f", {_clean(it.get('institution'))}\n")
+            + _run(tail, italic=True)
+        )
+    if section == "projects":
+        return _rich_paragraphs(
+            _run(_clean(it.get("title")), bold=True)
+            + _run(f" ({_clean(it.get('date'))})\n", italic=True),
+            it.get("description"),
+        )
+    if section == "publications":
+        return _paragraph(
+            _run(_clean(it.get("title")), bold=True)
+            + _run(f" ({_clean(it.get('date'))})\n", italic=True)
+            + _run(f"{_clean(it.get('authors'))} - {_clean(it.get('journal'))}")
+        )
+    if section == "certifications":
+        issuer = _clean(it.get("issuer"))
+        if it.get("date"):
+            issuer += f" | {_clean(it.get('date'))}"
+        return _paragraph(_run(_clean(it.get("name")), bold=True) + _run(f"\n{issuer}", italic=True))
+    return _paragraph()
+
+
+def _body(data, media, accent, column_width):
+    parts = [_header_table(data, media, accent, column_width), _paragraph()]
+
+    if data.get("summary"):
+        parts.append(_heading("Summary"))
+        parts.append(_rich_paragraphs("", data.get("summary")))
+
+    for section, hdr in SECTIONS:
+        items = data.get(section) or []
+        if not any(isinstance(x, dict) for x in items) and section != "skills":
+            continue
+
+        parts.append(_heading(hdr))
+
+        if section == "skills":
+            for s in items:
+                if isinstance(s, dict):
+                    parts.append(_paragraph(
+                        _run(_clean(s.get("category")) + ": ", bold=True)
+                        + _run(_clean(s.get("skills_list")))
+                    ))
+            continue
+
+        for it in items:
+            if isinstance(it, dict):
+                parts.append(_section_item(section, it))
+
+    return "".join(parts)
+
+
+def generate_docx(data: dict) -> bytes:
+    """Renders resume data to .docx bytes from the cached template."""
+    with metrics.time_stage("docx_serialize"):
+        data = data or {}
+        template = _get_template()
+
+        style = data.get("styleOptions", {}) or {}
+        font_name = (style.get("fontFamily", "Calibri").split(",")[0]).strip()
+        font_size = int(Pt(style.get("fontSize", 11)).pt * 2)
+        accent = str(RGBColor.from_string(style.get("accentColor", "#34495e").lstrip("#")))
+
+        media = _Media(template)
+        body = _body(data, media, accent, template.column_width)
+        document = template.document_head + body + template.document_tail
+
+        entries = media.package_entries()
+        entries.append(_entry("word/document.xml", document.encode("utf-8")))
+        entries.append(template.styles_entry(font_name, font_size))
+        entries.extend(template.static_entries)
+        return _write_zip(entries)
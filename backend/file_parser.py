@@ -52,55 +52,134 @@ def parse_resume_file(file_storage):
         print(f"Error in parse_resume_file: {e}")
         return {"error": f"An error occurred while parsing the file: {e}"}
         '''
-import docx
-import pypdf
-import io
-from bs4 import BeautifulSoup
+import asyncio
 
-# Absolute import for Render (no leading dot)
-from gemini_utils import structure_text_with_ai
+import metrics
+import uploads
 
-def parse_resume_file(file_storage):
+# python-docx, pypdf and the Gemini client are imported on first parse
+# so the app (and /api/health) comes up without them.
+
+UNSUPPORTED_FILE_TYPE = "Unsupported file type. Please upload a .docx or .pdf file."
+NO_TEXT_EXTRACTED = "Could not extract any text from the document."
+
+def extract_text(kind, stream):
+    """
+    Returns the raw text of a "docx" / "pdf" upload (see uploads.sniff), or None for
+    any other kind. Both readers work on the (possibly disk-spooled) stream directly.
+    """
+    parts = []
+    if kind == "docx":
+        import docx
+        doc = docx.Document(stream)
+        for para in doc.paragraphs:
+            parts.append(para.text + "\n")
+
+    elif kind == "pdf":
+        import pypdf
+        pdf_reader = pypdf.PdfReader(stream)
+        for page in pdf_reader.pages:
+            extracted = page.extract_text()
+            if extracted:
+                parts.append(extracted + "\n")
+
+    else:
+        return None
+    return "".join(parts)
+
+def _post_process(result, raw_text=None):
+    """
+    Adds canonical skill ids (normalizedSkills) to the parsed resume, saves it to the
+    resume store (resumeId, version), indexes it for job matching under the same id
+    (candidateId) and checks the extracted text against earlier uploads (duplicates).
+    Each step is best effort.
+    """
+    parsed = result["parsedData"]
+    try:
+        import skill_normalizer
+        skill_normalizer.normalize_resume(parsed)
+    except Exception as e:
+        print(f"Could not normalize skills: {e}")
+    try:
+        import resume_store
+        result.update(resume_store.save(parsed))
+    except Exception as e:
+        print(f"Could not save parsed resume: {e}")
+    try:
+        import matching
+        result["candidateId"] = matching.add_resume(parsed, result.get("resumeId"))
+    except Exception as e:
+        print(f"Could not index resume for matching: {e}")
+    if raw_text and result.get("candidateId"):
+        try:
+            import dedup_index
+            personal = parsed.get("personal") or {}
+            result["duplicates"] = dedup_index.add(
+                result["candidateId"], raw_text, personal.get("email"), personal.get("phone")
+            )
+        except Exception as e:
+            print(f"Could not check resume for duplicates: {e}")
+    return result
+
+def parse_resume_file(file_storage, kind=None):
     """
     Parses an uploaded file, extracts raw text, and sends it to an AI for structuring.
     
     Args:
         file_storage: The FileStorage object from Flask request.files.
+        kind: "pdf" / "docx" if the caller already sniffed the upload.
 
     Returns:
         A dictionary containing the AI-parsed data or an error.
     """
     filename = file_storage.filename
-    raw_text = ""
 
     try:
         print(f"Starting to parse file: {filename}")
-        if filename.endswith(".docx"):
-            doc = docx.Document(io.BytesIO(file_storage.read()))
-            for para in doc.paragraphs:
-                raw_text += para.text + "\n"
-
-        elif filename.endswith(".pdf"):
-            pdf_reader = pypdf.PdfReader(io.BytesIO(file_storage.read()))
-            for page in pdf_reader.pages:
-                extracted = page.extract_text()
-                if extracted:
-                    raw_text += extracted + "\n"
-
-        else:
-            return {"error": "Unsupported file type. Please upload a .docx or .pdf file."}
+        kind = kind or uploads.sniff(file_storage.stream)
+        with metrics.time_stage("extraction"):
+            raw_text = extract_text(kind, file_storage.stream)
+        if raw_text is None:
+            return {"error": UNSUPPORTED_FILE_TYPE}
 
         if not raw_text.strip():
-            return {"error": "Could not extract any text from the document."}
+            return {"error": NO_TEXT_EXTRACTED}
 
         print("--- Successfully extracted raw text from resume. ---")
         print("--- Sending extracted text to AI for structuring... ---")
 
+        # Absolute import for Render (no leading dot)
+        from gemini_utils import structure_text_with_ai
         structured_data = structure_text_with_ai(raw_text)
 
         print("--- AI processing complete. Returning structured data. ---")
-        return {"parsedData": structured_data}
+        return _post_process({"parsedData": structured_data}, raw_text)
 
     except Exception as e:
         print(f"Error in parse_resume_file: {e}")
         return {"error": f"An error occurred while parsing the file: {e}"}
+
+async def parse_resume_stream_async(filename, stream, kind=None):
+    """
+    Async twin of parse_resume_file for the ASGI app: sniffing and text extraction
+    (blocking I/O + CPU) run in a worker thread, the LLM call is awaited on the event loop.
+    """
+    try:
+        print(f"Starting to parse file: {filename}")
+        with metrics.time_stage("extraction"):
+            if kind is None:
+                kind = await asyncio.to_thread(uploads.sniff, stream)
+            raw_text = await asyncio.to_thread(extract_text, kind, stream)
+        if raw_text is None:
+            return {"error": UNSUPPORTED_FILE_TYPE}
+
+        if not raw_text.strip():
+            return {"error": NO_TEXT_EXTRACTED}
+
+        from gemini_utils import structure_text_with_ai_async
+        structured_data = await structure_text_with_ai_async(raw_text)
+        return await asyncio.to_thread(_post_process, {"parsedData": structured_data}, raw_text)
+
+    except Exception as e:
+        print(f"Error in parse_resume_stream_async: {e}")
+        return {"error": f"An error occurred while parsing the file: {e}"}
@@ -1,31 +1,57 @@
 # backend/gemini_utils.py
 import os
 import json
-import google.generativeai as genai
+import asyncio
+import threading
 from dotenv import load_dotenv
 
+import metrics
+
 # Load environment variables from .env file
 load_dotenv()
 
-# Configure the Gemini API with your key
-try:
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY not found in .env file.")
-    genai.configure(api_key=api_key)
-except Exception as e:
-    print(f"Error configuring Gemini API: {e}")
-
-def structure_text_with_ai(raw_resume_text: str) -> dict:
-    """
-    Uses the Gemini model to parse raw resume text into a structured JSON object.
+# Point the SDK at another host (e.g. the load-test stand-in server)
+GEMINI_API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT")
 
-    Args:
-        raw_resume_text: A string containing the full text from the resume.
+_genai = None
+_genai_lock = threading.Lock()
 
-    Returns:
-        A dictionary with the structured resume data.
+def _configure_genai():
+    """
+    Imports google.generativeai and configures the API key on first use.
+    The SDK takes seconds to import, so it stays out of app startup.
     """
+    global _genai
+    with _genai_lock:
+        if _genai is None:
+            import google.generativeai as genai
+
+            # Configure the Gemini API with your key
+            try:
+                api_key = os.getenv("GEMINI_API_KEY")
+                if not api_key:
+                    raise ValueError("GEMINI_API_KEY not found in .env file.")
+                if GEMINI_API_ENDPOINT:
+                    genai.configure(api_key=api_key, transport="rest",
+                                    client_options={"api_endpoint": GEMINI_API_ENDPOINT})
+                else:
+                    genai.configure(api_key=api_key)
+            except Exception as e:
+                print(f"Error configuring Gemini API: {e}")
+            _genai = genai
+    return _genai
+
+async def _generate_content_async(model, prompt):
+    """
+    Awaits the SDK's async client; with GEMINI_API_ENDPOINT set (REST transport,
+    which the async client doesn't support) the sync call runs on a thread instead.
+    """
+    if GEMINI_API_ENDPOINT:
+        return await asyncio.to_thread(model.generate_content, prompt)
+    return await model.generate_content_async(prompt)
+
+def _build_structure_prompt(raw_resume_text: str) -> str:
+    """Prompt asking Gemini to turn raw resume text into the builder's JSON schema."""
 
     json_schema = """
     {
@@ -79,32 +105,67 @@ def structure_text_with_ai(raw_resume_text: str) -> dict:
     {raw_resume_text}
     ```
     """
+    return prompt
+
+def _parse_structured_response(text: str) -> dict:
+    with metrics.time_stage("json_parse"):
+        cleaned_json_string = text.strip().replace('```json', '').replace('```', '').strip()
+        try:
+            return json.loads(cleaned_json_string)
+        except json.JSONDecodeError:
+            metrics.LLM_JSON_ERRORS.inc(provider="gemini")
+            raise
+
+def _empty_resume() -> dict:
+    # Returned on error to prevent frontend crashes
+    return {
+        "personal": {},
+        "summary": "",
+        "experience": [],
+        "education": [],
+        "skills": [],
+        "projects": [],
+        "publications": [],
+        "certifications": []
+    }
+
+def structure_text_with_ai(raw_resume_text: str) -> dict:
+    """
+    Uses the Gemini model to parse raw resume text into a structured JSON object.
+
+    Args:
+        raw_resume_text: A string containing the full text from the resume.
 
+    Returns:
+        A dictionary with the structured resume data.
+    """
+    prompt = _build_structure_prompt(raw_resume_text)
     try:
-        model = genai.GenerativeModel('gemini-2.0-flash')
-        response = model.generate_content(prompt)
-        cleaned_json_string = response.text.strip().replace('```json', '').replace('```', '').strip()
-        structured_data = json.loads(cleaned_json_string)
+        model = _configure_genai().GenerativeModel('gemini-2.0-flash')
+        with metrics.time_llm("gemini", model.model_name):
+            response = model.generate_content(prompt)
+        return _parse_structured_response(response.text)
 
-        return structured_data
+    except Exception as e:
+        print(f"An error occurred while calling the Gemini API or parsing its response: {e}")
+        return _empty_resume()
+
+async def structure_text_with_ai_async(raw_resume_text: str) -> dict:
+    """Async variant of structure_text_with_ai; awaits Gemini without holding a thread."""
+    prompt = _build_structure_prompt(raw_resume_text)
+    try:
+        model = _configure_genai().GenerativeModel('gemini-2.0-flash')
+        with metrics.time_llm("gemini", model.model_name):
+            response = await _generate_content_async(model, prompt)
+        return _parse_structured_response(response.text)
 
     except Exception as e:
         print(f"An error occurred while calling the Gemini API or parsing its response: {e}")
-        # Return a default empty structure on error to prevent frontend crashes
-        return {
-            "personal": {},
-            "summary": "",
-            "experience": [],
-            "education": [],
-            "skills": [],
-            "projects": [],
-            "publications": [],
-            "certifications": []
-        }
+        return _empty_resume()
 
 # --- NEW: Elevator Pitch Function for Gemini ---
-def generate_elevator_pitch(resume_data: dict) -> str:
-    """Generates a concise elevator pitch from resume data using Gemini."""
+def _build_elevator_pitch_prompt(resume_data: dict) -> str:
+    """Plain-text resume context + instructions for the elevator pitch."""
 
     # Extract relevant info from resume_data
     personal = resume_data.get('personal', {})
@@ -180,10 +241,27 @@ def generate_elevator_pitch(resume_data: dict) -> str:
 
     Elevator Pitch:
     """
+    return prompt
+
+def generate_elevator_pitch(resume_data: dict) -> str:
+    """Generates a concise elevator pitch from resume data using Gemini."""
+    prompt = _build_elevator_pitch_prompt(resume_data)
+    try:
+        model = _configure_genai().GenerativeModel('gemini-2.0-flash')
+        with metrics.time_llm("gemini", model.model_name):
+            response = model.generate_content(prompt)
+        return response.text.strip()
+    except Exception as e:
+        print(f"Error calling Gemini for elevator pitch: {e}")
+        return "Could not generate elevator pitch at this time."
 
+async def generate_elevator_pitch_async(resume_data: dict) -> str:
+    """Async variant of generate_elevator_pitch."""
+    prompt = _build_elevator_pitch_prompt(resume_data)
     try:
-        model = genai.GenerativeModel('gemini-2.0-flash')
-        response = model.generate_content(prompt)
+        model = _configure_genai().GenerativeModel('gemini-2.0-flash')
+        with metrics.time_llm("gemini", model.model_name):
+            response = await _generate_content_async(model, prompt)
         return response.text.strip()
     except Exception as e:
         print(f"Error calling Gemini for elevator pitch: {e}")
@@ -201,7 +279,7 @@ def enhance_section_with_ai(section_name, text_to_enhance):
         list: A list of enhanced versions of the text.
     """
     try:
-        model = genai.GenerativeModel('gemini-2.0-flash')
+        model = _configure_genai().GenerativeModel('gemini-2.0-flash')
         
         # Adjust prompt based on section name
         if section_name.lower() == 'skills':
@@ -225,7 +303,8 @@ def enhance_section_with_ai(section_name, text_to_enhance):
 
         Enhanced Versions:
         """
-        response = model.generate_content(prompt)
+        with metrics.time_llm("gemini", model.model_name):
+            response = model.generate_content(prompt)
         return [version.strip() for version in response.text.split('\n') if version.strip()]
     except Exception as e:
         print(f"Error enhancing section with AI: {e}")
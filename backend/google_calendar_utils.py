@@ -1,77 +1,193 @@
 import datetime
+import json
 import os
 import pickle
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+import threading
+import uuid
+
+# ------------------------------------------------------------
+# Google Calendar access for interview scheduling.
+# The service is built once per process from the discovery document
+# bundled with google-api-python-client (no discovery fetch), and
+# credentials are loaded once and refreshed under a lock. httplib2
+# connections are not thread-safe, so each thread gets its own
+# authorized Http; its credentials are a view that sends every
+# validity check, header and refresh (including the retry after a
+# 401) through that lock, so an expiring token is refreshed once and
+# saved, never concurrently by each thread's Http. Many events go out as Calendar batch requests
+# (one round trip per CALENDAR_BATCH_SIZE inserts).
+#
+# CALENDAR_API_ROOT points everything (including /batch) at another
+# host, e.g. benchmarks/fake_calendar.py; without a token.pickle the
+# stand-in is called anonymously.
+# ------------------------------------------------------------
 
 # Define the scopes required for Google Calendar API
-SCOPES = ['https://www.googleapis.com/auth/calendar.events']
+SCOPES = [
+    'https://www.googleapis.com/auth/calendar.events',
+    'https://www.googleapis.com/auth/calendar.freebusy',  # scheduling.py slot search
+]
 
-def get_google_calendar_service():
+CALENDAR_TOKEN_PATH = os.getenv("CALENDAR_TOKEN_PATH", "token.pickle")
+CALENDAR_CREDENTIALS_PATH = os.getenv("CALENDAR_CREDENTIALS_PATH", "credentials.json")
+CALENDAR_API_ROOT = os.getenv("CALENDAR_API_ROOT", "")
+CALENDAR_TIMEOUT = float(os.getenv("CALENDAR_TIMEOUT", "30"))
+# The Calendar API accepts at most 50 calls per batch request
+CALENDAR_BATCH_SIZE = min(int(os.getenv("CALENDAR_BATCH_SIZE", "50")), 50)
+
+_lock = threading.Lock()
+_local = threading.local()
+_creds = None
+_service = None
+
+
+def _load_credentials():
     """
-    Authenticates and returns a Google Calendar API service object.
+    Loads (and if needed refreshes or obtains) the OAuth credentials.
     This is a simplified authentication flow for development.
     For production, implement a robust OAuth 2.0 flow to store and refresh user tokens.
     """
+    from google.auth.transport.requests import Request
+
     creds = None
     # The file token.pickle stores the user's access and refresh tokens, and is
     # created automatically when the authorization flow completes for the first
     # time.
-    if os.path.exists('token.pickle'):
-        with open('token.pickle', 'rb') as token:
+    if os.path.exists(CALENDAR_TOKEN_PATH):
+        with open(CALENDAR_TOKEN_PATH, 'rb') as token:
             creds = pickle.load(token)
+    elif CALENDAR_API_ROOT:
+        # Local stand-in server: no OAuth involved
+        from google.auth.credentials import AnonymousCredentials
+        return AnonymousCredentials()
     # If there are no (valid) credentials available, let the user log in.
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
             creds.refresh(Request())
         else:
+            from google_auth_oauthlib.flow import InstalledAppFlow
+
             # Ensure credentials.json (downloaded from Google Cloud Console) is in the backend directory
-            if not os.path.exists('credentials.json'):
+            if not os.path.exists(CALENDAR_CREDENTIALS_PATH):
                 print("Error: credentials.json not found. Please download it from Google Cloud Console and place it in the backend directory.")
                 raise FileNotFoundError("credentials.json missing for Google Calendar API.")
             
-            flow = InstalledAppFlow.from_client_secrets_file('credentials.json', SCOPES)
+            flow = InstalledAppFlow.from_client_secrets_file(CALENDAR_CREDENTIALS_PATH, SCOPES)
             # IMPORTANT: Changed port=0 to a fixed port (e.g., 5000) for consistent redirect URI
             # Ensure this port is registered in Google Cloud Console -> OAuth client ID -> Authorized redirect URIs
             creds = flow.run_local_server(port=5000, success_message='Authentication complete. You can close this window.') 
-        # Save the credentials for the next run
-        with open('token.pickle', 'wb') as token:
-            pickle.dump(creds, token)
-    
-    service = build('calendar', 'v3', credentials=creds)
-    return service
+        _save_credentials(creds)
+    return creds
 
-def create_calendar_event(
-    summary: str,
-    description: str,
-    start_time: datetime.datetime,
-    end_time: datetime.datetime,
-    attendees: list[str],
-    time_zone: str = 'America/New_York' # Default to Eastern Time
-):
+
+def _save_credentials(creds):
+    # Save the credentials for the next run
+    with open(CALENDAR_TOKEN_PATH, 'wb') as token:
+        pickle.dump(creds, token)
+
+
+def _fresh_credentials(rejected_token=None):
     """
-    Creates an event in the primary Google Calendar.
+    The shared credentials, refreshed (and saved) at most once across threads when
+    expired, or when `rejected_token` (answered with a 401) is still the current token.
+    """
+    global _creds
+    with _lock:
+        if _creds is None:
+            _creds = _load_credentials()
+        elif getattr(_creds, "refresh_token", None) and (
+            not _creds.valid or (rejected_token is not None and _creds.token == rejected_token)
+        ):
+            from google.auth.transport.requests import Request
+            _creds.refresh(Request())
+            _save_credentials(_creds)
+        return _creds
 
-    Args:
-        summary (str): Event title.
-        description (str): Event description.
-        start_time (datetime.datetime): Start time of the event.
-        end_time (datetime.datetime): End time of the event.
-        attendees (list[str]): List of attendee emails.
-        time_zone (str): Time zone for the event.
+
+def _thread_credentials():
+    """Credentials for one thread's AuthorizedHttp that defer to _fresh_credentials() for everything."""
+    import google.auth.credentials
+
+    class SharedCredentials(google.auth.credentials.Credentials):
+        def __init__(self):
+            super().__init__()
+            self.sent = None  # token this thread last put on a request
+
+        @property
+        def valid(self):
+            return _fresh_credentials().valid
+
+        @property
+        def expired(self):
+            return _fresh_credentials().expired
+
+        def refresh(self, request):
+            # AuthorizedHttp / batch retry after a 401: refresh unless another thread already has
+            _fresh_credentials(rejected_token=self.sent)
+
+        def apply(self, headers, token=None):
+            creds = _fresh_credentials()
+            self.sent = creds.token
+            creds.apply(headers, token=token)
+
+        def before_request(self, request, method, url, headers):
+            self.apply(headers)
+
+    return SharedCredentials()
+
+
+def _thread_http():
+    """This thread's authorized httplib2.Http (they must not be shared across threads)."""
+    http = getattr(_local, "http", None)
+    if http is None:
+        import google_auth_httplib2
+        import httplib2
+        http = _local.http = google_auth_httplib2.AuthorizedHttp(
+            _thread_credentials(), http=httplib2.Http(timeout=CALENDAR_TIMEOUT)
+        )
+    return http
+
+
+def _build_request(http, *args, **kwargs):
+    from googleapiclient.http import HttpRequest
+    return HttpRequest(_thread_http(), *args, **kwargs)
+
+
+def get_google_calendar_service():
     """
-    service = get_google_calendar_service()
+    Returns the process-wide Google Calendar API service object, building it
+    on first use. Requests made through it use the calling thread's Http.
+    """
+    global _service
+    creds = _fresh_credentials()
+    with _lock:
+        if _service is None:
+            from googleapiclient import discovery_cache
+            from googleapiclient.discovery import build_from_document
+
+            document = json.loads(discovery_cache.get_static_doc('calendar', 'v3'))
+            if CALENDAR_API_ROOT:
+                document['rootUrl'] = CALENDAR_API_ROOT.rstrip('/') + '/'
+            _service = build_from_document(
+                document, credentials=creds, requestBuilder=_build_request
+            )
+        return _service
+
 
-    event = {
+def _event_body(summary, description, start_time, end_time, attendees, time_zone='America/New_York',
+                request_id=None):
+    def _iso(value):
+        return value if isinstance(value, str) else value.isoformat()
+
+    return {
         'summary': summary,
         'description': description,
         'start': {
-            'dateTime': start_time.isoformat(),
+            'dateTime': _iso(start_time),
             'timeZone': time_zone,
         },
         'end': {
-            'dateTime': end_time.isoformat(),
+            'dateTime': _iso(end_time),
             'timeZone': time_zone,
         },
         'attendees': [{'email': email} for email in attendees],
@@ -84,7 +200,8 @@ def create_calendar_event(
         },
         'conferenceData': { # Add Google Meet link
             'createRequest': {
-                'requestId': 'meeting_request_id',
+                # Must be unique per event, or Calendar hands back the same Meet
+                'requestId': request_id or uuid.uuid4().hex,
                 'conferenceSolutionKey': {
                     'type': 'hangoutsMeet'
                 }
@@ -92,14 +209,121 @@ def create_calendar_event(
         }
     }
 
-    event = service.events().insert(calendarId='primary', 
-                                    sendNotifications=True, # Send email invitations
-                                    conferenceDataVersion=1, # Required for conferenceData
-                                    body=event).execute()
+
+def _body_from(event: dict, request_id=None):
+    """Event body from a create_calendar_events entry."""
+    return _event_body(
+        event['summary'], event.get('description', ''), event['start_time'],
+        event['end_time'], event.get('attendees', []),
+        event.get('time_zone', 'America/New_York'), request_id,
+    )
+
+
+def _insert_request(service, body, send_notifications=True):
+    return service.events().insert(calendarId='primary',
+                                   sendNotifications=send_notifications, # Send email invitations
+                                   conferenceDataVersion=1, # Required for conferenceData
+                                   body=body)
+
+
+def create_calendar_event(
+    summary: str,
+    description: str,
+    start_time: datetime.datetime,
+    end_time: datetime.datetime,
+    attendees: list[str],
+    time_zone: str = 'America/New_York' # Default to Eastern Time
+):
+    """
+    Creates an event in the primary Google Calendar.
+
+    Args:
+        summary (str): Event title.
+        description (str): Event description.
+        start_time (datetime.datetime): Start time of the event.
+        end_time (datetime.datetime): End time of the event.
+        attendees (list[str]): List of attendee emails.
+        time_zone (str): Time zone for the event.
+    """
+    service = get_google_calendar_service()
+    body = _event_body(summary, description, start_time, end_time, attendees, time_zone)
+    event = _insert_request(service, body).execute()
     
     print(f"Event created: {event.get('htmlLink')}")
     return event.get('htmlLink')
 
+
+def run_batch(requests: list) -> list[tuple]:
+    """
+    Executes API requests (built from get_google_calendar_service()) as Calendar
+    batch requests. Returns (response, exception) per request, in order.
+    """
+    service = get_google_calendar_service()
+    results = [None] * len(requests)
+
+    def on_response(request_id, response, exception):
+        results[int(request_id)] = (response, exception)
+
+    for offset in range(0, len(requests), CALENDAR_BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=on_response)
+        for index, api_request in enumerate(requests[offset:offset + CALENDAR_BATCH_SIZE], start=offset):
+            batch.add(api_request, request_id=str(index))
+        _fresh_credentials()
+        batch.execute(http=_thread_http())
+    return results
+
+
+def create_calendar_events(events: list[dict], send_notifications: bool = True) -> list[dict]:
+    """
+    Creates many events with Calendar batch requests.
+
+    Args:
+        events (list[dict]): Each with the create_calendar_event arguments
+            (summary, description, start_time, end_time, attendees, time_zone?);
+            times may be datetimes or ISO strings.
+        send_notifications (bool): Email the attendees.
+
+    Returns:
+        One dict per input event, in order: {"id", "htmlLink"} on success or
+        {"error", "status"} when that insert failed.
+    """
+    service = get_google_calendar_service()
+    requests = [_insert_request(service, _body_from(event), send_notifications) for event in events]
+
+    results = []
+    for response, exception in run_batch(requests):
+        if exception is not None:
+            status = getattr(getattr(exception, "resp", None), "status", None)
+            results.append({"error": str(exception), "status": status})
+        else:
+            results.append({"id": response.get("id"), "htmlLink": response.get("htmlLink")})
+
+    print(f"Created {sum(1 for r in results if 'id' in r)}/{len(events)} events in "
+          f"{-(-len(events) // CALENDAR_BATCH_SIZE)} batch request(s)")
+    return results
+
+def insert_event(event: dict, event_id: str = None, send_notifications: bool = True) -> dict:
+    """
+    Inserts one event (a create_calendar_events entry) and returns the API's event.
+
+    With `event_id` (base32hex: 0-9 and a-v, 5-1024 chars) the insert is
+    idempotent: the id doubles as the Meet requestId, and a retry whose first
+    attempt did land gets the existing event back instead of a duplicate.
+    """
+    from googleapiclient.errors import HttpError
+
+    service = get_google_calendar_service()
+    body = _body_from(event, request_id=event_id)
+    if event_id:
+        body['id'] = event_id
+    try:
+        return _insert_request(service, body, send_notifications).execute()
+    except HttpError as e:
+        if event_id and e.resp.status == 409:
+            return service.events().get(calendarId='primary', eventId=event_id).execute()
+        raise
+
+
 if __name__ == '__main__':
     # Example usage for testing (run this file directly once to authenticate)
     print("Running Google Calendar utility for initial authentication...")
@@ -0,0 +1,79 @@
+# backend/gunicorn.conf.py
+# ------------------------------------------------------------
+# Production server: preforked gthread workers with the app (and its
+# heavy imports, see warmup.py) loaded once in the master. Each worker's
+# render pool is spawned, not forked, so preloading doesn't reach the
+# pool processes; they import and warm up on their own at pool start.
+#
+#   cd backend && gunicorn -c gunicorn.conf.py wsgi:app
+#
+# kill -HUP <master>  re-reads this file and replaces workers gracefully
+#                     (in-flight requests finish within graceful_timeout).
+#                     With preload_app the app code itself is not re-imported;
+#                     for a code deploy use USR2 (new master) then TERM the old one.
+# ------------------------------------------------------------
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# Renders are CPU-bound, so one process per core; threads cover requests waiting on the LLM
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count())))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+
+# LLM parsing can legitimately take a while; keep the hard timeout well above it
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# Recycle workers periodically to bound slow leaks (0 disables)
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "50"))
+
+preload_app = True
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+# Every web worker owns a render pool; split the CPUs between them instead of
+# giving each one cpu_count processes. Set before the app is preloaded because
+# render_service reads it at import time.
+os.environ.setdefault("RENDER_WORKERS", str(max(1, multiprocessing.cpu_count() // workers)))
+
+
+def post_fork(server, worker):
+    # Pools and threads do not survive fork, so each worker builds its own
+    import calendar_queue
+    import render_service
+    import warmup
+
+    # Pick up calendar jobs a previous worker left queued or in flight
+    calendar_queue.resume()
+
+    if warmup.WARMUP == "background":
+        warmup.start_background()
+    elif warmup.WARMUP == "preload":
+        render_service.start()
+
+
+def worker_exit(server, worker):
+    import calendar_queue
+    import metrics
+    import render_service
+    calendar_queue.shutdown()
+    render_service.shutdown()
+    try:
+        metrics.flush()
+    except Exception:
+        server.log.exception("Could not write final metrics of worker %s", worker.pid)
+
+
+def child_exit(server, worker):
+    # Keep an exited worker's counts in the totals (and free its pid for reuse)
+    import metrics
+    try:
+        metrics.retire(worker.pid)
+    except Exception:
+        server.log.exception("Could not retire metrics of worker %s", worker.pid)
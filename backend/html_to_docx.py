@@ -0,0 +1,135 @@
+# backend/html_to_docx.py
+import re
+from html.parser import HTMLParser
+
+# ------------------------------------------------------------
+# Single-pass HTML -> DOCX converter for the rich-text fields the
+# LLM produces (summary, description, achievements). Parser
+# callbacks drive a formatting stack and emit runs / paragraphs to a
+# sink as they are seen: linear in input size, no intermediate tree.
+#
+# A sink implements:
+#   run(text, bold, italic, underline, link)
+#   line_break()
+#   paragraph(list_style)   # start a new paragraph (or restyle the current
+#                           # one if it is still empty); list_style is None
+#                           # or a style name like "List Bullet 2"
+# ------------------------------------------------------------
+
+_BOLD = {"strong", "b", "h1", "h2", "h3", "h4", "h5", "h6"}
+_ITALIC = {"em", "i"}
+_UNDERLINE = {"u"}
+_BLOCK = {"p", "div", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote"}
+_SKIP = {"script", "style"}
+_VOID = {"br", "img", "hr", "meta", "link", "input"}
+
+MAX_LIST_LEVEL = 3  # "List Bullet 3" is the deepest list style in the default template
+
+_WS = re.compile(r"\s+")
+
+
+def list_style(ordered, level):
+    base = "List Number" if ordered else "List Bullet"
+    level = min(level, MAX_LIST_LEVEL)
+    return base if level <= 1 else f"{base} {level}"
+
+
+class _Converter(HTMLParser):
+    def __init__(self, sink):
+        super().__init__(convert_charrefs=True)
+        self.sink = sink
+        self.stack = []        # open inline/block tags, innermost last
+        self.open_counts = {}  # tag -> number of open instances, O(1) stray-end-tag check
+        self.bold = self.italic = self.underline = self.link = self.skip = 0
+        self.lists = []        # True for <ol>, False for <ul>
+        self.has_content = False   # current paragraph already holds text
+        self.pending_paragraph = False
+        self.trailing_space = False
+
+    # -- formatting stack --
+    def _push(self, tag):
+        self.stack.append(tag)
+        self._count(tag, 1)
+
+    def _count(self, tag, delta):
+        self.open_counts[tag] = self.open_counts.get(tag, 0) + delta
+        if tag in _BOLD:
+            self.bold += delta
+        if tag in _ITALIC:
+            self.italic += delta
+        if tag in _UNDERLINE:
+            self.underline += delta
+        if tag == "a":
+            self.link += delta
+        if tag in _SKIP:
+            self.skip += delta
+
+    def _pop(self, tag):
+        if not self.open_counts.get(tag):
+            return  # stray end tag
+        while self.stack:
+            top = self.stack.pop()
+            self._count(top, -1)
+            if top == tag:
+                break
+
+    # -- paragraph handling --
+    def _new_paragraph(self, style=None):
+        if style is not None or self.has_content:
+            self.sink.paragraph(style)
+            self.has_content = False
+        self.pending_paragraph = False
+
+    # -- parser callbacks --
+    def handle_starttag(self, tag, attrs):
+        if tag == "br":
+            self.sink.line_break()
+            self.has_content = True
+            self.trailing_space = True  # swallow indentation after the break
+            return
+        if tag in ("ul", "ol"):
+            self.lists.append(tag == "ol")
+        elif tag == "li":
+            self._new_paragraph(list_style(self.lists[-1] if self.lists else False, max(len(self.lists), 1)))
+        elif tag in _BLOCK and not self.lists:
+            self._new_paragraph()
+        if tag not in _VOID:
+            self._push(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        if tag == "br":
+            self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag in ("ul", "ol"):
+            if self.lists:
+                self.lists.pop()
+            self.pending_paragraph = True
+        elif tag in _BLOCK or tag == "li":
+            self.pending_paragraph = True
+        self._pop(tag)
+
+    def handle_data(self, data):
+        if self.skip:
+            return
+        text = _WS.sub(" ", data)
+        if self.pending_paragraph:
+            if not text.strip():
+                return
+            self._new_paragraph()
+        if not self.has_content or self.trailing_space:
+            text = text.lstrip(" ")
+        if not text:
+            return
+        self.sink.run(text, bool(self.bold), bool(self.italic), bool(self.underline), bool(self.link))
+        self.has_content = True
+        self.trailing_space = text.endswith(" ")
+
+
+def convert(html, sink):
+    """Streams `html` into `sink`. The sink's current paragraph receives the first text."""
+    if not html:
+        return
+    parser = _Converter(sink)
+    parser.feed(html)
+    parser.close()
@@ -0,0 +1,504 @@
+# backend/job_search.py
+import base64
+import datetime
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+
+import metrics
+
+# ------------------------------------------------------------
+# Job postings search: an in-memory inverted index with BM25 over
+# title, requirements and description, plus facet sets for
+# location / employmentType.
+#
+# Postings are stored in SQLite (JOB_STORE_PATH) with a sequence
+# number bumped on every write. Each process keeps its own index and,
+# before answering, applies rows newer than the last sequence it
+# saw, so a requisition created on one gunicorn worker is searchable
+# on all of them without rebuilding anything.
+#
+# Per-term BM25 contributions are cached between queries as arrays
+# (a write drops only the terms it touches). A query adds them into
+# a dense score vector, picks the page with a partial sort and counts
+# facets with bincount, all in numpy. Every match has to be visited
+# anyway for `total` and the facet counts, so there is no early
+# termination. The scored set of the last few queries is kept for
+# nextCursor pages and stays valid across writes that don't touch
+# any of the query's terms.
+# ------------------------------------------------------------
+
+JOB_STORE_PATH = os.getenv(
+    "JOB_STORE_PATH",
+    os.path.join(os.path.dirname(__file__), "data", "jobs.sqlite3"),
+)
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Term frequencies are weighted per field (a BM25F-style single document)
+FIELD_WEIGHTS = {"title": 3.0, "requirements": 2.0, "description": 1.0}
+FACETS = ("location", "employmentType")
+MAX_PAGE_SIZE = 100
+# Cached per-term scores are recomputed once the posting count has moved this much
+STATS_DRIFT = 0.01
+# Scores + facet counts of recent queries, so paging through a result set is cheap
+JOB_SEARCH_CACHE_ENTRIES = int(os.getenv("JOB_SEARCH_CACHE_ENTRIES", "32"))
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is it of on or our the this to we will with you your".split()
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id      TEXT PRIMARY KEY,
+    seq     INTEGER NOT NULL,
+    doc     TEXT,
+    deleted INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS jobs_seq ON jobs (seq);
+"""
+
+
+def tokenize(text):
+    return [t for t in _TOKEN.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def _field_text(value):
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(v) for v in value)
+    return str(value or "")
+
+
+def _facet_value(value):
+    return str(value or "").strip().lower()
+
+
+def _created_at(value):
+    """Epoch seconds for a createdAt given as epoch seconds or an ISO 8601 date / datetime (UTC if naive)."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+        return float(value)
+    if isinstance(value, str) and value.strip():
+        text = value.strip()
+        try:
+            seconds = float(text)
+        except ValueError:
+            try:
+                moment = datetime.datetime.fromisoformat(text.replace("Z", "+00:00"))
+            except ValueError:
+                moment = None
+            if moment is not None:
+                if moment.tzinfo is None:
+                    moment = moment.replace(tzinfo=datetime.timezone.utc)
+                return moment.timestamp()
+        else:
+            if math.isfinite(seconds):
+                return seconds
+    raise ValueError("createdAt must be epoch seconds or an ISO 8601 date")
+
+
+def _check_job(job):
+    """Raises ValueError for a posting the index can't take (checked before it is written)."""
+    if not isinstance(job, dict) or not isinstance(job.get("title"), str) or not job["title"].strip():
+        raise ValueError("Every job needs a title")
+    for field in FIELD_WEIGHTS:
+        value = job.get(field)
+        if value is not None and not isinstance(value, str) and not (
+            isinstance(value, list) and all(isinstance(v, str) for v in value)
+        ):
+            raise ValueError(f"{field} must be a string or a list of strings")
+    for facet in FACETS:
+        if job.get(facet) is not None and not isinstance(job[facet], str):
+            raise ValueError(f"{facet} must be a string")
+    if job.get("id") is not None and not isinstance(job["id"], (str, int)):
+        raise ValueError("id must be a string")
+    if job.get("createdAt") is not None:
+        _created_at(job["createdAt"])
+
+
+class JobIndex:
+    """Inverted index + BM25 scoring. Not synchronized; callers hold a lock."""
+
+    def __init__(self):
+        import numpy as np
+
+        self.postings = {}      # term -> {doc number: weighted tf}
+        self.codes = {f: {} for f in FACETS}   # facet -> value -> code (0 = unset)
+        self.labels = {f: [""] for f in FACETS}  # facet -> code -> display string
+        self.docs = []          # doc number -> job dict (None once removed)
+        self.ids = []           # doc number -> job id
+        self.terms = []         # doc number -> Counter of weighted tf
+        self.numbers = {}       # job id -> doc number
+        # Per doc number, grown by doubling: only the first len(self.docs) entries are live
+        self._alive = np.zeros(0, dtype=bool)
+        self._created = np.zeros(0, dtype=np.float64)
+        self._lengths = np.zeros(0, dtype=np.float64)
+        self._values = {f: np.zeros(0, dtype=np.int32) for f in FACETS}  # facet value codes
+        self.total_length = 0.0
+        self.count = 0
+        # term -> (doc numbers, BM25 contributions); dropped when a posting of the term
+        # changes, and all at once when the collection stats drift past STATS_DRIFT
+        self.impacts = {}
+        self.stats = (0, 1.0)   # (count, avgdl) the cached impacts were computed with
+        # Change counters, so cached query results survive writes that can't affect them
+        self.version = 0        # bumped on every upsert / removal
+        self.term_versions = {}  # term -> version of the last change to its postings
+        self.epoch = 0          # bumped whenever cached impacts are recomputed wholesale
+
+    def _grow(self):
+        import numpy as np
+
+        size = max(1024, 2 * len(self._alive))
+        self._alive = np.concatenate([self._alive, np.zeros(size - len(self._alive), dtype=bool)])
+        self._created = np.concatenate([self._created, np.zeros(size - len(self._created))])
+        self._lengths = np.concatenate([self._lengths, np.zeros(size - len(self._lengths))])
+        for facet, values in self._values.items():
+            self._values[facet] = np.concatenate([values, np.zeros(size - len(values), dtype=np.int32)])
+
+    def _touch(self, terms):
+        self.version += 1
+        for term in terms:
+            self.impacts.pop(term, None)
+            self.term_versions[term] = self.version
+
+    def upsert(self, job):
+        number = self.numbers.get(job["id"])
+        if number is not None:
+            self._unindex(number)
+        else:
+            number = len(self.docs)
+            if number == len(self._alive):
+                self._grow()
+            self.numbers[job["id"]] = number
+            self.docs.append(None)
+            self.ids.append(job["id"])
+            self.terms.append(None)
+
+        tf = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(_field_text(job.get(field))):
+                tf[token] += weight
+        for term, weight in tf.items():
+            self.postings.setdefault(term, {})[number] = weight
+        self._touch(tf)
+        for facet in FACETS:
+            value = _facet_value(job.get(facet))
+            code = 0
+            if value:
+                code = self.codes[facet].get(value)
+                if code is None:
+                    code = self.codes[facet][value] = len(self.labels[facet])
+                    self.labels[facet].append(str(job[facet]).strip())
+            self._values[facet][number] = code
+
+        self.docs[number] = job
+        self.terms[number] = tf
+        self._alive[number] = True
+        self._created[number] = _created_at(job["createdAt"]) if job.get("createdAt") is not None else 0.0
+        self._lengths[number] = length = sum(tf.values())
+        self.total_length += length
+        self.count += 1
+
+    def remove(self, job_id):
+        number = self.numbers.get(job_id)
+        if number is not None and self.docs[number] is not None:
+            self._unindex(number)
+
+    def _unindex(self, number):
+        if self.docs[number] is None:
+            return
+        terms = self.terms[number]
+        for term in terms:
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(number, None)
+                if not postings:
+                    del self.postings[term]
+        self._touch(terms)
+        for values in self._values.values():
+            values[number] = 0
+        self.total_length -= self._lengths[number]
+        self.count -= 1
+        self.docs[number] = None
+        self.terms[number] = None
+        self._alive[number] = False
+        self._lengths[number] = 0.0
+
+    def _allowed(self, filters):
+        """Boolean mask over doc numbers passing every facet filter (None = no filter)."""
+        import numpy as np
+
+        allowed = None
+        for facet, wanted in (filters or {}).items():
+            values = wanted if isinstance(wanted, (list, tuple, set)) else [wanted]
+            codes = [self.codes[facet][v] for v in map(_facet_value, values) if v in self.codes[facet]]
+            members = np.isin(self._values[facet][:len(self.docs)], codes)
+            allowed = members if allowed is None else allowed & members
+        return allowed
+
+    def _impact(self, term):
+        """(doc numbers, BM25 contributions) of `term` as arrays, computed once per term and reused."""
+        import numpy as np
+
+        count, avgdl = self.stats
+        if self.count and abs(self.count - count) > STATS_DRIFT * max(count, 1):
+            # idf / avgdl moved noticeably since the cache was filled: start over
+            self.stats = count, avgdl = self.count, self.total_length / self.count
+            self.impacts.clear()
+            self.epoch += 1
+        impact = self.impacts.get(term)
+        if impact is None:
+            postings = self.postings.get(term) or {}
+            df = len(postings)
+            idf = math.log(1 + (count - df + 0.5) / (df + 0.5)) if df else 0.0
+            numbers = np.fromiter(postings.keys(), dtype=np.int64, count=df)
+            tf = np.fromiter(postings.values(), dtype=np.float64, count=df)
+            # idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len / avgdl)), constants hoisted
+            norm = BM25_K1 * (1 - BM25_B)
+            scale = BM25_K1 * BM25_B / avgdl
+            boost = idf * (BM25_K1 + 1)
+            impact = (numbers, boost * tf / (tf + norm + scale * self._lengths[numbers]))
+            self.impacts[term] = impact
+        return impact
+
+    def score(self, terms, filters=None):
+        """
+        (doc numbers, scores) as arrays for docs matching any term and every filter.
+        With no terms, every posting passing the filters, scored by createdAt.
+        """
+        import numpy as np
+
+        allowed = self._allowed(filters)
+        if not terms:
+            mask = self._alive[:len(self.docs)]
+            numbers = np.flatnonzero(mask if allowed is None else mask & allowed)
+            return numbers, self._created[numbers]
+
+        impacts = [impact for impact in map(self._impact, sorted(set(terms))) if len(impact[0])]
+        if len(impacts) == 1:
+            numbers, scores = impacts[0]
+        else:
+            # Dense accumulation: every contribution is positive, so score > 0 means matched
+            dense = np.zeros(len(self.docs))
+            for numbers, values in impacts:
+                dense[numbers] += values
+            numbers = np.flatnonzero(dense)
+            scores = dense[numbers]
+        if allowed is not None:
+            keep = allowed[numbers]
+            numbers, scores = numbers[keep], scores[keep]
+        return numbers, scores
+
+    def facet_counts(self, numbers):
+        """{facet: {display value: matches}} over the doc numbers in `numbers`."""
+        import numpy as np
+
+        counts = {}
+        for facet in FACETS:
+            labels = self.labels[facet]
+            found = np.bincount(self._values[facet][numbers], minlength=len(labels))
+            found[0] = 0  # unset
+            order = np.argsort(-found, kind="stable")
+            counts[facet] = {labels[code]: int(found[code]) for code in order.tolist() if found[code]}
+        return counts
+
+    def top(self, numbers, scores, limit, after=None):
+        """
+        The `limit` best (score, job id, doc number) by (-score, id); `after` is the
+        (score, job id) of the last item on the previous page.
+        """
+        import numpy as np
+
+        ids = self.ids
+        if after is not None:
+            a_score, a_id = after
+            keep = scores < a_score
+            for i in np.flatnonzero(scores == a_score).tolist():
+                keep[i] = ids[numbers[i]] > a_id
+            numbers, scores = numbers[keep], scores[keep]
+        if len(scores) > limit:
+            # Keep what can reach the page (ties on the cut-off score included), then order
+            threshold = np.partition(scores, len(scores) - limit)[len(scores) - limit]
+            keep = scores >= threshold
+            numbers, scores = numbers[keep], scores[keep]
+        ranked = sorted(
+            (-s, ids[n], n) for s, n in zip(scores.tolist(), numbers.tolist())
+        )[:limit]
+        return [(-neg, job_id, n) for neg, job_id, n in ranked]
+
+    def fresh(self, terms, version, epoch):
+        """Whether a result computed at (`version`, `epoch`) still holds: no posting of its terms changed since."""
+        count, _ = self.stats
+        if epoch != self.epoch or (self.count and abs(self.count - count) > STATS_DRIFT * max(count, 1)):
+            return False
+        if not terms:
+            return version == self.version
+        get = self.term_versions.get
+        return all(get(term, 0) <= version for term in terms)
+
+
+_index = JobIndex()
+_lock = threading.RLock()
+_results = OrderedDict()  # query fingerprint -> (index version, epoch, numbers, scores, facet counts)
+_local = threading.local()
+_last_seq = 0
+
+
+def _connect():
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(JOB_STORE_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(JOB_STORE_PATH, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def _sync():
+    """Applies rows written (by any process) since this process last looked."""
+    global _last_seq
+    with _lock:
+        rows = _connect().execute(
+            "SELECT id, seq, doc, deleted FROM jobs WHERE seq > ? ORDER BY seq", (_last_seq,)
+        ).fetchall()
+        for job_id, seq, doc, deleted in rows:
+            if deleted:
+                _index.remove(job_id)
+            else:
+                try:
+                    job = json.loads(doc)
+                    _check_job(job)
+                except (ValueError, TypeError, KeyError) as e:
+                    # Written before put_jobs checked it: skip the row instead of failing every sync
+                    print(f"Skipping job {job_id} (seq {seq}), it can't be indexed: {e}")
+                    _index.remove(job_id)
+                else:
+                    _index.upsert(job)
+            _last_seq = seq
+
+
+def _write(rows):
+    """rows: [(job_id, doc JSON or None to delete)] in one transaction."""
+    conn = _connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM jobs").fetchone()[0]
+        for job_id, doc in rows:
+            seq += 1
+            conn.execute(
+                "INSERT INTO jobs (id, seq, doc, deleted) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(id) DO UPDATE SET seq = excluded.seq, doc = COALESCE(excluded.doc, jobs.doc),"
+                " deleted = excluded.deleted",
+                (job_id, seq, doc, 0 if doc is not None else 1),
+            )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    _sync()
+
+
+def put_jobs(jobs):
+    """
+    Creates or replaces postings (frontend Job shape: title, company, location,
+    description, requirements, benefits, employmentType, ...). Jobs without an
+    "id" get one; createdAt may be epoch seconds or an ISO 8601 date. Every job
+    is checked before any is written (ValueError). Returns the stored jobs.
+    """
+    now = time.time()
+    stored = []
+    for job in jobs:
+        if isinstance(job, dict) and job.get("createdAt") is None:
+            job = dict(job, createdAt=now)
+        _check_job(job)
+        stored.append(dict(job, id=str(job.get("id") or uuid.uuid4().hex)))
+    _write([(job["id"], json.dumps(job)) for job in stored])
+    return stored
+
+
+def delete_job(job_id):
+    """True if the posting existed."""
+    if get_job(job_id) is None:
+        return False
+    _write([(job_id, None)])
+    return True
+
+
+def get_job(job_id):
+    _sync()
+    with _lock:
+        number = _index.numbers.get(job_id)
+        return _index.docs[number] if number is not None else None
+
+
+def _encode_cursor(fingerprint, score, job_id):
+    raw = json.dumps({"k": fingerprint, "s": score, "id": job_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor, fingerprint):
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        key, score, job_id = data["k"], float(data["s"]), str(data["id"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor") from None
+    if key != fingerprint:
+        raise ValueError("Cursor belongs to a different query")
+    return score, job_id
+
+
+def search(query="", filters=None, limit=20, cursor=None):
+    """
+    BM25-ranked postings (newest first when `query` is empty).
+
+    Args:
+        query: free text matched against title, requirements and description.
+        filters: {"location": value | [values], "employmentType": ...}, case-insensitive.
+        limit: page size (at most MAX_PAGE_SIZE).
+        cursor: nextCursor from the previous page of the same query.
+
+    Returns:
+        {"results": [{"job", "score"}], "total", "facets": {facet: {value: count}}, "nextCursor"}
+    """
+    filters = {f: v for f, v in (filters or {}).items() if v not in (None, "", [])}
+    unknown = set(filters) - set(FACETS)
+    if unknown:
+        raise ValueError(f"Unknown filter(s): {sorted(unknown)}; use {list(FACETS)}")
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    terms = tokenize(query or "")
+    fingerprint = hashlib.sha1(
+        json.dumps([sorted(set(terms)), sorted((f, str(v).lower()) for f, v in filters.items())]).encode("utf-8")
+    ).hexdigest()[:12]
+    after = _decode_cursor(cursor, fingerprint) if cursor else None
+
+    _sync()
+    with metrics.time_stage("job_search"), _lock:
+        cached = _results.get(fingerprint)
+        if cached is not None and _index.fresh(terms, cached[0], cached[1]):
+            _results.move_to_end(fingerprint)
+            _, _, numbers, scores, facets = cached
+        else:
+            numbers, scores = _index.score(terms, filters)
+            facets = _index.facet_counts(numbers)
+            if JOB_SEARCH_CACHE_ENTRIES > 0:
+                _results[fingerprint] = (_index.version, _index.epoch, numbers, scores, facets)
+                while len(_results) > JOB_SEARCH_CACHE_ENTRIES:
+                    _results.popitem(last=False)
+        page = _index.top(numbers, scores, limit + 1, after)
+        results = [{"job": _index.docs[n], "score": round(score, 6) if terms else None} for score, _, n in page[:limit]]
+
+    more = len(page) > limit
+    next_cursor = _encode_cursor(fingerprint, page[limit - 1][0], page[limit - 1][1]) if more else None
+    return {
+        "results": results,
+        "total": len(numbers),
+        "facets": facets,
+        "nextCursor": next_cursor,
+    }
@@ -0,0 +1,80 @@
+# backend/llm_requests.py
+import resume_store
+import uploads
+
+# ------------------------------------------------------------
+# Request -> result logic of the LLM-bound endpoints, shared by the
+# Flask views (routes.py) and their async twins (async_api.py).
+# Everything here takes plain values and answers with a
+# (status, body) pair; the views only read the request their own
+# way, call or await the LLM step, and wrap the pair in a response.
+# ------------------------------------------------------------
+
+PARSE_FAILED = (500, {"error": "INTERNAL_PARSE_ERROR"})
+PITCH_FAILED = (500, {"error": "ELEVATOR_PITCH_FAILED"})
+
+
+def check_upload(filename, size=None):
+    """Error (status, body) for a missing, unnamed or oversized file part, else None. filename None = no part."""
+    if filename is None:
+        return 400, {"error": "No file part in the request"}
+    if not filename:
+        return 400, {"error": "No file selected"}
+    if size is not None and size > uploads.MAX_UPLOAD_BYTES:
+        return 413, {"error": "UPLOAD_TOO_LARGE"}
+    return None
+
+
+def sniff_upload(stream):
+    """(kind, None), routing on content rather than the filename, or (None, 415 error)."""
+    from file_parser import UNSUPPORTED_FILE_TYPE
+
+    kind = uploads.sniff(stream)
+    if kind is None:
+        return None, (415, {"error": UNSUPPORTED_FILE_TYPE})
+    return kind, None
+
+
+def start_thumbnail(kind, stream):
+    """Queues the page-one thumbnail of a PDF (rasterized while the LLM structures the text); its id or None."""
+    if kind != "pdf":
+        return None
+    import thumbnails
+
+    try:
+        return thumbnails.submit_thumbnail(stream.read())
+    finally:
+        stream.seek(0)
+
+
+def parse_result(result, thumbnail_id=None):
+    """(status, body) for what parse_resume_file / parse_resume_stream_async returned."""
+    if isinstance(result, dict) and "error" in result:
+        return 500, result
+    if thumbnail_id:
+        result["thumbnailId"] = thumbnail_id
+    return 200, result
+
+
+def pitch_input(payload):
+    """
+    (resume data, None), or (None, error) for a body that is neither
+    { "resumeId", "version"? }, { "resumeData": ... }, { "parsedData": ... } nor the raw object.
+    """
+    try:
+        payload = resume_store.resolve(payload)
+    except resume_store.ResumeNotFound:
+        return None, (404, {"error": "RESUME_NOT_FOUND"})
+    except ValueError as e:
+        return None, (400, {"error": str(e)})
+
+    resume_data = payload
+    if isinstance(payload, dict):
+        resume_data = payload.get("resumeData") or payload.get("parsedData") or payload
+    if not isinstance(resume_data, dict) or not resume_data:
+        return None, (400, {"error": "Missing or invalid resume data"})
+    return resume_data, None
+
+
+def pitch_result(pitch):
+    return 200, {"elevatorPitch": pitch if isinstance(pitch, str) else ""}
@@ -0,0 +1,557 @@
+# backend/matching.py
+import hashlib
+import html
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+from array import array
+from collections import Counter
+
+import metrics
+import skill_normalizer
+from job_search import tokenize
+
+# ------------------------------------------------------------
+# Resume <-> job matching. Every parsed resume and every job posting
+# becomes two sparse vectors:
+#   - text: sublinear TF-IDF over summary / experience / projects
+#     (resumes) and title / requirements / description (jobs)
+#   - skills: canonical skill ids (skill_normalizer) from the resume's
+#     skills_list entries, plus entries the dictionary doesn't know;
+#     for a job, its "skills" field or the skills its requirements mention
+# A candidate's score for a job is a weighted sum of the text cosine
+# and the share of the job's skills the candidate has.
+#
+# Scoring is one pass of batched sparse matrix products
+# (candidates x jobs, MATCH_BLOCK_CELLS scores at a time) that keeps
+# the running top-k per job and per candidate, so both rankings come
+# out of the same pass.
+#
+# Candidate features live in SQLite (MATCH_STORE_PATH) like the job
+# store: each process appends rows newer than the last sequence it
+# saw to its own arrays, and the normalized matrices are rebuilt
+# (vectorized, no re-tokenizing) only after something changed.
+# numpy / scipy are imported on first match, not on import.
+# ------------------------------------------------------------
+
+MATCH_STORE_PATH = os.getenv(
+    "MATCH_STORE_PATH",
+    os.path.join(os.path.dirname(__file__), "data", "matching.sqlite3"),
+)
+# Weight of skill coverage vs text similarity (jobs without skills use text only)
+MATCH_SKILL_WEIGHT = float(os.getenv("MATCH_SKILL_WEIGHT", "0.5"))
+# Dense scores materialized per block (candidates x jobs); bounds peak memory
+MATCH_BLOCK_CELLS = int(os.getenv("MATCH_BLOCK_CELLS", "4000000"))
+# Job-side matrices (terms x jobs) up to this many cells are made dense:
+# sparse x dense products are several times faster than sparse x sparse
+MATCH_DENSE_JOB_CELLS = int(os.getenv("MATCH_DENSE_JOB_CELLS", "20000000"))
+MAX_TOP_K = 100
+# Longest skill phrase (in words) looked up in job requirements
+_MAX_SKILL_WORDS = 4
+
+_TAGS = re.compile(r"<[^>]+>")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    id      TEXT PRIMARY KEY,
+    seq     INTEGER NOT NULL,
+    doc     TEXT,
+    deleted INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS candidates_seq ON candidates (seq);
+"""
+
+
+def _plain(value):
+    if isinstance(value, (list, tuple)):
+        value = " ".join(str(v) for v in value)
+    return html.unescape(_TAGS.sub(" ", str(value or "")))
+
+
+def _list_skills(skills_list):
+    ids, unknown = skill_normalizer.normalize_list(skills_list)
+    return [*ids, *unknown]
+
+
+def resume_skills(resume):
+    """Canonical ids, then unrecognized entries, from every skills[].skills_list."""
+    skills = []
+    for category in resume.get("skills") or []:
+        if isinstance(category, dict):
+            skills.extend(_list_skills(str(category.get("skills_list") or "")))
+    return list(dict.fromkeys(skills))
+
+
+def skill_name(skill):
+    known = skill_normalizer.skill(skill)
+    return known["name"] if known else skill
+
+
+def resume_text(resume):
+    parts = [(resume.get("personal") or {}).get("title"), resume.get("summary")]
+    for section, fields in (("experience", ("jobTitle", "description")),
+                            ("projects", ("title", "description")),
+                            ("education", ("degree", "achievements"))):
+        for item in resume.get(section) or []:
+            if isinstance(item, dict):
+                parts.extend(item.get(field) for field in fields)
+    return " ".join(_plain(p) for p in parts if p)
+
+
+def job_text(job):
+    return " ".join(_plain(job.get(field)) for field in ("title", "requirements", "description"))
+
+
+def candidate_id(resume):
+    """Stable id for a parsed resume without one: a hash of its content."""
+    raw = json.dumps(resume, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:24]
+
+
+def _candidate_doc(resume):
+    personal = resume.get("personal") or {}
+    experience = [e for e in resume.get("experience") or [] if isinstance(e, dict)]
+    return {
+        "name": personal.get("name") or "",
+        "email": personal.get("email") or "",
+        "title": (experience[0].get("jobTitle") if experience else "") or personal.get("title") or "",
+        "skills": resume_skills(resume),
+        "tf": Counter(tokenize(resume_text(resume))),
+    }
+
+
+class _Vectors:
+    """
+    Append-only sparse rows (CSR parts in array.array) for one kind of document.
+    Replaced or removed rows are masked out and dropped on the next compaction.
+    """
+
+    def __init__(self):
+        self.ids = []          # row -> id
+        self.rows = {}         # id -> live row
+        self.alive = array("b")
+        self.info = []         # row -> summary returned with matches
+        self.skills = []       # row -> set of skill columns
+        self.text = ([0], array("i"), array("f"))     # indptr, indices, data
+        self.skill = ([0], array("i"), array("f"))
+        self.dead = 0
+
+    def __len__(self):
+        return len(self.rows)
+
+    def add(self, doc_id, tf, skill_cols, info):
+        self.remove(doc_id)
+        self.rows[doc_id] = len(self.ids)
+        self.ids.append(doc_id)
+        self.alive.append(1)
+        self.info.append(info)
+        self.skills.append(skill_cols)
+        indptr, indices, data = self.text
+        for col, count in tf.items():
+            indices.append(col)
+            data.append(1.0 + math.log(count))
+        indptr.append(len(indices))
+        indptr, indices, data = self.skill
+        indices.extend(sorted(skill_cols))
+        data.extend([1.0] * len(skill_cols))
+        indptr.append(len(indices))
+
+    def remove(self, doc_id):
+        row = self.rows.pop(doc_id, None)
+        if row is not None:
+            self.alive[row] = 0
+            self.dead += 1
+
+    def compact(self):
+        """Rebuilds the arrays without dead rows once they are a quarter of the total."""
+        if not self.dead or self.dead * 4 < len(self.ids):
+            return
+        old = (self.ids, self.alive, self.info, self.skills, self.text, self.skill)
+        self.__init__()
+        ids, alive, info, skills, text, skill = old
+        for row, doc_id in enumerate(ids):
+            if not alive[row]:
+                continue
+            self.rows[doc_id] = len(self.ids)
+            self.ids.append(doc_id)
+            self.alive.append(1)
+            self.info.append(info[row])
+            self.skills.append(skills[row])
+            for (indptr, indices, data), (new_indptr, new_indices, new_data) in ((text, self.text), (skill, self.skill)):
+                start, end = indptr[row], indptr[row + 1]
+                new_indices.extend(indices[start:end])
+                new_data.extend(data[start:end])
+                new_indptr.append(len(new_indices))
+
+    def matrix(self, part, columns):
+        import numpy as np
+        from scipy import sparse
+
+        # Copies: a live view would stop the arrays from growing
+        indptr, indices, data = self.text if part == "text" else self.skill
+        return sparse.csr_matrix(
+            (np.array(data, dtype=np.float32), np.array(indices, dtype=np.int32),
+             np.array(indptr, dtype=np.int64)),
+            shape=(len(self.ids), columns),
+        )
+
+
+class Matcher:
+    """Vocabularies, candidate / job vectors and the cached normalized matrices. Callers hold a lock."""
+
+    def __init__(self):
+        self.terms = {}        # term -> text column
+        self.skill_cols = {}   # normalized skill -> skill column
+        self.phrases = {}      # first word -> longest non-dictionary skill (in words) starting with it
+        self.candidates = _Vectors()
+        self.jobs = _Vectors()
+        self.job_docs = {}     # job id -> (job dict the row was built from, text columns)
+        self._scanned_skills = 0  # skill vocabulary size when job requirements were last scanned
+        self.version = 0
+        self._built = None     # (version, matrices)
+
+    def _columns(self, tf):
+        terms = self.terms
+        return Counter({terms.setdefault(term, len(terms)): n for term, n in tf.items()})
+
+    def _skill_columns(self, skills):
+        cols = set()
+        for skill in skills:
+            col = self.skill_cols.get(skill)
+            if col is None:
+                col = self.skill_cols[skill] = len(self.skill_cols)
+                if skill_normalizer.skill(skill) is None:
+                    words = skill.split()
+                    self.phrases[words[0]] = max(self.phrases.get(words[0], 0), len(words))
+            cols.add(col)
+        return cols
+
+    def add_candidate(self, cid, doc):
+        info = {k: doc.get(k) for k in ("name", "email", "title")}
+        self.candidates.add(cid, self._columns(doc["tf"]), self._skill_columns(doc["skills"]), info)
+        self.version += 1
+
+    def remove_candidate(self, cid):
+        self.candidates.remove(cid)
+        self.version += 1
+
+    def _job_skills(self, job):
+        if job.get("skills"):
+            values = job["skills"]
+            return _list_skills(", ".join(map(str, values)) if isinstance(values, list) else str(values))
+        # Dictionary skills mentioned in the requirements, then other skills
+        # candidates listed (longest phrase first)
+        text = _plain(job.get("requirements"))
+        found = skill_normalizer.find_in_text(text)
+        words, i = skill_normalizer.tokenize(text), 0
+        while i < len(words):
+            longest = self.phrases.get(words[i], 0)
+            for n in range(min(longest, _MAX_SKILL_WORDS, len(words) - i), 0, -1):
+                phrase = " ".join(words[i:i + n])
+                if phrase in self.skill_cols:
+                    found.append(phrase)
+                    i += n - 1
+                    break
+            i += 1
+        return list(dict.fromkeys(found))
+
+    def sync_jobs(self, docs):
+        """
+        Brings job rows in line with `docs` (job_search's live postings). Jobs whose
+        skills come from their requirements are re-scanned when new skills appeared.
+        """
+        live = {job["id"]: job for job in docs if job is not None}
+        changed = False
+        for jid in list(self.job_docs):
+            if jid not in live:
+                del self.job_docs[jid]
+                self.jobs.remove(jid)
+                changed = True
+        rescan = self._scanned_skills != len(self.skill_cols)
+        for jid, job in live.items():
+            cached = self.job_docs.get(jid)
+            if cached is not None and cached[0] is job:
+                if not rescan or job.get("skills"):
+                    continue
+                cols = cached[1]
+                skill_cols = self._skill_columns(self._job_skills(job))
+                if skill_cols == self.jobs.skills[self.jobs.rows[jid]]:
+                    continue
+            else:
+                cols = self._columns(Counter(tokenize(job_text(job))))
+                skill_cols = self._skill_columns(self._job_skills(job))
+            self.job_docs[jid] = (job, cols)
+            self.jobs.add(jid, cols, skill_cols, {"title": job.get("title"), "company": job.get("company"),
+                                                  "location": job.get("location")})
+            changed = True
+        self._scanned_skills = len(self.skill_cols)
+        if changed:
+            self.version += 1
+
+    def matrices(self):
+        """(candidate text, candidate skills, job text, job skills / |job skills|, job has skills), cached."""
+        if self._built is not None and self._built[0] == self.version:
+            return self._built[1]
+        import numpy as np
+        from scipy import sparse
+
+        self.candidates.compact()
+        self.jobs.compact()
+        columns = len(self.terms)
+        c_text = self.candidates.matrix("text", columns)
+        j_text = self.jobs.matrix("text", columns)
+        c_alive = np.array(self.candidates.alive, dtype=bool)
+        j_alive = np.array(self.jobs.alive, dtype=bool)
+
+        # Smoothed idf over live candidates + jobs
+        df = (np.bincount(c_text[c_alive].indices, minlength=columns)
+              + np.bincount(j_text[j_alive].indices, minlength=columns))
+        n_docs = int(c_alive.sum() + j_alive.sum())
+        idf = (np.log((1 + n_docs) / (1 + df)) + 1).astype(np.float32)
+
+        def _tfidf(m):
+            m = m @ sparse.diags(idf)
+            norms = np.sqrt(np.asarray(m.multiply(m).sum(axis=1)).ravel())
+            norms[norms == 0] = 1
+            return sparse.diags((1 / norms).astype(np.float32)) @ m
+
+        skill_columns = len(self.skill_cols)
+        j_skill = self.jobs.matrix("skill", skill_columns)
+        counts = np.asarray(j_skill.sum(axis=1)).ravel()
+        has_skills = counts > 0
+        counts[~has_skills] = 1
+        j_skill = (sparse.diags((1 / counts).astype(np.float32)) @ j_skill).T.tocsc()
+
+        built = (_tfidf(c_text).tocsr(), self.candidates.matrix("skill", skill_columns),
+                 _tfidf(j_text).T.tocsc(), j_skill, has_skills, c_alive, j_alive)
+        self._built = (self.version, built)
+        return built
+
+
+def _dense(product):
+    return product.toarray() if hasattr(product, "toarray") else product
+
+
+def _topk(scores, k, axis):
+    """(indices, scores) of the k largest along `axis`, best first."""
+    import numpy as np
+
+    k = min(k, scores.shape[axis])
+    idx = np.argpartition(-scores, k - 1, axis=axis)
+    idx = idx[:, :k] if axis == 1 else idx[:k, :]
+    top = np.take_along_axis(scores, idx, axis=axis)
+    order = np.argsort(-top, axis=axis, kind="stable")
+    return np.take_along_axis(idx, order, axis=axis), np.take_along_axis(top, order, axis=axis)
+
+
+def score_topk(matrices, candidate_rows, job_rows, k):
+    """
+    One blocked pass over candidates x jobs. Returns
+    (per job: (candidate rows k x J, scores k x J), per candidate: (job rows C x k, scores C x k)),
+    row numbers relative to `candidate_rows` / `job_rows`.
+    """
+    import numpy as np
+
+    c_text, c_skill, j_text, j_skill, has_skills, _, _ = matrices
+    # Job matrices are column-major (terms x jobs) so selecting jobs is cheap
+    j_text, j_skill = j_text[:, job_rows], j_skill[:, job_rows]
+    j_text = j_text.toarray() if j_text.shape[0] * len(job_rows) <= MATCH_DENSE_JOB_CELLS else j_text.tocsr()
+    j_skill = j_skill.toarray() if j_skill.shape[0] * len(job_rows) <= MATCH_DENSE_JOB_CELLS else j_skill.tocsr()
+    skill_weight = np.where(has_skills[job_rows], MATCH_SKILL_WEIGHT, 0.0).astype(np.float32)
+    n_c, n_j = len(candidate_rows), len(job_rows)
+    k_jobs, k_cands = min(k, n_c), min(k, n_j)
+
+    best_rows = np.full((k_jobs, n_j), -1, dtype=np.int64)
+    best_scores = np.full((k_jobs, n_j), -np.inf, dtype=np.float32)
+    cand_rows = np.empty((n_c, k_cands), dtype=np.int64)
+    cand_scores = np.empty((n_c, k_cands), dtype=np.float32)
+
+    block = max(1, MATCH_BLOCK_CELLS // max(n_j, 1))
+    for start in range(0, n_c, block):
+        rows = candidate_rows[start:start + block]
+        text = _dense(c_text[rows] @ j_text)
+        skills = _dense(c_skill[rows] @ j_skill)
+        scores = text * (1 - skill_weight) + skills * skill_weight
+
+        idx, top = _topk(scores, k_cands, axis=1)
+        cand_rows[start:start + len(rows)] = idx
+        cand_scores[start:start + len(rows)] = top
+
+        # Merge this block into the running per-job top-k
+        merged_scores = np.vstack([best_scores, scores])
+        merged_rows = np.vstack([best_rows, np.broadcast_to(np.arange(start, start + len(rows))[:, None],
+                                                            scores.shape)])
+        idx, best_scores = _topk(merged_scores, k_jobs, axis=0)
+        best_rows = np.take_along_axis(merged_rows, idx, axis=0)
+
+    return (best_rows, best_scores), (cand_rows, cand_scores)
+
+
+_matcher = Matcher()
+_lock = threading.RLock()
+_local = threading.local()
+_last_seq = 0
+_jobs_seq = -1
+
+
+def _connect():
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(MATCH_STORE_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(MATCH_STORE_PATH, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def _sync():
+    """Applies candidate rows written since the last look, and job postings changed since then."""
+    global _last_seq, _jobs_seq
+    import job_search
+
+    with _lock:
+        rows = _connect().execute(
+            "SELECT id, seq, doc, deleted FROM candidates WHERE seq > ? ORDER BY seq", (_last_seq,)
+        ).fetchall()
+        for cid, seq, doc, deleted in rows:
+            if deleted:
+                _matcher.remove_candidate(cid)
+            else:
+                doc = json.loads(doc)
+                doc["tf"] = Counter(doc["tf"])
+                _matcher.add_candidate(cid, doc)
+            _last_seq = seq
+
+        job_search._sync()
+        with job_search._lock:
+            # New candidate skills can turn up in existing requirements text
+            if job_search._last_seq != _jobs_seq or _matcher._scanned_skills != len(_matcher.skill_cols):
+                _matcher.sync_jobs(job_search._index.docs)
+                _jobs_seq = job_search._last_seq
+
+
+def _write(rows):
+    conn = _connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM candidates").fetchone()[0]
+        for cid, doc in rows:
+            seq += 1
+            conn.execute(
+                "INSERT INTO candidates (id, seq, doc, deleted) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(id) DO UPDATE SET seq = excluded.seq, doc = COALESCE(excluded.doc, candidates.doc),"
+                " deleted = excluded.deleted",
+                (cid, seq, doc, 0 if doc is not None else 1),
+            )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def add_resumes(resumes):
+    """
+    Adds or replaces candidates. `resumes`: [(candidate id or None, parsed resume)].
+    Only the extracted features are stored. Returns the candidate ids.
+    """
+    ids, rows = [], []
+    for cid, resume in resumes:
+        if not isinstance(resume, dict):
+            raise ValueError("Resume data must be an object")
+        cid = str(cid or candidate_id(resume))
+        ids.append(cid)
+        rows.append((cid, json.dumps(_candidate_doc(resume))))
+    if rows:
+        _write(rows)
+    return ids
+
+
+def add_resume(resume, cid=None):
+    """Indexes one parsed resume (as returned by structure_text_with_ai); returns its candidate id."""
+    return add_resumes([(cid, resume)])[0]
+
+
+def remove_candidate(cid):
+    """True if the candidate was indexed."""
+    row = _connect().execute("SELECT deleted FROM candidates WHERE id = ?", (cid,)).fetchone()
+    if row is None or row[0]:
+        return False
+    _write([(cid, None)])
+    return True
+
+
+def match(job_ids=None, candidate_ids=None, k=10):
+    """
+    Top-k candidates per job and top-k jobs per candidate, from one scoring pass.
+
+    Args:
+        job_ids / candidate_ids: restrict either side (default: everything indexed);
+            unknown ids raise ValueError.
+        k: results per list (at most MAX_TOP_K).
+
+    Returns:
+        {"candidatesByJob": {job id: [{"candidateId", "score", "matchedSkills", "name", ...}]},
+         "jobsByCandidate": {candidate id: [{"jobId", "score", "matchedSkills", ...}]}}
+    """
+    import numpy as np
+
+    k = max(1, min(int(k), MAX_TOP_K))
+    _sync()
+    with metrics.time_stage("matching"), _lock:
+        m = _matcher
+        built = m.matrices()
+        c_alive, j_alive = built[5], built[6]
+
+        def _rows(vectors, ids, alive, kind):
+            if ids is None:
+                return np.flatnonzero(alive)
+            missing = [i for i in ids if i not in vectors.rows]
+            if missing:
+                raise ValueError(f"Unknown {kind} id(s): {missing[:5]}")
+            return np.array([vectors.rows[i] for i in dict.fromkeys(ids)], dtype=np.int64)
+
+        c_rows = _rows(m.candidates, candidate_ids, c_alive, "candidate")
+        j_rows = _rows(m.jobs, job_ids, j_alive, "job")
+        by_job = {m.jobs.ids[r]: [] for r in j_rows}
+        by_candidate = {m.candidates.ids[r]: [] for r in c_rows}
+        if not len(c_rows) or not len(j_rows):
+            return {"candidatesByJob": by_job, "jobsByCandidate": by_candidate}
+
+        (job_best, job_scores), (cand_best, cand_scores) = score_topk(built, c_rows, j_rows, k)
+
+        skill_names = None
+
+        def _matched(c_row, j_row):
+            nonlocal skill_names
+            if skill_names is None:
+                skill_names = {col: name for name, col in m.skill_cols.items()}
+            return sorted(skill_name(skill_names[c]) for c in m.candidates.skills[c_row] & m.jobs.skills[j_row])
+
+        for j, j_row in enumerate(j_rows):
+            hits = by_job[m.jobs.ids[j_row]]
+            for i, score in zip(job_best[:, j], job_scores[:, j]):
+                if i >= 0 and score > 0:
+                    c_row = c_rows[i]
+                    hits.append(dict(m.candidates.info[c_row], candidateId=m.candidates.ids[c_row],
+                                     score=round(float(score), 6), matchedSkills=_matched(c_row, j_row)))
+        for i, c_row in enumerate(c_rows):
+            hits = by_candidate[m.candidates.ids[c_row]]
+            for j, score in zip(cand_best[i], cand_scores[i]):
+                if score > 0:
+                    j_row = j_rows[j]
+                    hits.append(dict(m.jobs.info[j_row], jobId=m.jobs.ids[j_row],
+                                     score=round(float(score), 6), matchedSkills=_matched(c_row, j_row)))
+
+    return {"candidatesByJob": by_job, "jobsByCandidate": by_candidate}
+
+
+def top_candidates(job_id, k=10):
+    return match(job_ids=[job_id], k=k)["candidatesByJob"][job_id]
+
+
+def top_jobs(cid, k=10):
+    return match(candidate_ids=[cid], k=k)["jobsByCandidate"][cid]
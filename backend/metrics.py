@@ -0,0 +1,388 @@
+# backend/metrics.py
+import bisect
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+# ------------------------------------------------------------
+# Minimal in-process Prometheus metrics (counters + histograms)
+# exposed as text at /api/metrics. Observing is a perf_counter pair,
+# a bisect and a short lock, so it is safe on every request.
+#
+# Renders run in the render_service pool; the worker collects its
+# stage timings with `collect()` and they are recorded here when the
+# result comes back.
+#
+# Every process records into its own registry, and a background thread
+# writes a snapshot of it to SQLite (METRICS_STORE_PATH) every
+# METRICS_FLUSH_SECONDS; answering a scrape writes one too. Snapshots
+# belong to a server generation, the pid of the process that started
+# the workers (gunicorn master, uvicorn supervisor), and a scrape sums
+# the snapshots of its own generation, so other workers' values are
+# at most METRICS_FLUSH_SECONDS old. Rows not refreshed for
+# METRICS_STALE_SECONDS are from exited processes and are ignored and
+# pruned, as are generations whose starting process is gone. Under
+# gunicorn, child_exit first folds an exiting worker's snapshot into
+# the generation's retired row, so counters don't go backwards when
+# workers recycle; elsewhere (uvicorn --workers) a worker that exits
+# takes its counts with it, which Prometheus sees as a counter reset.
+# ------------------------------------------------------------
+
+METRICS_STORE_PATH = os.getenv(
+    "METRICS_STORE_PATH",
+    os.path.join(os.path.dirname(__file__), "data", "metrics.sqlite3"),
+)
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+METRICS_STALE_SECONDS = float(os.getenv("METRICS_STALE_SECONDS", str(3 * METRICS_FLUSH_SECONDS)))
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS process_metrics (
+    generation INTEGER NOT NULL,
+    pid        INTEGER NOT NULL,
+    body       TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (generation, pid)
+);
+"""
+# pid of the row holding a generation's totals of processes that have exited
+_RETIRED = 0
+
+_registry = []
+_local = threading.local()
+_db = threading.local()
+_inherited = []  # connections opened before a fork; never closed in the child
+_flush_lock = threading.Lock()
+_flusher = None  # background snapshot thread, started on the first observation
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=""):
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter. `name` should end in _total."""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+        _start_flusher()
+
+    def snapshot(self):
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+    def reset(self):
+        self._values = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def combine(a, b):
+        return a + b
+
+    def expose(self, series):
+        """Exposition lines for `series` ({label values: value}, as summed by render())."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(series.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, key)} {_fmt(value)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram of durations in seconds."""
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+        _start_flusher()
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self):
+        with self._lock:
+            return [[list(key), [list(s[0]), s[1], s[2]]] for key, s in self._series.items()]
+
+    def reset(self):
+        self._series = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def combine(a, b):
+        return [[x + y for x, y in zip(a[0], b[0])], a[1] + b[1], a[2] + b[2]]
+
+    def expose(self, series):
+        """Exposition lines for `series` ({label values: [bucket counts, sum, count]})."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, count) in sorted(series.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = 'le="' + _fmt(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_fmt(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+REQUEST_SECONDS = Histogram(
+    "recruitedge_request_duration_seconds",
+    "HTTP request latency by route and status.",
+    ("method", "endpoint", "status"),
+)
+STAGE_SECONDS = Histogram(
+    "recruitedge_stage_duration_seconds",
+    "Time spent in a processing stage (extraction, json_parse, template_render, pdf_serialize, ...).",
+    ("stage",),
+)
+LLM_SECONDS = Histogram(
+    "recruitedge_llm_call_duration_seconds",
+    "LLM call latency by provider, model and outcome.",
+    ("provider", "model", "outcome"),
+)
+LLM_JSON_ERRORS = Counter(
+    "recruitedge_llm_json_errors_total",
+    "LLM responses that could not be parsed as JSON.",
+    ("provider",),
+)
+
+
+def record_stage(stage, seconds):
+    samples = getattr(_local, "samples", None)
+    if samples is not None:
+        samples.append((stage, seconds))
+    else:
+        STAGE_SECONDS.observe(seconds, stage=stage)
+
+
+@contextmanager
+def time_stage(stage):
+    """Times a block as `stage` (deferred to the dispatcher inside render workers)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - start)
+
+
+@contextmanager
+def collect():
+    """Buffers time_stage samples on this thread instead of recording them; yields the list."""
+    previous = getattr(_local, "samples", None)
+    _local.samples = samples = []
+    try:
+        yield samples
+    finally:
+        _local.samples = previous
+
+
+def record_stages(samples):
+    for stage, seconds in samples:
+        STAGE_SECONDS.observe(seconds, stage=stage)
+
+
+@contextmanager
+def time_llm(provider, model):
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        LLM_SECONDS.observe(time.perf_counter() - start, provider=provider, model=model, outcome=outcome)
+
+
+def _connect():
+    conn = getattr(_db, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(METRICS_STORE_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(METRICS_STORE_PATH, timeout=5, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        _db.conn = conn
+    return conn
+
+
+def _snapshot():
+    """This process's series: {metric name: [[label values, value], ...]} (JSON-ready)."""
+    return {metric.name: metric.snapshot() for metric in list(_registry)}
+
+
+def _combine(snapshots):
+    """Sums snapshots into {metric name: {label values tuple: value}}."""
+    metrics = {metric.name: metric for metric in _registry}
+    totals = {name: {} for name in metrics}
+    for snapshot in snapshots:
+        for name, items in snapshot.items():
+            if name not in metrics:
+                continue
+            series = totals[name]
+            for key, value in items:
+                key = tuple(key)
+                series[key] = metrics[name].combine(series[key], value) if key in series else value
+    return totals
+
+
+def _generation():
+    """The server start this process belongs to: the pid of the process that started it."""
+    return os.getppid()
+
+
+def _running(pid):
+    if os.name != "posix":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass  # exists, owned by someone else
+    return True
+
+
+def _write_snapshot(conn, generation, pid, snapshot):
+    conn.execute(
+        "INSERT OR REPLACE INTO process_metrics (generation, pid, body, updated_at) VALUES (?, ?, ?, ?)",
+        (generation, pid, json.dumps(snapshot, separators=(",", ":")), time.time()),
+    )
+
+
+def flush():
+    """Writes this process's snapshot now (the background thread does so every METRICS_FLUSH_SECONDS)."""
+    with _flush_lock:
+        _write_snapshot(_connect(), _generation(), os.getpid(), _snapshot())
+
+
+def _flush_loop():
+    while True:
+        time.sleep(METRICS_FLUSH_SECONDS)
+        try:
+            flush()
+        except sqlite3.Error as e:
+            print(f"Could not write metrics snapshot: {e}")
+
+
+def _start_flusher():
+    global _flusher
+    if _flusher is not None:
+        return
+    with _flush_lock:
+        if _flusher is None:
+            _flusher = threading.Thread(target=_flush_loop, name="metrics-flush", daemon=True)
+            _flusher.start()
+
+
+def _prune(conn):
+    """Drops rows of processes that stopped refreshing them and of generations whose starter is gone."""
+    conn.execute(
+        "DELETE FROM process_metrics WHERE pid != ? AND updated_at < ?",
+        (_RETIRED, time.time() - METRICS_STALE_SECONDS),
+    )
+    for (generation,) in conn.execute("SELECT DISTINCT generation FROM process_metrics").fetchall():
+        if generation != _generation() and not _running(generation):
+            conn.execute("DELETE FROM process_metrics WHERE generation = ?", (generation,))
+
+
+def retire(pid):
+    """Folds an exited worker's snapshot into its generation's retired totals. Called by the gunicorn master."""
+    generation = os.getpid()
+    conn = _connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        rows = conn.execute(
+            "SELECT body FROM process_metrics WHERE generation = ? AND pid IN (?, ?)", (generation, pid, _RETIRED)
+        ).fetchall()
+        if conn.execute(
+            "DELETE FROM process_metrics WHERE generation = ? AND pid = ?", (generation, pid)
+        ).rowcount:
+            totals = _combine(json.loads(body) for (body,) in rows)
+            _write_snapshot(conn, generation, _RETIRED, {
+                name: [[list(key), value] for key, value in series.items()] for name, series in totals.items()
+            })
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _after_fork():
+    # A forked worker starts with empty series; the parent's stay in the parent's snapshot
+    global _flush_lock, _flusher
+    for metric in _registry:
+        metric.reset()
+    # Closing the parent's SQLite connection here could drop its locks or its WAL file
+    _inherited.append(getattr(_db, "conn", None))
+    _db.conn = None
+    _flush_lock = threading.Lock()
+    _flusher = None  # threads don't survive fork
+
+
+os.register_at_fork(after_in_child=_after_fork)
+
+
+def render():
+    """All registered metrics, summed over every process, in Prometheus text exposition format (0.0.4)."""
+    snapshots = [_snapshot()]
+    try:
+        flush()
+        conn = _connect()
+        _prune(conn)
+        snapshots += [json.loads(body) for (body,) in conn.execute(
+            "SELECT body FROM process_metrics WHERE generation = ? AND pid != ? AND (pid = ? OR updated_at >= ?)",
+            (_generation(), os.getpid(), _RETIRED, time.time() - METRICS_STALE_SECONDS),
+        )]
+    except sqlite3.Error:
+        pass  # store unavailable: this process's values only
+    totals = _combine(snapshots)
+    lines = []
+    for metric in list(_registry):
+        lines.extend(metric.expose(totals[metric.name]))
+    return "\n".join(lines) + "\n"
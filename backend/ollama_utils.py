@@ -1,10 +1,11 @@
 # backend/ollama_utils.py
+import os
 import requests
 import json
 import re
 
 # This is the confirmed working endpoint from your test
-OLLAMA_API_URL = "http://localhost:11434/api/generate" 
+OLLAMA_API_URL = os.getenv("OLLAMA_API_URL", "http://localhost:11434/api/generate")
 MODEL_NAME = "llama3:latest" # Using :latest as shown in your ollama list output
 
 def _query_ollama(prompt, is_json=False):
@@ -0,0 +1,82 @@
+# backend/preview.py
+import os
+
+import metrics
+import render_cache
+from asset_store import get_asset
+from render_cache import ByteLRUCache
+
+# ------------------------------------------------------------
+# Incremental HTML preview for the resume builder.
+# resume_template.html wraps each section in a Jinja {% block %};
+# a block is rendered on its own from just the fields it reads, and
+# the fragment is memoized under a hash of those fields. An edit to
+# one section re-renders one block instead of the whole document.
+# ------------------------------------------------------------
+
+PREVIEW_CACHE_MAX_BYTES = int(os.getenv("PREVIEW_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+# Template block -> payload fields it reads, in document order
+SECTIONS = {
+    "styles": ("styleOptions",),
+    "header": ("personal", "pamtenLogoAssetId", "profilePicAssetId"),
+    "summary": ("summary",),
+    "experience": ("experience",),
+    "education": ("education",),
+    "skills": ("skills",),
+    "projects": ("projects",),
+    "publications": ("publications",),
+    "certifications": ("certifications",),
+}
+
+_fragments = ByteLRUCache(PREVIEW_CACHE_MAX_BYTES)
+
+
+def affected_sections(model: dict):
+    """Blocks that read at least one field present in `model` (i.e. in a delta)."""
+    return [name for name, fields in SECTIONS.items() if any(f in model for f in fields)]
+
+
+def section_hash(model: dict, section: str, asset_base: str = "") -> str:
+    fields = {f: model.get(f) for f in SECTIONS[section]}
+    if section == "header":
+        fields["assetBase"] = asset_base  # image URLs are baked into the fragment
+    return render_cache.cache_key(fields, f"preview:{section}")
+
+
+def _context(model, asset_base):
+    ctx = {"personal": {}, "styleOptions": {}}
+    ctx.update(model)
+    for asset_key, src_key in (("pamtenLogoAssetId", "pamtenLogoSrc"), ("profilePicAssetId", "profilePicSrc")):
+        asset_id = model.get(asset_key)
+        ctx[src_key] = f"{asset_base}{asset_id}" if get_asset(asset_id) else None
+    return ctx
+
+
+def render_section(model: dict, section: str, asset_base: str = "") -> str:
+    """Renders one template block; `model` comes from resume_model.build_model."""
+    from document_generator import _get_template
+
+    template = _get_template()
+    with metrics.time_stage("preview_render"):
+        return "".join(template.blocks[section](template.new_context(_context(model, asset_base))))
+
+
+def render_sections(model: dict, sections, known=None, asset_base: str = "") -> dict:
+    """
+    Returns {section: {"hash", "html"}} for each requested section. Sections whose
+    hash is already in `known` (what the client holds) come back without "html".
+    """
+    known = known or {}
+    out = {}
+    for section in sections:
+        key = section_hash(model, section, asset_base)
+        if known.get(section) == key:
+            out[section] = {"hash": key, "unchanged": True}
+            continue
+        body = _fragments.get(key)
+        if body is None:
+            body = render_section(model, section, asset_base).encode("utf-8")
+            _fragments.put(key, body)
+        out[section] = {"hash": key, "html": body.decode("utf-8")}
+    return out
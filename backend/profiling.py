@@ -0,0 +1,271 @@
+# backend/profiling.py
+import asyncio
+import collections
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+
+from flask import g, request
+
+# ------------------------------------------------------------
+# Opt-in per-request profiling. A request is profiled when it sends
+# X-Profile-Token matching PROFILE_TOKEN, or when it is picked at
+# PROFILE_SAMPLE_RATE. One sampler thread snapshots the stacks of
+# the profiled request threads (sys._current_frames) every
+# PROFILE_INTERVAL seconds and the counts are written as collapsed
+# stacks (flamegraph.pl / speedscope input) to PROFILE_DIR/<id>.folded.
+# The response carries the id in X-Profile-Id; fetch the file from
+# GET /api/profiles/<id>.
+#
+# The async routes (async_api.py) share one event loop thread, so
+# there the target is the request's task instead: while it runs, the
+# loop thread's stack is sampled; while it is suspended, the chain of
+# coroutines it is awaiting, under an "(awaiting)" root frame.
+#
+# With neither setting configured, init_app and asgi_middleware
+# register nothing, so unprofiled deployments pay no per-request cost.
+# ------------------------------------------------------------
+
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.005"))
+PROFILE_DIR = os.getenv(
+    "PROFILE_DIR",
+    os.path.join(os.path.dirname(__file__), "data", "profiles"),
+)
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "500"))
+
+ENABLED = bool(PROFILE_TOKEN) or PROFILE_SAMPLE_RATE > 0
+TOKEN_HEADER = "X-Profile-Token"
+ID_HEADER = "X-Profile-Id"
+
+PROFILE_ID = re.compile(r"^[0-9a-f]{32}$")
+# Never sampled: scraping / fetching profiles shouldn't produce more profiles
+_UNSAMPLED = ("/api/health", "/api/metrics", "/api/profiles/")
+
+_lock = threading.Lock()
+_wake = threading.Event()
+_targets = {}   # thread id or (loop thread id, task) -> Counter of collapsed stacks
+_labels = {}    # code object -> frame label
+_sampler = None
+
+
+def _label(code):
+    label = _labels.get(code)
+    if label is None:
+        path = code.co_filename.replace(os.sep, "/").rsplit("/", 2)
+        label = f"{code.co_name} ({'/'.join(path[-2:])}:{code.co_firstlineno})".replace(";", ":")
+        _labels[code] = label
+    return label
+
+
+def _collapse(frame):
+    stack = []
+    while frame is not None:
+        stack.append(_label(frame.f_code))
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+def _task_stack(tid, task, frames):
+    if asyncio.current_task(task.get_loop()) is task:
+        frame = frames.get(tid)
+        return _collapse(frame) if frame is not None else None
+    stack = ["(awaiting)"]
+    awaited = task.get_coro()
+    while awaited is not None:
+        frame = getattr(awaited, "cr_frame", None) or getattr(awaited, "gi_frame", None)
+        if frame is None:
+            break
+        stack.append(_label(frame.f_code))
+        awaited = getattr(awaited, "cr_await", None) or getattr(awaited, "gi_yieldfrom", None)
+    return ";".join(stack)
+
+
+def _sample_loop():
+    while True:
+        _wake.wait()
+        time.sleep(PROFILE_INTERVAL)
+        with _lock:
+            if not _targets:
+                _wake.clear()
+                continue
+            frames = sys._current_frames()
+            for target, counts in _targets.items():
+                if isinstance(target, tuple):
+                    stack = _task_stack(*target, frames)
+                else:
+                    frame = frames.get(target)
+                    stack = _collapse(frame) if frame is not None else None
+                if stack:
+                    counts[stack] += 1
+        del frames
+
+
+def _start_sampler():
+    global _sampler
+    if _sampler is None:
+        _sampler = threading.Thread(target=_sample_loop, name="profiler", daemon=True)
+        _sampler.start()
+
+
+def start(target=None):
+    """Starts sampling `target`: a thread id, or (loop thread id, task). Default: the calling thread."""
+    with _lock:
+        _start_sampler()
+        _targets[target or threading.get_ident()] = collections.Counter()
+    _wake.set()
+
+
+def stop(target=None):
+    """Stops sampling `target` and returns its Counter of collapsed stacks."""
+    with _lock:
+        return _targets.pop(target or threading.get_ident(), collections.Counter())
+
+
+def is_profiled():
+    """True while the calling thread is being sampled."""
+    return ENABLED and threading.get_ident() in _targets
+
+
+def _profile_path(profile_id):
+    return os.path.join(PROFILE_DIR, f"{profile_id}.folded")
+
+
+def _prune():
+    try:
+        entries = [e for e in os.scandir(PROFILE_DIR) if e.name.endswith(".folded")]
+    except FileNotFoundError:
+        return
+    if len(entries) <= PROFILE_MAX_FILES:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime)
+    for entry in entries[: len(entries) - PROFILE_MAX_FILES]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def save(profile_id, counts):
+    """Writes `counts` as collapsed stacks ("frame;frame;frame count" per line)."""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = _profile_path(profile_id)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for stack, n in counts.most_common():
+            f.write(f"{stack} {n}\n")
+    os.replace(tmp, path)
+    _prune()
+
+
+def load(profile_id):
+    """Collapsed-stack text for `profile_id`, or None."""
+    if not PROFILE_ID.match(profile_id or ""):
+        return None
+    try:
+        with open(_profile_path(profile_id), encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def authorized(req):
+    """With PROFILE_TOKEN set, the request must carry it; otherwise profile ids are the secret."""
+    if not PROFILE_TOKEN:
+        return True
+    return hmac.compare_digest(req.headers.get(TOKEN_HEADER, ""), PROFILE_TOKEN)
+
+
+def _wanted(req, path):
+    """`req`: a Flask request or Starlette connection (case-insensitive .headers)."""
+    if PROFILE_TOKEN and TOKEN_HEADER in req.headers:
+        return authorized(req)
+    if PROFILE_SAMPLE_RATE > 0 and not path.startswith(_UNSAMPLED):
+        return random.random() < PROFILE_SAMPLE_RATE
+    return False
+
+
+# -----------------------------
+# Flask hooks
+# -----------------------------
+def _before():
+    if _wanted(request, request.path):
+        g.profile_id = uuid.uuid4().hex
+        start()
+
+
+def _after(response):
+    profile_id = g.get("profile_id")
+    if profile_id:
+        response.headers[ID_HEADER] = profile_id
+    return response
+
+
+def _teardown(exc):
+    profile_id = g.pop("profile_id", None)
+    if profile_id:
+        counts = stop()
+        try:
+            save(profile_id, counts)
+        except OSError as e:
+            print(f"Could not save profile {profile_id}: {e}")
+
+
+def init_app(app):
+    """Registers the profiling hooks, only when PROFILE_TOKEN or PROFILE_SAMPLE_RATE is set."""
+    if not ENABLED:
+        return
+    app.before_request(_before)
+    app.after_request(_after)
+    app.teardown_request(_teardown)
+
+
+# -----------------------------
+# ASGI middleware (async_api)
+# -----------------------------
+class _ProfileMiddleware:
+    """Starlette counterpart of the Flask hooks: profiles the request's task."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        from starlette.requests import HTTPConnection
+
+        connection = HTTPConnection(scope) if scope["type"] == "http" else None
+        if connection is None or not _wanted(connection, scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+        target = (threading.get_ident(), asyncio.current_task())
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), (ID_HEADER.lower().encode(), profile_id.encode())]
+            await send(message)
+
+        start(target)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            counts = stop(target)
+            try:
+                await asyncio.to_thread(save, profile_id, counts)
+            except OSError as e:
+                print(f"Could not save profile {profile_id}: {e}")
+
+
+def asgi_middleware():
+    """Starlette middleware list for async_api: the profiler, only when profiling is enabled."""
+    if not ENABLED:
+        return []
+    from starlette.middleware import Middleware
+
+    return [Middleware(_ProfileMiddleware)]
@@ -0,0 +1,115 @@
+# backend/render_cache.py
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from render_service import DOCX_ENGINE
+
+# ------------------------------------------------------------
+# Output cache for rendered documents. Keys are a canonical hash of
+# the normalized payload + template version + output format, so the
+# same resume downloaded twice costs a hash instead of a render.
+# The key doubles as the strong ETag returned to the client.
+# ------------------------------------------------------------
+
+RENDER_CACHE_MAX_BYTES = int(os.getenv("RENDER_CACHE_MAX_BYTES", str(128 * 1024 * 1024)))
+RENDER_CACHE_MAX_ENTRY_BYTES = int(os.getenv("RENDER_CACHE_MAX_ENTRY_BYTES", str(16 * 1024 * 1024)))
+
+# Bump when generator code changes output without touching the template
+GENERATOR_VERSION = f"3:{DOCX_ENGINE}"
+
+# Keys the generators derive themselves or never render
+_IGNORED_KEYS = {"id", "pamtenLogoSrc", "profilePicSrc"}
+
+
+class ByteLRUCache:
+    """Thread-safe LRU mapping str -> bytes, bounded by the total size of the values."""
+
+    def __init__(self, max_bytes, max_entry_bytes=None):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes or max_bytes
+        self._data = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def put(self, key, value: bytes):
+        if len(value) > self.max_entry_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._data[key] = value
+            self._size += len(value)
+            while self._size > self.max_bytes and self._data:
+                _, evicted = self._data.popitem(last=False)
+                self._size -= len(evicted)
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._data), "bytes": self._size, "maxBytes": self.max_bytes}
+
+
+def _template_version():
+    path = os.path.join(os.path.dirname(__file__), "assets", "resume_template.html")
+    h = hashlib.sha256(GENERATOR_VERSION.encode())
+    with open(path, "rb") as f:
+        h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+TEMPLATE_VERSION = _template_version()
+
+
+def _normalize(value):
+    """Drops None values and non-rendered keys so equivalent payloads hash the same."""
+    if isinstance(value, dict):
+        return {
+            k: _normalize(v)
+            for k, v in value.items()
+            if v is not None and k not in _IGNORED_KEYS
+        }
+    if isinstance(value, list):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def cache_key(payload, fmt: str) -> str:
+    canonical = json.dumps(
+        _normalize(payload or {}),
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    h = hashlib.sha256()
+    h.update(f"{TEMPLATE_VERSION}:{fmt}:".encode())
+    h.update(canonical.encode("utf-8"))
+    return h.hexdigest()
+
+
+_cache = ByteLRUCache(RENDER_CACHE_MAX_BYTES, RENDER_CACHE_MAX_ENTRY_BYTES)
+
+
+def get(key):
+    return _cache.get(key)
+
+
+def put(key, value: bytes):
+    _cache.put(key, value)
+
+
+def stats():
+    return _cache.stats()
@@ -0,0 +1,212 @@
+# backend/render_service.py
+import concurrent.futures
+import contextlib
+import multiprocessing
+import os
+import signal
+import threading
+
+import metrics
+
+# ------------------------------------------------------------
+# PDF / DOCX rendering on a pool of pre-warmed worker processes.
+# WeasyPrint layout is CPU-bound and holds the GIL, so renders run
+# out-of-process; request threads only wait on a future. The number
+# of queued + running renders is capped, and each worker enforces its
+# render's timeout itself (SIGALRM), so a slow render fails alone and
+# its worker moves on to the next job; the rest of the pool is never
+# disturbed. A render stuck inside native code past its deadline keeps
+# its worker until that call returns, but its caller still gets
+# RenderTimeout after RENDER_TIMEOUT_GRACE more seconds.
+# ------------------------------------------------------------
+
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", str(os.cpu_count() or 2)))
+RENDER_TIMEOUT = float(os.getenv("RENDER_TIMEOUT", "60"))
+# How much longer than the timeout a caller waits for the worker to report it
+RENDER_TIMEOUT_GRACE = float(os.getenv("RENDER_TIMEOUT_GRACE", "5"))
+RENDER_MAX_QUEUE = int(os.getenv("RENDER_MAX_QUEUE", str(max(RENDER_WORKERS, 1) * 4)))
+RENDER_START_METHOD = os.getenv("RENDER_START_METHOD", "spawn")
+# "template" = docx_engine (cached template, XML fragments); "legacy" = python-docx object model
+DOCX_ENGINE = os.getenv("DOCX_ENGINE", "template")
+
+
+class RenderQueueFull(RuntimeError):
+    """Raised when RENDER_MAX_QUEUE renders are already queued or running."""
+
+
+class RenderTimeout(RuntimeError):
+    """Raised when a single render exceeds its timeout."""
+
+
+# -----------------------------
+# Worker side
+# -----------------------------
+def _warm_worker():
+    """
+    Pool initializer: load template, fonts, python-docx and PyMuPDF (bundle
+    thumbnails) before the first job. Spawned workers start from a fresh
+    interpreter, so nothing preloaded in the gunicorn master is here yet.
+    """
+    import document_generator
+    import docx_engine
+    try:
+        # Warm-up timings aren't request stages (and recording them here would start a metrics flusher)
+        with metrics.collect():
+            document_generator.warm_up()
+            docx_engine.warm_up()
+        import fitz  # noqa: F401
+    except Exception as e:
+        print(f"Render worker warm-up failed: {e}")
+
+
+def _ping():
+    return os.getpid()
+
+
+def _render_job(kind, payload):
+    from document_generator import generate_docx_from_data, generate_pdf_from_data
+    if kind == "bundle":
+        from resume_model import render_formats
+        return render_formats(payload["model"], payload["formats"], payload.get("thumbnailDpi"))
+    if kind == "pdf":
+        return generate_pdf_from_data(payload)
+    if kind == "docx":
+        if DOCX_ENGINE == "template":
+            from docx_engine import generate_docx
+            return generate_docx(payload)
+        with metrics.time_stage("docx_serialize"):
+            return generate_docx_from_data(payload).getvalue()
+    raise ValueError(f"Unknown render kind: {kind}")
+
+
+@contextlib.contextmanager
+def _deadline(seconds):
+    """Raises RenderTimeout inside the block once it runs past `seconds` (main thread only)."""
+    if not seconds or not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def _expire(signum, frame):
+        raise RenderTimeout(f"Render exceeded {seconds:g}s")
+
+    previous = signal.signal(signal.SIGALRM, _expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _timed_job(kind, payload, timeout=None):
+    """Runs a render and returns (result, stage timings) for the dispatcher to record."""
+    with metrics.collect() as samples, _deadline(timeout):
+        result = _render_job(kind, payload)
+    return result, samples
+
+
+# -----------------------------
+# Dispatcher side
+# -----------------------------
+_pool = None
+_pool_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(RENDER_MAX_QUEUE)
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=RENDER_WORKERS,
+                mp_context=multiprocessing.get_context(RENDER_START_METHOD),
+                initializer=_warm_worker,
+            )
+        return _pool
+
+
+def start():
+    """Spin up and warm every worker now instead of on the first request."""
+    if RENDER_WORKERS <= 0:
+        return
+    pool = _get_pool()
+    pings = [pool.submit(_ping) for _ in range(RENDER_WORKERS)]
+    concurrent.futures.wait(pings)
+
+
+def shutdown():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def submit(kind, payload, timeout=None):
+    """
+    Queues a render and returns a Future resolving to the document bytes.
+    The worker abandons the render `timeout` (default RENDER_TIMEOUT) seconds after starting it.
+    """
+    timeout = RENDER_TIMEOUT if timeout is None else timeout
+    if not _slots.acquire(blocking=False):
+        raise RenderQueueFull(f"{RENDER_MAX_QUEUE} renders already in flight")
+
+    try:
+        from profiling import is_profiled  # not imported at module level: workers don't need Flask
+        if RENDER_WORKERS <= 0 or is_profiled():
+            # Inline mode (RENDER_WORKERS=0) for local debugging; profiled
+            # requests also render on their own thread so the samples see it
+            job = concurrent.futures.Future()
+            try:
+                job.set_result(_timed_job(kind, payload, timeout))
+            except Exception as e:
+                job.set_exception(e)
+        else:
+            job = _get_pool().submit(_timed_job, kind, payload, timeout)
+    except Exception:
+        _slots.release()
+        raise
+
+    job.add_done_callback(lambda _: _slots.release())
+
+    # Callers get the bare result; the worker's stage timings are recorded here
+    future = concurrent.futures.Future()
+    future.add_done_callback(lambda f: f.cancelled() and job.cancel())
+    job.add_done_callback(lambda j: _relay(j, future))
+    return future
+
+
+def _relay(job, future):
+    try:
+        if job.cancelled():
+            future.cancel()
+        elif job.exception() is not None:
+            future.set_exception(job.exception())
+        else:
+            result, samples = job.result()
+            metrics.record_stages(samples)
+            future.set_result(result)
+    except concurrent.futures.InvalidStateError:
+        pass  # caller cancelled the outer future first
+
+
+def wait(future, timeout=None):
+    """
+    Waits for a submitted render. Its worker raises RenderTimeout at the render's
+    own deadline; if no answer arrives within `timeout` + RENDER_TIMEOUT_GRACE
+    (still queued, or stuck in native code), only this render is given up on.
+    """
+    timeout = RENDER_TIMEOUT if timeout is None else timeout
+    try:
+        return future.result(timeout=timeout + RENDER_TIMEOUT_GRACE)
+    except concurrent.futures.TimeoutError:
+        future.cancel()  # drops the job if it never left the queue
+        raise RenderTimeout(f"Render exceeded {timeout:g}s")
+
+
+def render(kind, payload, timeout=None):
+    """
+    Renders `payload` as "pdf" or "docx" on the worker pool and returns the bytes.
+    kind="bundle" takes {"model", "formats", "thumbnailDpi"} and returns {format: bytes}.
+    """
+    return wait(submit(kind, payload, timeout), timeout)
@@ -0,0 +1,105 @@
+# backend/resume_model.py
+import copy
+
+from asset_store import InvalidAsset, asset_data_uri, asset_url, decode_base64_image, put_asset
+
+# ------------------------------------------------------------
+# Intermediate document model shared by every output format.
+# The request payload is normalized once (skills text cleaned, inline
+# base64 images moved into the asset store) and each renderer reads
+# the same model, so PDF, DOCX, HTML and thumbnail share that work.
+# ------------------------------------------------------------
+
+OUTPUT_FORMATS = ("pdf", "docx", "html", "thumbnail")
+
+MIMETYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "html": "text/html",
+    "thumbnail": "image/png",
+}
+
+EXTENSIONS = {"pdf": "pdf", "docx": "docx", "html": "html", "thumbnail": "png"}
+
+# Leading bytes of each rendered format; anything else is standalone HTML
+_SIGNATURES = (("pdf", b"%PDF-"), ("docx", b"PK\x03\x04"), ("thumbnail", b"\x89PNG\r\n\x1a\n"))
+
+_IMAGES = (
+    ("pamtenLogoAssetId", "pamtenLogoBase64"),
+    ("profilePicAssetId", "profilePicBase64"),
+)
+
+
+def output_format(body: bytes) -> str:
+    """Which of OUTPUT_FORMATS rendered `body`, from its leading bytes."""
+    return next((fmt for fmt, signature in _SIGNATURES if body.startswith(signature)), "html")
+
+
+def store_images(resume: dict) -> dict:
+    """Moves inline base64 images into the asset store and drops their preview data URIs, in place."""
+    resume.pop("pamtenLogoSrc", None)
+    resume.pop("profilePicSrc", None)
+
+    for asset_key, b64_key in _IMAGES:
+        b64 = resume.pop(b64_key, None)
+        if b64 and not resume.get(asset_key):
+            try:
+                resume[asset_key] = put_asset(decode_base64_image(b64))["assetId"]
+            except InvalidAsset as e:
+                print(f"Skipping invalid {b64_key}: {e}")
+    return resume
+
+
+def build_model(payload: dict) -> dict:
+    """Normalizes a resume payload into the model consumed by `render_formats`."""
+    from document_generator import clean_text
+
+    model = store_images(copy.deepcopy(payload) if isinstance(payload, dict) else {})
+
+    for skill in model.get("skills") or []:
+        if isinstance(skill, dict):
+            skill["skills_list"] = clean_text(skill.get("skills_list", ""))
+
+    model.setdefault("personal", {})
+    model.setdefault("styleOptions", {})
+    return model
+
+
+def _standalone_html(rendered_html, model):
+    """Swap asset: URLs (understood only by the PDF fetcher) for inline data URIs."""
+    for asset_key, _ in _IMAGES:
+        asset_id = model.get(asset_key)
+        uri = asset_data_uri(asset_id) if asset_id else None
+        if uri:
+            rendered_html = rendered_html.replace(asset_url(asset_id), uri)
+    return rendered_html
+
+
+def render_formats(model: dict, formats, thumbnail_dpi=None) -> dict:
+    """
+    Renders the requested subset of OUTPUT_FORMATS in one pass and returns {format: bytes}.
+    The template is rendered once for HTML + PDF, and the thumbnail is rasterized
+    from that same PDF.
+    """
+    from document_generator import html_to_pdf, render_html
+
+    formats = set(formats)
+    outputs = {}
+
+    if formats & {"html", "pdf", "thumbnail"}:
+        rendered_html = render_html(copy.deepcopy(model))
+        if "html" in formats:
+            outputs["html"] = _standalone_html(rendered_html, model).encode("utf-8")
+        if formats & {"pdf", "thumbnail"}:
+            pdf = html_to_pdf(rendered_html)
+            if "pdf" in formats:
+                outputs["pdf"] = pdf
+            if "thumbnail" in formats:
+                from thumbnails import render_thumbnail
+                outputs["thumbnail"] = render_thumbnail(pdf, thumbnail_dpi)
+
+    if "docx" in formats:
+        from docx_engine import generate_docx
+        outputs["docx"] = generate_docx(model)
+
+    return outputs
@@ -0,0 +1,310 @@
+# backend/resume_store.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import metrics
+
+# ------------------------------------------------------------
+# Server-side resume store. Parsed and edited resumes are saved
+# once under a resume id; every save or section update appends a
+# numbered version, and the generators / pitch endpoints take
+# { "resumeId", "version" } instead of the whole resume JSON.
+#
+# Versions are stored section by section: each top-level field
+# (personal, experience, skills, ...) is serialized on its own and
+# kept under its sha256, and a version is just its list of section
+# hashes. Updating one section writes one section body, and the
+# other sections are shared with the earlier versions. Inline
+# base64 images are moved to the asset store before saving.
+#
+# The database (RESUME_STORE_PATH) is shared by every worker;
+# writes take BEGIN IMMEDIATE so version numbers never collide.
+# Only the newest RESUME_STORE_KEEP_VERSIONS versions are kept.
+# ------------------------------------------------------------
+
+RESUME_STORE_PATH = os.getenv(
+    "RESUME_STORE_PATH",
+    os.path.join(os.path.dirname(__file__), "data", "resumes.sqlite3"),
+)
+RESUME_STORE_KEEP_VERSIONS = int(os.getenv("RESUME_STORE_KEEP_VERSIONS", "50"))
+# Assembled versions kept per process (versions never change once written)
+RESUME_STORE_CACHE_ENTRIES = int(os.getenv("RESUME_STORE_CACHE_ENTRIES", "256"))
+
+# Body keys that make a generator request a reference to a stored resume
+REFERENCE_KEYS = frozenset({"resumeId", "version"})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resume_versions (
+    resume_id  TEXT NOT NULL,
+    version    INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (resume_id, version)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS resume_version_sections (
+    resume_id TEXT NOT NULL,
+    version   INTEGER NOT NULL,
+    section   TEXT NOT NULL,
+    hash      TEXT NOT NULL,
+    PRIMARY KEY (resume_id, version, section)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS resume_version_sections_hash ON resume_version_sections (hash);
+CREATE TABLE IF NOT EXISTS resume_sections (
+    hash TEXT PRIMARY KEY,
+    body TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+_local = threading.local()
+_lock = threading.Lock()
+_documents = OrderedDict()  # (resume id, version) -> JSON text of the whole resume
+
+
+class ResumeNotFound(LookupError):
+    pass
+
+
+class VersionConflict(Exception):
+    """The resume changed since `base_version`; `latest` is its current version."""
+
+    def __init__(self, latest):
+        super().__init__(f"Resume is at version {latest}")
+        self.latest = latest
+
+
+def _connect():
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(RESUME_STORE_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(RESUME_STORE_PATH, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def _encode(value):
+    body = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest(), body
+
+
+def _prepare(sections):
+    """Section name -> (hash, body), with inline images moved to the asset store first."""
+    from resume_model import store_images
+
+    store_images(sections)
+    return {name: _encode(value) for name, value in sections.items()}
+
+
+def _latest(conn, resume_id):
+    row = conn.execute("SELECT MAX(version) FROM resume_versions WHERE resume_id = ?", (resume_id,)).fetchone()
+    return row[0]
+
+
+def _manifest(conn, resume_id, version):
+    return dict(conn.execute(
+        "SELECT section, hash FROM resume_version_sections WHERE resume_id = ? AND version = ?",
+        (resume_id, version),
+    ))
+
+
+def _write(conn, resume_id, manifest, bodies):
+    """Appends `manifest` ({section: hash}) as the next version and prunes old ones. Inside a transaction."""
+    version = (_latest(conn, resume_id) or 0) + 1
+    conn.executemany(
+        "INSERT OR IGNORE INTO resume_sections (hash, body) VALUES (?, ?)",
+        [(h, body) for h, body in bodies],
+    )
+    conn.execute(
+        "INSERT INTO resume_versions (resume_id, version, created_at) VALUES (?, ?, ?)",
+        (resume_id, version, time.time()),
+    )
+    conn.executemany(
+        "INSERT INTO resume_version_sections (resume_id, version, section, hash) VALUES (?, ?, ?, ?)",
+        [(resume_id, version, section, h) for section, h in manifest.items()],
+    )
+    if version > RESUME_STORE_KEEP_VERSIONS:
+        _drop(conn, resume_id, "version <= ?", (version - RESUME_STORE_KEEP_VERSIONS,))
+    return version
+
+
+def _drop(conn, resume_id, where="1", params=()):
+    """Deletes versions of a resume and the section bodies no other version uses."""
+    hashes = {h for (h,) in conn.execute(
+        f"SELECT DISTINCT hash FROM resume_version_sections WHERE resume_id = ? AND {where}",
+        (resume_id, *params),
+    )}
+    conn.execute(f"DELETE FROM resume_version_sections WHERE resume_id = ? AND {where}", (resume_id, *params))
+    removed = conn.execute(f"DELETE FROM resume_versions WHERE resume_id = ? AND {where}", (resume_id, *params)).rowcount
+    conn.executemany(
+        "DELETE FROM resume_sections WHERE hash = ? "
+        "AND NOT EXISTS (SELECT 1 FROM resume_version_sections WHERE hash = ?)",
+        [(h, h) for h in hashes],
+    )
+    return removed
+
+
+def _transaction(conn, write):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        result = write()
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return result
+
+
+def _check_base(conn, resume_id, base_version):
+    latest = _latest(conn, resume_id)
+    if latest is None:
+        raise ResumeNotFound(resume_id)
+    if base_version is not None and int(base_version) != latest:
+        raise VersionConflict(latest)
+    return latest
+
+
+def save(resume, resume_id=None, base_version=None):
+    """
+    Saves a whole resume: a new resume (new id) or, with `resume_id`, the next
+    version of an existing one. With `base_version`, raises VersionConflict unless
+    that is still the latest version. Returns {"resumeId", "version"}.
+    """
+    if not isinstance(resume, dict) or not resume:
+        raise ValueError("Missing or invalid resume data")
+    prepared = _prepare(dict(resume))
+    conn = _connect()
+
+    def write():
+        if resume_id is not None:
+            _check_base(conn, resume_id, base_version)
+        rid = resume_id or uuid.uuid4().hex
+        version = _write(conn, rid, {name: h for name, (h, _) in prepared.items()}, prepared.values())
+        return {"resumeId": rid, "version": version}
+
+    with metrics.time_stage("resume_store"):
+        return _transaction(conn, write)
+
+
+def update_sections(resume_id, sections, base_version=None):
+    """
+    Replaces the given top-level sections (a None value removes one) in a new version.
+    Sections not mentioned carry over unchanged; if nothing changes, no version is
+    added. Raises ResumeNotFound / VersionConflict. Returns {"resumeId", "version"}.
+    """
+    if not isinstance(sections, dict) or not sections:
+        raise ValueError("sections must be a non-empty object")
+    removed = {name for name, value in sections.items() if value is None}
+    prepared = _prepare({name: value for name, value in sections.items() if value is not None})
+    conn = _connect()
+
+    def write():
+        latest = _check_base(conn, resume_id, base_version)
+        current = _manifest(conn, resume_id, latest)
+        manifest = {name: h for name, h in current.items() if name not in removed}
+        manifest.update((name, h) for name, (h, _) in prepared.items())
+        if not manifest:
+            raise ValueError("A resume needs at least one section")
+        if manifest == current:
+            return {"resumeId": resume_id, "version": latest}
+        changed = [prepared[name] for name in prepared if current.get(name) != prepared[name][0]]
+        return {"resumeId": resume_id, "version": _write(conn, resume_id, manifest, changed)}
+
+    with metrics.time_stage("resume_store"):
+        return _transaction(conn, write)
+
+
+def get(resume_id, version=None):
+    """{"resumeId", "version", "createdAt", "resume"} for a version (default: latest), or None."""
+    conn = _connect()
+    with metrics.time_stage("resume_store"):
+        if version is None:
+            row = conn.execute(
+                "SELECT version, created_at FROM resume_versions WHERE resume_id = ? ORDER BY version DESC LIMIT 1",
+                (resume_id,),
+            ).fetchone()
+        else:
+            row = conn.execute(
+                "SELECT version, created_at FROM resume_versions WHERE resume_id = ? AND version = ?",
+                (resume_id, int(version)),
+            ).fetchone()
+        if row is None:
+            return None
+        version, created_at = row
+
+        key = (resume_id, version)
+        with _lock:
+            text = _documents.get(key)
+            if text is not None:
+                _documents.move_to_end(key)
+        if text is None:
+            # Section bodies are stored as JSON already: splice them instead of re-encoding
+            text = "{" + ",".join(
+                f"{json.dumps(section)}:{body}" for section, body in conn.execute(
+                    "SELECT s.section, b.body FROM resume_version_sections s "
+                    "JOIN resume_sections b ON b.hash = s.hash "
+                    "WHERE s.resume_id = ? AND s.version = ?",
+                    key,
+                )
+            ) + "}"
+            with _lock:
+                _documents[key] = text
+                while len(_documents) > RESUME_STORE_CACHE_ENTRIES:
+                    _documents.popitem(last=False)
+    return {"resumeId": resume_id, "version": version, "createdAt": created_at, "resume": json.loads(text)}
+
+
+def versions(resume_id):
+    """[{"version", "createdAt", "sections": [changed sections]}] newest first, or None for an unknown id."""
+    rows = _connect().execute(
+        "SELECT v.version, v.created_at, s.section, s.hash FROM resume_versions v "
+        "JOIN resume_version_sections s ON s.resume_id = v.resume_id AND s.version = v.version "
+        "WHERE v.resume_id = ? ORDER BY v.version",
+        (resume_id,),
+    ).fetchall()
+    if not rows:
+        return None
+    history, manifests, previous = {}, {}, {}
+    for version, created_at, section, h in rows:
+        history.setdefault(version, {"version": version, "createdAt": created_at})
+        manifests.setdefault(version, {})[section] = h
+    for version in sorted(manifests):
+        manifest = manifests[version]
+        history[version]["sections"] = sorted(
+            name for name in manifest.keys() | previous.keys() if manifest.get(name) != previous.get(name)
+        )
+        previous = manifest
+    return [history[v] for v in sorted(history, reverse=True)]
+
+
+def delete(resume_id):
+    """Deletes every version of a resume; True if it existed."""
+    conn = _connect()
+    removed = _transaction(conn, lambda: _drop(conn, resume_id))
+    with _lock:
+        for key in [key for key in _documents if key[0] == resume_id]:
+            del _documents[key]
+    return bool(removed)
+
+
+def resolve(payload):
+    """
+    The resume a generator / pitch request is about: for a body of just
+    { "resumeId", "version"? } the stored version (latest if omitted), otherwise
+    the payload itself. Raises ResumeNotFound, or ValueError for a bad version.
+    """
+    if not isinstance(payload, dict) or "resumeId" not in payload or not payload.keys() <= REFERENCE_KEYS:
+        return payload
+    version = payload.get("version")
+    if version is not None and (isinstance(version, bool) or not str(version).isdigit()):
+        raise ValueError("version must be a positive integer")
+    record = get(str(payload["resumeId"]), version)
+    if record is None:
+        raise ResumeNotFound(payload["resumeId"])
+    return record["resume"]
@@ -1,64 +1,241 @@
 # backend/routes.py
-from flask import Blueprint, request, jsonify, send_file, current_app
+from flask import Blueprint, Response, request, jsonify, send_file, current_app, abort, stream_with_context
 import io
 import time
 import traceback
 
-# Absolute imports so `python app.py` on Render works from the backend folder root
-from document_generator import generate_docx_from_data, generate_pdf_from_data
-from file_parser import parse_resume_file
-from gemini_utils import generate_elevator_pitch  # your Gemini helper
+# Absolute imports so `python app.py` on Render works from the backend folder root.
+# Modules that pull in weasyprint / python-docx / pypdf / genai are imported
+# inside the views that need them, keeping cold start (and /api/health) fast.
+import bulk_export
+import llm_requests
+import metrics
+import preview
+import profiling
+import render_cache
+import render_service
+import resume_model
+import resume_store
+import thumbnails
+import uploads
+from render_service import RenderQueueFull, RenderTimeout
+from asset_store import InvalidAsset, decode_base64_image, get_asset, put_asset
 
 # Create a Blueprint for API routes
 api_bp = Blueprint("api", __name__)
 
+def _reply(result):
+    """Flask response for a (status, body) pair from llm_requests."""
+    status, body = result
+    return jsonify(body), status
+
+
 # -----------------------------
 # Resume Parsing Endpoint
 # -----------------------------
 @api_bp.route("/parse-resume", methods=["POST"])
 def parse_resume_route():
-    if "file" not in request.files:
-        return jsonify({"error": "No file part in the request"}), 400
+    # Checked against Content-Length before the body is read (413 otherwise)
+    request.max_content_length = uploads.MAX_UPLOAD_BYTES
+    file = request.files.get("file")
+    error = llm_requests.check_upload(None if file is None else file.filename)
+    if error:
+        return _reply(error)
 
-    file = request.files["file"]
-    if file.filename == "":
-        return jsonify({"error": "No file selected"}), 400
+    kind, error = llm_requests.sniff_upload(file.stream)
+    if error:
+        return _reply(error)
 
     try:
-        result = parse_resume_file(file)
-        if isinstance(result, dict) and "error" in result:
-            return jsonify(result), 500
-        return jsonify(result), 200
+        from file_parser import parse_resume_file
+
+        thumbnail_id = llm_requests.start_thumbnail(kind, file.stream)
+        return _reply(llm_requests.parse_result(parse_resume_file(file, kind), thumbnail_id))
     except Exception:
         current_app.logger.error(
             "Unexpected error in /api/parse-resume:\n%s", traceback.format_exc()
         )
-        return jsonify({"error": "INTERNAL_PARSE_ERROR"}), 500
+        return _reply(llm_requests.PARSE_FAILED)
 
 
 # -----------------------------
-# DOCX Generation Endpoint
+# Document Generation Helpers
 # -----------------------------
-@api_bp.route("/generate-docx", methods=["POST"])
-def generate_docx_route():
+DOCX_MIMETYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+def _download_name(payload, ext):
+    # File name: prefer name from payload, fallback to "resume"
+    personal = payload.get("personal", {}) if isinstance(payload, dict) else {}
+    base = (personal.get("name") or "resume").strip() or "resume"
+    safe_base = "_".join(base.split())
+    return f"{safe_base}.{ext}"
+
+
+def _render_unavailable(e):
+    """Maps render-pool back-pressure errors to HTTP responses."""
+    if isinstance(e, RenderQueueFull):
+        current_app.logger.warning("Render queue full: %s", e)
+        return jsonify({"error": "RENDER_QUEUE_FULL"}), 503, {"Retry-After": "2"}
+    current_app.logger.warning("Render timed out: %s", e)
+    return jsonify({"error": "RENDER_TIMEOUT"}), 504
+
+
+def _resume_from(payload):
+    """
+    (resume, None), or (None, error response) when the body references a stored
+    resume ({ "resumeId", "version"? }) that can't be loaded.
+    """
+    try:
+        return resume_store.resolve(payload), None
+    except resume_store.ResumeNotFound:
+        return None, (jsonify({"error": "RESUME_NOT_FOUND"}), 404)
+    except ValueError as e:
+        return None, (jsonify({"error": str(e)}), 400)
+
+
+def _send_rendered(kind, payload, mimetype):
+    """
+    Serves a rendered document through the output cache.
+    The cache key is returned as a strong ETag; a matching If-None-Match
+    gets a 304 without rendering, a cache hit skips the render pool.
+    """
+    key = render_cache.cache_key(payload, kind)
+    if request.if_none_match.contains(key):
+        response = current_app.response_class(status=304)
+        response.set_etag(key)
+        return response
+
+    body = render_cache.get(key)
+    if body is None:
+        body = render_service.render(kind, payload)
+        render_cache.put(key, body)
+
+    response = send_file(
+        io.BytesIO(body),
+        as_attachment=True,
+        download_name=_download_name(payload, kind),
+        mimetype=mimetype,
+        etag=key,
+    )
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+# -----------------------------
+# Resume Store Endpoints
+# -----------------------------
+def _reindex_resume(resume_id):
+    """Re-indexes the latest stored version for matching (candidate id = resume id). Best effort."""
+    try:
+        import matching
+
+        record = resume_store.get(resume_id)
+        if record is not None:
+            matching.add_resume(record["resume"], resume_id)
+    except Exception:
+        current_app.logger.error(
+            "Indexing resume %s for matching failed:\n%s", resume_id, traceback.format_exc()
+        )
+
+
+@api_bp.route("/resumes", methods=["POST"])
+def create_resume_route():
+    """Saves a resume as version 1. Body: { "resumeData": {...} } or the raw object; returns 201 { resumeId, version }."""
     try:
-        # Force JSON so we fail fast with clear error when body isn't JSON
         payload = request.get_json(force=True, silent=False) or {}
-        # Our generator already returns a BytesIO ready for send_file
-        buf = generate_docx_from_data(payload)
+        try:
+            saved = resume_store.save(payload.get("resumeData") or payload.get("parsedData") or payload)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        _reindex_resume(saved["resumeId"])
+        response = jsonify(saved)
+        response.status_code = 201
+        response.headers["Location"] = f"{request.script_root}/api/resumes/{saved['resumeId']}"
+        return response
+    except Exception:
+        current_app.logger.error(
+            "Saving resume failed:\n%s", traceback.format_exc()
+        )
+        return jsonify({"error": "RESUME_SAVE_FAILED"}), 500
 
-        # File name: prefer name from payload, fallback with timestamp
-        personal = payload.get("personal", {}) if isinstance(payload, dict) else {}
-        base = (personal.get("name") or "resume").strip() or "resume"
-        safe_base = "_".join(base.split())
-        filename = f"{safe_base}.docx"
 
-        return send_file(
-            buf,
-            as_attachment=True,
-            download_name=filename,
-            mimetype="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+@api_bp.route("/resumes/<resume_id>", methods=["GET"])
+def get_resume_route(resume_id):
+    """A stored resume: { resumeId, version, createdAt, resume }. Latest version unless ?version= is given."""
+    record = resume_store.get(resume_id, request.args.get("version", type=int))
+    if record is None:
+        return jsonify({"error": "RESUME_NOT_FOUND"}), 404
+    return jsonify(record), 200
+
+
+@api_bp.route("/resumes/<resume_id>", methods=["PUT", "PATCH"])
+def update_resume_route(resume_id):
+    """
+    Saves the next version of a resume.
+    PUT body: { "resumeData": {...}, "baseVersion"? } replaces the whole resume.
+    PATCH body: { "sections": { "experience": [...], "projects": null }, "baseVersion"? }
+    replaces only the given top-level sections (null removes one).
+    With baseVersion, returns 409 { error, version } if the resume has moved on since.
+    """
+    try:
+        payload = request.get_json(force=True, silent=False) or {}
+        try:
+            if request.method == "PUT":
+                saved = resume_store.save(payload.get("resumeData"), resume_id, payload.get("baseVersion"))
+            else:
+                saved = resume_store.update_sections(resume_id, payload.get("sections"), payload.get("baseVersion"))
+        except resume_store.ResumeNotFound:
+            return jsonify({"error": "RESUME_NOT_FOUND"}), 404
+        except resume_store.VersionConflict as e:
+            return jsonify({"error": "VERSION_CONFLICT", "version": e.latest}), 409
+        except (ValueError, TypeError) as e:
+            return jsonify({"error": str(e)}), 400
+        _reindex_resume(resume_id)
+        return jsonify(saved), 200
+    except Exception:
+        current_app.logger.error(
+            "Updating resume failed:\n%s", traceback.format_exc()
         )
+        return jsonify({"error": "RESUME_SAVE_FAILED"}), 500
+
+
+@api_bp.route("/resumes/<resume_id>/versions", methods=["GET"])
+def resume_versions_route(resume_id):
+    """Version history, newest first: [{ version, createdAt, sections (changed in that version) }]."""
+    history = resume_store.versions(resume_id)
+    if history is None:
+        return jsonify({"error": "RESUME_NOT_FOUND"}), 404
+    return jsonify({"versions": history}), 200
+
+
+@api_bp.route("/resumes/<resume_id>", methods=["DELETE"])
+def delete_resume_route(resume_id):
+    """Deletes every version, and the candidate indexed under the same id."""
+    import dedup_index
+    import matching
+
+    if not resume_store.delete(resume_id):
+        return jsonify({"error": "RESUME_NOT_FOUND"}), 404
+    matching.remove_candidate(resume_id)
+    dedup_index.remove(resume_id)
+    return "", 204
+
+
+# -----------------------------
+# DOCX Generation Endpoint
+# -----------------------------
+@api_bp.route("/generate-docx", methods=["POST"])
+def generate_docx_route():
+    """Body: the resume JSON, or { "resumeId", "version"? } for a stored resume (latest version if omitted)."""
+    try:
+        # Force JSON so we fail fast with clear error when body isn't JSON
+        payload, error = _resume_from(request.get_json(force=True, silent=False) or {})
+        if error:
+            return error
+        return _send_rendered("docx", payload, DOCX_MIMETYPE)
+    except (RenderQueueFull, RenderTimeout) as e:
+        return _render_unavailable(e)
     except Exception:
         current_app.logger.error(
             "DOCX generation failed:\n%s", traceback.format_exc()
@@ -71,26 +248,560 @@ def generate_docx_route():
 # -----------------------------
 @api_bp.route("/generate-pdf", methods=["POST"])
 def generate_pdf_route():
+    """Body: the resume JSON, or { "resumeId", "version"? } for a stored resume (latest version if omitted)."""
+    try:
+        payload, error = _resume_from(request.get_json(force=True, silent=False) or {})
+        if error:
+            return error
+        return _send_rendered("pdf", payload, "application/pdf")
+    except (RenderQueueFull, RenderTimeout) as e:
+        return _render_unavailable(e)
+    except Exception:
+        current_app.logger.error(
+            "PDF generation failed:\n%s", traceback.format_exc()
+        )
+        return jsonify({"error": "PDF_GENERATION_FAILED"}), 500
+
+
+# -----------------------------
+# Unified Render Endpoint
+# -----------------------------
+@api_bp.route("/render", methods=["POST"])
+def render_route():
+    """
+    Renders any subset of pdf, docx, html and thumbnail from one normalized model.
+    Body: { "formats": [...], "resumeData": {...}, "thumbnailDpi": 48 } (resume fields may also be top-level);
+    thumbnailDpi is clamped to THUMBNAIL_MIN_DPI..THUMBNAIL_MAX_DPI.
+    Returns a download URL + ETag per format; outputs already in the cache are not re-rendered.
+    """
+    try:
+        payload = request.get_json(force=True, silent=False) or {}
+        formats = payload.get("formats") or ["pdf"]
+        if not isinstance(formats, list) or not set(formats) <= set(resume_model.OUTPUT_FORMATS):
+            return jsonify({"error": f"formats must be a subset of {list(resume_model.OUTPUT_FORMATS)}"}), 400
+
+        resume = payload.get("resumeData") or {
+            k: v for k, v in payload.items() if k not in ("formats", "thumbnailDpi")
+        }
+        try:
+            dpi = thumbnails.clamp_dpi(payload.get("thumbnailDpi"))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        model = resume_model.build_model(resume)
+
+        keys = {
+            fmt: render_cache.cache_key(model, f"{fmt}@{dpi}" if fmt == "thumbnail" else fmt)
+            for fmt in formats
+        }
+        bodies = {fmt: render_cache.get(key) for fmt, key in keys.items()}
+        missing = [fmt for fmt, body in bodies.items() if body is None]
+        if missing:
+            rendered = render_service.render(
+                "bundle", {"model": model, "formats": missing, "thumbnailDpi": dpi}
+            )
+            for fmt, body in rendered.items():
+                render_cache.put(keys[fmt], body)
+                bodies[fmt] = body
+
+        outputs = {
+            fmt: {
+                "etag": keys[fmt],
+                "url": f"/api/rendered/{keys[fmt]}.{resume_model.EXTENSIONS[fmt]}",
+                "mimeType": resume_model.MIMETYPES[fmt],
+                "size": len(bodies[fmt]),
+            }
+            for fmt in formats
+        }
+        return jsonify({"outputs": outputs, "rendered": missing}), 200
+    except (RenderQueueFull, RenderTimeout) as e:
+        return _render_unavailable(e)
+    except Exception:
+        current_app.logger.error(
+            "Unified render failed:\n%s", traceback.format_exc()
+        )
+        return jsonify({"error": "RENDER_FAILED"}), 500
+
+
+@api_bp.route("/rendered/<key>.<ext>", methods=["GET"])
+def rendered_output_route(key, ext):
+    """Serves an output produced by /api/render (or the generate endpoints) from the cache."""
+    fmt = next((f for f, e in resume_model.EXTENSIONS.items() if e == ext), None)
+    body = render_cache.get(key)
+    # The extension must match what is stored under the key (no PDF served as text/html)
+    if fmt is None or body is None or resume_model.output_format(body) != fmt:
+        return jsonify({"error": "Unknown or expired document; render it again"}), 404
+
+    download = request.args.get("download")
+    response = send_file(
+        io.BytesIO(body),
+        mimetype=resume_model.MIMETYPES[fmt],
+        as_attachment=bool(download),
+        download_name=download or None,
+        etag=key,
+        conditional=True,
+    )
+    # Keyed by content hash, so the bytes behind a URL never change
+    response.headers["Cache-Control"] = "private, max-age=31536000, immutable"
+    if fmt == "html":
+        # Resume HTML is user content: never let it run script on the API origin
+        response.headers["Content-Security-Policy"] = "default-src 'none'; img-src data:; style-src 'unsafe-inline'"
+    return response
+
+
+# -----------------------------
+# Live Preview Endpoint
+# -----------------------------
+@api_bp.route("/preview", methods=["POST"])
+def preview_route():
+    """
+    Renders resume_template.html section by section for the builder's live preview.
+    Body: { "resumeData": {...}, "sections": [...], "known": {section: hash} }
+    resumeData may be just the changed fields (the header needs personal and both
+    image ids together); without `sections`, every section reading a sent field is
+    rendered. Sections whose hash is in `known` come back as { hash, unchanged: true }.
+    """
     try:
         payload = request.get_json(force=True, silent=False) or {}
-        pdf_bytes = generate_pdf_from_data(payload)
+        resume = payload.get("resumeData")
+        if not isinstance(resume, dict):
+            return jsonify({"error": "Missing or invalid resumeData"}), 400
 
-        personal = payload.get("personal", {}) if isinstance(payload, dict) else {}
-        base = (personal.get("name") or "resume").strip() or "resume"
-        safe_base = "_".join(base.split())
-        filename = f"{safe_base}.pdf"
+        model = resume_model.build_model(resume)
+        sections = payload.get("sections") or preview.affected_sections(resume)
+        if not isinstance(sections, list) or not set(sections) <= set(preview.SECTIONS):
+            return jsonify({"error": f"sections must be a subset of {list(preview.SECTIONS)}"}), 400
+        known = payload.get("known") if isinstance(payload.get("known"), dict) else {}
 
-        return send_file(
-            io.BytesIO(pdf_bytes),
-            as_attachment=True,
-            download_name=filename,
-            mimetype="application/pdf",
+        fragments = preview.render_sections(
+            model, sections, known, asset_base=f"{request.host_url}api/assets/"
         )
+        return jsonify({"order": list(preview.SECTIONS), "fragments": fragments}), 200
     except Exception:
         current_app.logger.error(
-            "PDF generation failed:\n%s", traceback.format_exc()
+            "Preview render failed:\n%s", traceback.format_exc()
         )
-        return jsonify({"error": "PDF_GENERATION_FAILED"}), 500
+        return jsonify({"error": "PREVIEW_FAILED"}), 500
+
+
+# -----------------------------
+# Thumbnail Endpoints
+# -----------------------------
+@api_bp.route("/thumbnails", methods=["POST"])
+def create_thumbnail_route():
+    """
+    Rasterizes page one of a PDF at low DPI.
+    Accepts a multipart `file` (PDF) or a JSON resume payload, which is rendered to PDF
+    first. Optional `dpi` (query arg or JSON field), clamped to THUMBNAIL_MIN_DPI..THUMBNAIL_MAX_DPI.
+    Returns { thumbnailId, url }.
+    """
+    if request.mimetype == "multipart/form-data":
+        # Checked against Content-Length before the body is read (413 otherwise)
+        request.max_content_length = uploads.MAX_UPLOAD_BYTES
+    upload = request.files.get("file")
+
+    try:
+        dpi = request.args.get("dpi", type=int)
+        if upload is not None:
+            if uploads.sniff(upload.stream) != "pdf":
+                return jsonify({"error": "Uploaded file is not a PDF"}), 400
+            pdf = upload.stream.read()
+        else:
+            payload = request.get_json(force=True, silent=True)
+            if not isinstance(payload, dict) or not payload:
+                return jsonify({"error": "Provide a PDF file or resume data"}), 400
+            dpi = payload.pop("dpi", None) or dpi
+            try:
+                dpi = thumbnails.clamp_dpi(dpi)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            resume = payload.get("resumeData") or payload
+            key = render_cache.cache_key(resume, "pdf")
+            pdf = render_cache.get(key)
+            if pdf is None:
+                pdf = render_service.render("pdf", resume)
+                render_cache.put(key, pdf)
+
+        thumbnail_id = thumbnails.thumbnail_for_pdf(pdf, dpi)
+        return jsonify({"thumbnailId": thumbnail_id, "url": f"/api/thumbnails/{thumbnail_id}.png"}), 201
+    except (RenderQueueFull, RenderTimeout) as e:
+        return _render_unavailable(e)
+    except Exception:
+        current_app.logger.error(
+            "Thumbnail generation failed:\n%s", traceback.format_exc()
+        )
+        return jsonify({"error": "THUMBNAIL_FAILED"}), 500
+
+
+@api_bp.route("/thumbnails/<thumbnail_id>.png", methods=["GET"])
+def get_thumbnail_route(thumbnail_id):
+    body = thumbnails.get_thumbnail(thumbnail_id)
+    if body is None:
+        return jsonify({"error": "Unknown or expired thumbnail"}), 404
+
+    response = send_file(
+        io.BytesIO(body),
+        mimetype="image/png",
+        etag=thumbnail_id,
+        conditional=True,
+    )
+    # Keyed by the PDF's content hash, so the image behind an id never changes
+    response.headers["Cache-Control"] = "private, max-age=31536000, immutable"
+    return response
+
+
+# -----------------------------
+# Metrics Endpoint
+# -----------------------------
+@api_bp.route("/metrics", methods=["GET"])
+def metrics_route():
+    """Per-stage latency histograms and counters in Prometheus text format."""
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+# -----------------------------
+# Job Search Endpoints
+# -----------------------------
+@api_bp.route("/jobs", methods=["GET"])
+def search_jobs_route():
+    """
+    BM25 search over postings.
+    Query: ?q=python+aws&location=Remote&employmentType=Full-time&limit=20&cursor=...
+    (facet params may repeat). Returns { results, total, facets, nextCursor }.
+    """
+    import job_search
+
+    try:
+        filters = {facet: request.args.getlist(facet) for facet in job_search.FACETS if request.args.getlist(facet)}
+        try:
+            result = job_search.search(
+                request.args.get("q", ""),
+                filters,
+                limit=request.args.get("limit", 20, type=int),
+                cursor=request.args.get("cursor"),
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify(result), 200
+    except Exception:
+        current_app.logger.error(
+            "Job search failed:\n%s", traceback.format_exc()
+        )
+        return jsonify({"error": "JOB_SEARCH_FAILED"}), 500
+
+
+@api_bp.route("/jobs", methods=["POST"])
+def put_jobs_route():
+    """Creates or replaces postings. Body: one job or { "jobs": [...] }; returns 201 { jobs }."""
+    import job_search
+
+    try:
+        payload = request.get_json(force=True, silent=False) or {}
+        jobs = payload.get("jobs") if isinstance(payload.get("jobs"), list) else [payload]
+        try:
+            stored = job_search.put_jobs(jobs)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify({"jobs": stored}), 201
+    except Exception:
+        current_app.logger.error(
+            "Saving jobs failed:\n%s", traceback.format_exc()
+        )
+        return jsonify({"error": "JOB_SAVE_FAILED"}), 500
+
+
+@api_bp.route("/jobs/<job_id>", methods=["GET"])
+def get_job_route(job_id):
+    import job_search
+
+    job = job_search.get_job(job_id)
+    if job is None:
+        return jsonify({"error": "JOB_NOT_FOUND"}), 404
+    return jsonify(job), 200
+
+
+@api_bp.route("/jobs/<job_id>", methods=["DELETE"])
+def delete_job_route(job_id):
+    import job_search
+
+    if not job_search.delete_job(job_id):
+        return jsonify({"error": "JOB_NOT_FOUND"}), 404
+    return "", 204
+
+
+# -----------------------------
+# Skill Normalization Endpoints
+# -----------------------------
+@api_bp.route("/skills", methods=["GET"])
+def skills_dictionary_route():
+    """The canonical skill dictionary: { skills: [{ id, name, category }] }."""
+    import skill_normalizer
+
+    return jsonify({"skills": list(skill_normalizer.automaton().skills.values())}), 200
+
+
+@api_bp.route("/skills/normalize", methods=["POST"])
+def normalize_skills_route():
+    """
+    Body: { "skillsList": "JS, React.js, Amazon Web Services" } (or a list of strings).
+    Returns { skills: [{ id, name, category }], unknown: [...] }.
+    """
+    import skill_normalizer
+
+    payload = request.get_json(force=True, silent=True) or {}
+    skills_list = payload.get("skillsList")
+    if isinstance(skills_list, list):
+        skills_list = "\n".join(str(s) for s in skills_list)
+    if not isinstance(skills_list, str):
+        return jsonify({"error": "skillsList must be a string or a list of strings"}), 400
+    ids, unknown = skill_normalizer.normalize_list(skills_list)
+    return jsonify({"skills": [skill_normalizer.skill(sid) for sid in ids], "unknown": list(unknown)}), 200
+
+
+# -----------------------------
+# Candidate Matching Endpoints
+# -----------------------------
+@api_bp.route("/candidates", methods=["POST"])
+def add_candidate_route():
+    """Indexes an edited resume for matching. Body: { "resumeData": {...}, "candidateId"? }."""
+    import matching
+
+    payload = request.get_json(force=True, silent=True) or {}
+    resume_data = payload.get("resumeData") or payload.get("parsedData")
+    if not isinstance(resume_data, dict) or not resume_data:
+        return jsonify({"error": "Missing or invalid resume data"}), 400
+    try:
+        cid = matching.add_resume(resume_data, payload.get("candidateId"))
+        return jsonify({"candidateId": cid}), 201
+    except Exception:
+        current_app.logger.error(
+            "Indexing candidate failed:\n%s", traceback.format_exc()
+        )
+        return jsonify({"error": "CANDIDATE_INDEX_FAILED"}), 500
+
+
+@api_bp.route("/candidates/<candidate_id>", methods=["DELETE"])
+def remove_candidate_route(candidate_id):
+    import dedup_index
+    import matching
+
+    deduped = dedup_index.remove(candidate_id)
+    if not matching.remove_candidate(candidate_id) and not deduped:
+        return jsonify({"error": "CANDIDATE_NOT_FOUND"}), 404
+    return "", 204
+
+
+@api_bp.route("/candidates/<candidate_id>/duplicates", methods=["GET"])
+def candidate_duplicates_route(candidate_id):
+    """Earlier or later uploads that look like the same candidate (similar text, same email / phone)."""
+    import dedup_index
+
+    duplicates = dedup_index.duplicates_of(candidate_id)
+    if duplicates is None:
+        return jsonify({"error": "CANDIDATE_NOT_FOUND"}), 404
+    return jsonify({"duplicates": duplicates}), 200
+
+
+@api_bp.route("/matches", methods=["POST"])
+def matches_route():
+    """
+    Ranks candidates against jobs in one pass.
+    Body (all optional): { "jobIds": [...], "candidateIds": [...], "k": 10 }
+    Returns { candidatesByJob: {jobId: [...]}, jobsByCandidate: {candidateId: [...]} }.
+    """
+    import matching
+
+    payload = request.get_json(force=True, silent=True) or {}
+    try:
+        result = matching.match(payload.get("jobIds"), payload.get("candidateIds"), payload.get("k", 10))
+    except (ValueError, TypeError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception:
+        current_app.logger.error(
+            "Matching failed:\n%s", traceback.format_exc()
+        )
+        return jsonify({"error": "MATCHING_FAILED"}), 500
+    return jsonify(result), 200
+
+
+@api_bp.route("/jobs/<job_id>/candidates", methods=["GET"])
+def job_candidates_route(job_id):
+    """Top ?k= candidates for a posting."""
+    import matching
+
+    try:
+        return jsonify({"candidates": matching.top_candidates(job_id, request.args.get("k", 10, type=int))}), 200
+    except ValueError:
+        return jsonify({"error": "JOB_NOT_FOUND"}), 404
+
+
+@api_bp.route("/candidates/<candidate_id>/jobs", methods=["GET"])
+def candidate_jobs_route(candidate_id):
+    """Top ?k= postings for a candidate."""
+    import matching
+
+    try:
+        return jsonify({"jobs": matching.top_jobs(candidate_id, request.args.get("k", 10, type=int))}), 200
+    except ValueError:
+        return jsonify({"error": "CANDIDATE_NOT_FOUND"}), 404
+
+
+# -----------------------------
+# Interview Scheduling Endpoint
+# -----------------------------
+@api_bp.route("/interviews/slots", methods=["POST"])
+def interview_slots_route():
+    """
+    Common free interview slots for a panel, from Google Calendar free/busy.
+    Body: { "participants": ["a@x.com" | {"email", "timeZone"}], "timeMin", "timeMax",
+            "durationMinutes": 60, "timeZone": "America/New_York",
+            "workingHours": {"start": "09:00", "end": "17:00"}, "workingDays": [0, 1, 2, 3, 4],
+            "stepMinutes": 30, "bufferMinutes": 0, "limit": 5 }
+    """
+    import scheduling
+
+    try:
+        payload = request.get_json(force=True, silent=False) or {}
+        participants = payload.get("participants")
+        if not isinstance(participants, list) or not payload.get("timeMin") or not payload.get("timeMax"):
+            return jsonify({"error": "participants, timeMin and timeMax are required"}), 400
+        hours = payload.get("workingHours") or {}
+        if not isinstance(hours, dict):
+            return jsonify({"error": "workingHours must be { \"start\": \"HH:MM\", \"end\": \"HH:MM\" }"}), 400
+        try:
+            result = scheduling.find_slots(
+                participants,
+                payload["timeMin"],
+                payload["timeMax"],
+                duration_minutes=int(payload.get("durationMinutes", 60)),
+                time_zone=payload.get("timeZone") or scheduling.DEFAULT_TIME_ZONE,
+                working_hours=(hours.get("start", scheduling.DEFAULT_WORKING_HOURS[0]),
+                               hours.get("end", scheduling.DEFAULT_WORKING_HOURS[1])),
+                working_days=payload.get("workingDays") or scheduling.DEFAULT_WORKING_DAYS,
+                step_minutes=int(payload.get("stepMinutes", 30)),
+                buffer_minutes=int(payload.get("bufferMinutes", 0)),
+                limit=min(int(payload.get("limit", 5)), 100),
+            )
+        except (ValueError, TypeError) as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify(result), 200
+    except Exception:
+        current_app.logger.error(
+            "Interview slot search failed:\n%s", traceback.format_exc()
+        )
+        return jsonify({"error": "SLOT_SEARCH_FAILED"}), 502
+
+
+@api_bp.route("/interviews/events", methods=["POST"])
+def enqueue_interview_events_route():
+    """
+    Queues interview events for creation in Google Calendar and returns 202 at once.
+    Body: one event or { "events": [...] }, each
+          { "summary", "description", "startTime", "endTime", "attendees": [...],
+            "timeZone"?, "idempotencyKey"? }
+    Poll GET /api/interviews/events/<jobId> for the outcome. Nothing is queued
+    unless every event is valid. Resending an event with the same idempotencyKey
+    returns the existing job; reusing a key for a different event is a 409.
+    """
+    import calendar_queue
+
+    try:
+        payload = request.get_json(force=True, silent=False) or {}
+        items = payload.get("events") if isinstance(payload.get("events"), list) else [payload]
+        if not items or not all(isinstance(item, dict) for item in items):
+            return jsonify({"error": "Missing or invalid events"}), 400
+
+        events = [
+            ({
+                "summary": item.get("summary"),
+                "description": item.get("description", ""),
+                "start_time": item.get("startTime"),
+                "end_time": item.get("endTime"),
+                "attendees": item.get("attendees", []),
+                "time_zone": item.get("timeZone") or "America/New_York",
+            }, item.get("idempotencyKey"))
+            for item in items
+        ]
+        # All or nothing: a bad event must not leave the ones before it queued (and invited)
+        for index, (event, _) in enumerate(events):
+            try:
+                calendar_queue.validate(event)
+            except ValueError as e:
+                return jsonify({"error": f"events[{index}]: {e}"}), 400
+        try:
+            jobs = calendar_queue.enqueue_many(events)
+        except calendar_queue.IdempotencyConflict as e:
+            return jsonify({"error": "IDEMPOTENCY_KEY_REUSED", "jobId": e.job_id}), 409
+
+        response = jsonify({"jobs": jobs})
+        response.status_code = 202
+        if len(jobs) == 1:
+            response.headers["Location"] = f"{request.script_root}/api/interviews/events/{jobs[0]['jobId']}"
+        return response
+    except Exception:
+        current_app.logger.error(
+            "Queueing interview events failed:\n%s", traceback.format_exc()
+        )
+        return jsonify({"error": "EVENT_QUEUE_FAILED"}), 500
+
+
+@api_bp.route("/interviews/events/<job_id>", methods=["GET"])
+def interview_event_status_route(job_id):
+    """Status of a queued event: queued | running | done (with eventId, htmlLink) | failed."""
+    import calendar_queue
+
+    job = calendar_queue.get_job(job_id)
+    if job is None:
+        return jsonify({"error": "JOB_NOT_FOUND"}), 404
+    return jsonify(job), 200
+
+
+# -----------------------------
+# Profiles Endpoint
+# -----------------------------
+@api_bp.route("/profiles/<profile_id>", methods=["GET"])
+def profile_route(profile_id):
+    """Collapsed stacks for a profiled request (id from its X-Profile-Id header)."""
+    if not profiling.authorized(request):
+        return jsonify({"error": "FORBIDDEN"}), 403
+    body = profiling.load(profile_id)
+    if body is None:
+        return jsonify({"error": "PROFILE_NOT_FOUND"}), 404
+    return Response(body, mimetype="text/plain; charset=utf-8")
+
+
+# -----------------------------
+# Bulk Export Endpoint
+# -----------------------------
+@api_bp.route("/export-bulk", methods=["POST"])
+def export_bulk_route():
+    """
+    Streams a zip of rendered resumes.
+    Body: { "format": "pdf" | "docx", "resumes": [<resume payload> | {"etag": "<ETag from a generate call>"}] }
+    Each resume may override "format" (also "pdf" | "docx").
+    Entries are added in completion order; manifest.json maps request indexes to file names
+    and MIME types. An etag entry keeps the format it was cached in, whatever "format" says.
+    """
+    payload = request.get_json(force=True, silent=True) or {}
+    fmt = payload.get("format", "pdf") if isinstance(payload, dict) else None
+    items = payload.get("resumes") if isinstance(payload, dict) else None
+
+    if fmt not in bulk_export.FORMATS:
+        return jsonify({"error": "Unsupported format"}), 400
+    if not isinstance(items, list) or not items or not all(isinstance(i, dict) for i in items):
+        return jsonify({"error": "Missing or invalid resumes list"}), 400
+    if any(item.get("format", fmt) not in bulk_export.FORMATS for item in items):
+        return jsonify({"error": "Unsupported format"}), 400
+    if len(items) > bulk_export.BULK_EXPORT_MAX_ITEMS:
+        return jsonify({"error": f"At most {bulk_export.BULK_EXPORT_MAX_ITEMS} resumes per export"}), 413
+    for item in items:
+        if isinstance(item.get("etag"), str):
+            item["etag"] = item["etag"].strip('"')
+
+    return Response(
+        stream_with_context(bulk_export.stream_zip(items, fmt)),
+        mimetype="application/zip",
+        headers={"Content-Disposition": "attachment; filename=resumes.zip"},
+    )
 
 
 # -----------------------------
@@ -99,20 +810,62 @@ def generate_pdf_route():
 @api_bp.route("/generate-elevator-pitch", methods=["POST"])
 def generate_elevator_pitch_route():
     try:
-        payload = request.get_json(force=True, silent=False) or {}
+        resume_data, error = llm_requests.pitch_input(request.get_json(force=True, silent=True) or {})
+        if error:
+            return _reply(error)
 
-        # Accept { "resumeData": ... }, { "parsedData": ... } or the raw object
-        resume_data = payload.get("resumeData") or payload.get("parsedData") or payload
+        from gemini_utils import generate_elevator_pitch  # your Gemini helper
+        return _reply(llm_requests.pitch_result(generate_elevator_pitch(resume_data)))
+    except Exception:
+        current_app.logger.error(
+            "Elevator pitch generation failed:\n%s", traceback.format_exc()
+        )
+        return _reply(llm_requests.PITCH_FAILED)
 
-        if not isinstance(resume_data, dict) or not resume_data:
-            return jsonify({"error": "Missing or invalid resume data"}), 400
 
-        pitch = generate_elevator_pitch(resume_data)
-        pitch_text = pitch if isinstance(pitch, str) else ""
+# -----------------------------
+# Image Asset Endpoints
+# -----------------------------
+@api_bp.route("/assets", methods=["POST"])
+def upload_asset_route():
+    """
+    Stores a logo / profile picture by content hash.
+    Accepts a multipart `file` or JSON { "base64": "<data URI or base64>" }.
+    The returned assetId can be sent to the generators as
+    `pamtenLogoAssetId` / `profilePicAssetId` instead of inline base64.
+    """
+    try:
+        if "file" in request.files:
+            raw = request.files["file"].read()
+        else:
+            payload = request.get_json(force=True, silent=True) or {}
+            b64 = payload.get("base64") if isinstance(payload, dict) else None
+            if not b64:
+                return jsonify({"error": "No image provided"}), 400
+            raw = decode_base64_image(b64)
 
-        return jsonify({"elevatorPitch": pitch_text}), 200
+        return jsonify(put_asset(raw)), 201
+    except InvalidAsset as e:
+        return jsonify({"error": str(e)}), 400
     except Exception:
         current_app.logger.error(
-            "Elevator pitch generation failed:\n%s", traceback.format_exc()
+            "Asset upload failed:\n%s", traceback.format_exc()
         )
-        return jsonify({"error": "ELEVATOR_PITCH_FAILED"}), 500
+        return jsonify({"error": "ASSET_UPLOAD_FAILED"}), 500
+
+
+@api_bp.route("/assets/<asset_id>", methods=["GET"])
+def get_asset_route(asset_id):
+    record = get_asset(asset_id)
+    if not record:
+        abort(404)
+
+    response = send_file(
+        io.BytesIO(record["bytes"]),
+        mimetype=record["mime"],
+        etag=asset_id,
+        conditional=True,
+    )
+    # Content-addressed: the bytes behind an id never change
+    response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
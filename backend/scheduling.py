@@ -0,0 +1,272 @@
+# backend/scheduling.py
+import datetime
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import metrics
+
+# ------------------------------------------------------------
+# Interview slot search over Google Calendar free/busy data.
+# Busy blocks for every participant come from freebusy.query (50
+# calendars per query, several queries sent as one batch). They are
+# merged with out-of-hours blocks for each participant's time zone
+# in a single sorted sweep, and the gaps left over are cut into
+# candidate slots. Free/busy answers are cached for a short TTL so
+# a recruiter paging through options doesn't re-query Calendar.
+# ------------------------------------------------------------
+
+FREEBUSY_CACHE_TTL = float(os.getenv("FREEBUSY_CACHE_TTL", "60"))
+FREEBUSY_CACHE_MAX_ENTRIES = int(os.getenv("FREEBUSY_CACHE_MAX_ENTRIES", "256"))
+# freebusy.query accepts at most 50 calendars per call
+FREEBUSY_MAX_CALENDARS = 50
+# Longest search window accepted (free/busy cost grows with it)
+MAX_WINDOW_DAYS = int(os.getenv("SCHEDULING_MAX_WINDOW_DAYS", "62"))
+
+DEFAULT_TIME_ZONE = "America/New_York"
+DEFAULT_WORKING_HOURS = ("09:00", "17:00")
+DEFAULT_WORKING_DAYS = (0, 1, 2, 3, 4)  # Monday..Friday
+
+_HH_MM = re.compile(r"([01]\d|2[0-3]):[0-5]\d")
+
+
+class _TTLCache:
+    """Small thread-safe cache whose entries expire `ttl` seconds after insertion."""
+
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._items = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            if item[0] < time.monotonic():
+                del self._items[key]
+                return None
+            return item[1]
+
+    def put(self, key, value):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+
+_freebusy_cache = _TTLCache(FREEBUSY_CACHE_TTL, FREEBUSY_CACHE_MAX_ENTRIES)
+
+
+def _rfc3339(ts):
+    return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _parse_time(value, tz):
+    """ISO string (or datetime) -> epoch seconds; naive values are read in `tz`."""
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=tz)
+    return value.timestamp()
+
+
+def _zone(name):
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown time zone: {name}") from None
+
+
+def _clock(value):
+    if not isinstance(value, str) or not _HH_MM.fullmatch(value):
+        raise ValueError(f"workingHours must be HH:MM times, got {value!r}")
+    return datetime.time.fromisoformat(value)
+
+
+def _days(value):
+    if not isinstance(value, (list, tuple)) or not value or not all(
+        isinstance(day, int) and not isinstance(day, bool) and 0 <= day <= 6 for day in value
+    ):
+        raise ValueError("workingDays must be a non-empty list of weekday numbers 0-6 (Monday = 0)")
+    return tuple(value)
+
+
+def query_freebusy(calendar_ids, time_min, time_max):
+    """
+    Busy intervals per calendar between two epoch times.
+    Returns ({calendar_id: [(start, end), ...]}, {calendar_id: [error reasons]}).
+    A calendar whose free/busy is unknown (it reported errors or is missing
+    from the answer) appears only in the errors, never as free.
+    """
+    calendar_ids = sorted(set(calendar_ids))
+    key = (tuple(calendar_ids), time_min, time_max)
+    cached = _freebusy_cache.get(key)
+    if cached is not None:
+        return cached
+
+    import google_calendar_utils as gcal
+
+    service = gcal.get_google_calendar_service()
+    queries = [
+        service.freebusy().query(body={
+            "timeMin": _rfc3339(time_min),
+            "timeMax": _rfc3339(time_max),
+            "items": [{"id": cid} for cid in calendar_ids[i:i + FREEBUSY_MAX_CALENDARS]],
+        })
+        for i in range(0, len(calendar_ids), FREEBUSY_MAX_CALENDARS)
+    ]
+
+    with metrics.time_stage("freebusy_query"):
+        if len(queries) == 1:
+            responses = [queries[0].execute()]
+        else:
+            responses = []
+            for response, exception in gcal.run_batch(queries):
+                if exception is not None:
+                    raise exception
+                responses.append(response)
+
+    busy, errors = {}, {}
+    for response in responses:
+        for cid, calendar in (response.get("calendars") or {}).items():
+            if calendar.get("errors"):
+                errors[cid] = [e.get("reason", "unknown") for e in calendar["errors"]]
+                continue
+            busy[cid] = [(_parse_time(b["start"], datetime.timezone.utc), _parse_time(b["end"], datetime.timezone.utc))
+                         for b in calendar.get("busy") or []]
+    for cid in calendar_ids:
+        if cid not in busy and cid not in errors:
+            errors[cid] = ["missing"]
+
+    result = (busy, errors)
+    _freebusy_cache.put(key, result)
+    return result
+
+
+def off_hours(time_min, time_max, tz, working_hours=DEFAULT_WORKING_HOURS, working_days=DEFAULT_WORKING_DAYS):
+    """Epoch intervals outside working hours (and on non-working days) in `tz`."""
+    start_clock, end_clock = _clock(working_hours[0]), _clock(working_hours[1])
+    day = datetime.datetime.fromtimestamp(time_min, tz).date() - datetime.timedelta(days=1)
+    last = datetime.datetime.fromtimestamp(time_max, tz).date() + datetime.timedelta(days=1)
+    blocks = []
+    while day <= last:
+        midnight = datetime.datetime.combine(day, datetime.time(0), tz).timestamp()
+        next_midnight = datetime.datetime.combine(day + datetime.timedelta(days=1), datetime.time(0), tz).timestamp()
+        if day.weekday() not in working_days:
+            blocks.append((midnight, next_midnight))
+        else:
+            blocks.append((midnight, datetime.datetime.combine(day, start_clock, tz).timestamp()))
+            blocks.append((datetime.datetime.combine(day, end_clock, tz).timestamp(), next_midnight))
+        day += datetime.timedelta(days=1)
+    return blocks
+
+
+def merge_intervals(intervals):
+    """Sweep over intervals sorted by start; overlapping or touching ones are merged."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def free_slots(busy, time_min, time_max, duration, step, limit, anchor=0.0):
+    """
+    First `limit` slots of `duration` seconds outside `busy` (merged, sorted).
+    Slots start on `step` boundaries counted from `anchor` (e.g. local midnight).
+    """
+    slots = []
+    cursor = time_min
+    for start, end in busy + [[time_max, time_max]]:
+        gap_end = min(start, time_max)
+        t = cursor + (anchor - cursor) % step
+        while t + duration <= gap_end:
+            slots.append((t, t + duration))
+            if len(slots) >= limit:
+                return slots
+            t += step
+        cursor = max(cursor, end)
+        if cursor >= time_max:
+            break
+    return slots
+
+
+def find_slots(participants, time_min, time_max, duration_minutes=60, time_zone=DEFAULT_TIME_ZONE,
+               working_hours=DEFAULT_WORKING_HOURS, working_days=DEFAULT_WORKING_DAYS,
+               step_minutes=30, buffer_minutes=0, limit=5):
+    """
+    Common free slots for all participants.
+
+    Args:
+        participants: emails, or {"email", "timeZone"?} dicts; a participant's
+            working hours apply in their own time zone (default `time_zone`).
+        time_min / time_max: ISO strings or datetimes; naive values are in `time_zone`.
+        duration_minutes: interview length.
+        working_hours: ("HH:MM", "HH:MM") local working day.
+        working_days: weekday numbers (Monday = 0) people work.
+        step_minutes: slot start granularity.
+        buffer_minutes: gap kept around every busy block.
+        limit: how many slots to return (earliest first).
+
+    Returns:
+        {"slots": [{"start", "end"}], "errors": {calendar_id: [reasons]}} with
+        times in `time_zone`. If any participant's free/busy is unknown there
+        are no slots, only the errors, since a slot can't be promised free for them.
+    """
+    tz = _zone(time_zone)
+    start, end = _parse_time(time_min, tz), _parse_time(time_max, tz)
+    if end <= start:
+        raise ValueError("timeMax must be after timeMin")
+    if end - start > MAX_WINDOW_DAYS * 86400:
+        raise ValueError(f"Search window is limited to {MAX_WINDOW_DAYS} days")
+    if duration_minutes <= 0 or step_minutes <= 0 or limit <= 0:
+        raise ValueError("durationMinutes, stepMinutes and limit must be positive")
+    if _clock(working_hours[0]) >= _clock(working_hours[1]):
+        raise ValueError("workingHours start must be before end")
+    working_days = _days(working_days)
+
+    zones = {}
+    for p in participants:
+        email, zone = (p, time_zone) if isinstance(p, str) else (p.get("email"), p.get("timeZone") or time_zone)
+        if not email:
+            raise ValueError("Every participant needs an email")
+        zones[email] = _zone(zone)
+    if not zones:
+        raise ValueError("At least one participant is required")
+
+    busy, errors = query_freebusy(list(zones), start, end)
+    if errors:
+        return {"slots": [], "errors": errors}
+
+    with metrics.time_stage("slot_search"):
+        # The buffer widens meetings only; a slot may still start right at the working day's start
+        buffer = buffer_minutes * 60
+        intervals = [(s - buffer, e + buffer) for blocks in busy.values() for s, e in blocks]
+        for zone in set(zones.values()):
+            intervals.extend(off_hours(start, end, zone, working_hours, working_days))
+        merged = merge_intervals(intervals)
+        local_midnight = datetime.datetime.combine(
+            datetime.datetime.fromtimestamp(start, tz).date(), datetime.time(0), tz
+        ).timestamp()
+        slots = free_slots(merged, start, end, duration_minutes * 60, step_minutes * 60, limit,
+                           anchor=local_midnight)
+
+    return {
+        "slots": [
+            {"start": datetime.datetime.fromtimestamp(s, tz).isoformat(),
+             "end": datetime.datetime.fromtimestamp(e, tz).isoformat()}
+            for s, e in slots
+        ],
+        "errors": errors,
+    }
@@ -0,0 +1,186 @@
+# backend/skill_normalizer.py
+import functools
+import json
+import os
+import re
+import threading
+from collections import deque
+
+import metrics
+
+# ------------------------------------------------------------
+# Skill normalization. A canonical dictionary (assets/skills.json:
+# id, name, category, aliases, listOnly) is compiled once per process
+# into an Aho-Corasick automaton over word tokens, so a skills_list
+# like "JS, React.js, reactjs, Amazon Web Services" maps to
+# ["javascript", "react", "aws"] in one left-to-right scan, however
+# many aliases the dictionary has.
+#
+# Matching works on tokens, not characters, so "java" never fires
+# inside "javascript" and "go" never inside "google". Overlapping
+# matches resolve leftmost-longest ("spring boot" beats "spring").
+# Aliases under "listOnly" ("go", "r", "c", "excel", ...) are too
+# ambiguous for prose and only count inside skill lists, not in
+# requirements or descriptions.
+# ------------------------------------------------------------
+
+SKILLS_DICTIONARY_PATH = os.getenv(
+    "SKILLS_DICTIONARY_PATH",
+    os.path.join(os.path.dirname(__file__), "assets", "skills.json"),
+)
+# Distinct skills_list strings remembered per process (bulk imports repeat them a lot)
+SKILL_CACHE_ENTRIES = int(os.getenv("SKILL_CACHE_ENTRIES", "8192"))
+
+# Words keep inner dots / + / # ("node.js", "c++", "c#", "asp.net"); ".net" keeps its leading dot
+_TOKEN = re.compile(r"\.?[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+# Entries in a skills_list
+_ITEM_SPLIT = re.compile(r"[,;\n|•·]+")
+
+
+def tokenize(text):
+    return _TOKEN.findall(str(text or "").lower())
+
+
+class SkillAutomaton:
+    """Aho-Corasick automaton whose alphabet is word tokens."""
+
+    def __init__(self, skills):
+        self.skills = {}            # id -> {"id", "name", "category"}
+        self.goto = [{}]            # state -> {token: state}
+        self.fail = [0]
+        self.out = [()]             # state -> ((length in tokens, id, list only), ...)
+        patterns = {}               # token tuple -> (id, list only)
+        for skill in skills:
+            sid = skill["id"]
+            self.skills[sid] = {"id": sid, "name": skill["name"], "category": skill.get("category", "")}
+            list_only = {tuple(tokenize(a)) for a in skill.get("listOnly") or ()}
+            for alias in [skill["name"], sid, *(skill.get("aliases") or ())]:
+                tokens = tuple(tokenize(alias))
+                if tokens and tokens not in list_only:
+                    patterns.setdefault(tokens, (sid, False))
+            for tokens in list_only:
+                if tokens:
+                    patterns.setdefault(tokens, (sid, True))
+        for tokens, (sid, list_only) in patterns.items():
+            self._add(tokens, sid, list_only)
+        self._link()
+
+    def _add(self, tokens, sid, list_only):
+        state = 0
+        for token in tokens:
+            nxt = self.goto[state].get(token)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][token] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append(())
+            state = nxt
+        self.out[state] = ((len(tokens), sid, list_only),)
+
+    def _link(self):
+        """Breadth-first failure links; each state's outputs include its suffixes'."""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and token not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(token, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def scan(self, tokens, prose=False):
+        """Canonical ids in `tokens`, leftmost-longest, in order of appearance (may repeat)."""
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        found = []  # (start, end, id)
+        for end, token in enumerate(tokens, 1):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for length, sid, list_only in out[state]:
+                if not (prose and list_only):
+                    found.append((end - length, end, sid))
+        if not found:
+            return []
+        # Leftmost-longest, non-overlapping
+        found.sort(key=lambda m: (m[0], -m[1]))
+        ids, covered = [], 0
+        for start, end, sid in found:
+            if start >= covered:
+                ids.append(sid)
+                covered = end
+        return ids
+
+
+_automaton = None
+_lock = threading.Lock()
+
+
+def automaton():
+    """The compiled dictionary (built on first use, shared by every thread)."""
+    global _automaton
+    if _automaton is None:
+        with _lock:
+            if _automaton is None:
+                with open(SKILLS_DICTIONARY_PATH, encoding="utf-8") as f:
+                    _automaton = SkillAutomaton(json.load(f)["skills"])
+    return _automaton
+
+
+def reload():
+    """Recompiles the dictionary (after editing SKILLS_DICTIONARY_PATH)."""
+    global _automaton
+    with _lock:
+        _automaton = None
+    normalize_list.cache_clear()
+    return automaton()
+
+
+def skill(sid):
+    """{"id", "name", "category"} for a canonical id, or None."""
+    return automaton().skills.get(sid)
+
+
+@functools.lru_cache(maxsize=SKILL_CACHE_ENTRIES)
+def normalize_list(skills_list):
+    """
+    Maps a free-text skills_list to (canonical ids, unrecognized entries), both
+    de-duplicated in order. Category prefixes ("Languages: ...") are ignored.
+    """
+    ac = automaton()
+    ids, unknown = [], []
+    for item in _ITEM_SPLIT.split(skills_list or ""):
+        # "/" is not a token character: "HTML/CSS" scans as two skills, "CI/CD" as its alias
+        tokens = tokenize(item.rsplit(":", 1)[-1])
+        matched = ac.scan(tokens)
+        if matched:
+            ids.extend(matched)
+        elif tokens:
+            unknown.append(" ".join(tokens))
+    return tuple(dict.fromkeys(ids)), tuple(dict.fromkeys(unknown))
+
+
+def find_in_text(text):
+    """Canonical ids mentioned in prose (requirements, descriptions); listOnly aliases excluded."""
+    return list(dict.fromkeys(automaton().scan(tokenize(text), prose=True)))
+
+
+def normalize_resume(resume):
+    """
+    Adds "normalizedSkills" (canonical ids) to a parsed resume and to each of its
+    skills[] categories. Returns the resume.
+    """
+    if not isinstance(resume, dict):
+        return resume
+    with metrics.time_stage("skill_normalization"):
+        ids = []
+        for category in resume.get("skills") or []:
+            if isinstance(category, dict):
+                found, _ = normalize_list(str(category.get("skills_list") or ""))
+                category["normalizedSkills"] = list(found)
+                ids.extend(found)
+        resume["normalizedSkills"] = list(dict.fromkeys(ids))
+    return resume
@@ -0,0 +1,35 @@
+# backend/tests/conftest.py
+import os
+import sys
+import threading
+
+import pytest
+
+# Modules use absolute imports from the backend folder (as under gunicorn / `python app.py`)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def sqlite_store(tmp_path, monkeypatch):
+    """
+    sqlite_store(module, "X_PATH") points a SQLite-backed module at a fresh database
+    under tmp_path and drops its per-thread connections; returns the new path.
+    """
+    def isolate(module, setting, local="_local"):
+        path = str(tmp_path / f"{module.__name__}.sqlite3")
+        monkeypatch.setattr(module, setting, path)
+        monkeypatch.setattr(module, local, threading.local())
+        return path
+
+    return isolate
+
+
+@pytest.fixture
+def job_store(sqlite_store, monkeypatch):
+    """An empty job_search store: fresh database, index and result cache."""
+    import job_search
+
+    sqlite_store(job_search, "JOB_STORE_PATH")
+    monkeypatch.setattr(job_search, "_index", job_search.JobIndex())
+    monkeypatch.setattr(job_search, "_results", job_search.OrderedDict())
+    monkeypatch.setattr(job_search, "_last_seq", 0)
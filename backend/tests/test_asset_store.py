@@ -0,0 +1,20 @@
+# backend/tests/test_asset_store.py
+import asset_store
+
+
+def test_data_uri_counts_toward_the_cache_budget(monkeypatch):
+    monkeypatch.setattr(asset_store, "_assets", asset_store.OrderedDict())
+    monkeypatch.setattr(asset_store, "_assets_size", 0)
+    monkeypatch.setattr(asset_store, "ASSET_CACHE_MAX_BYTES", 300)
+    old, new = "a" * 64, "b" * 64
+    with asset_store._lock:
+        for asset_id in (old, new):
+            asset_store._remember(asset_id, {"bytes": b"\0" * 100, "mime": "image/png", "width": 1, "height": 1})
+    assert asset_store._assets_size == 200
+
+    uri = asset_store.asset_data_uri(new)
+    assert uri.startswith("data:image/png;base64,")
+    # 100 image bytes + the URI no longer fit next to the older record
+    assert list(asset_store._assets) == [new]
+    assert asset_store._assets_size == 100 + len(uri)
+    assert asset_store.asset_data_uri(new) is uri
@@ -0,0 +1,40 @@
+# backend/tests/test_bulk_export.py
+import io
+import json
+import time
+import zipfile
+
+import bulk_export
+import render_cache
+import render_service
+from render_service import RenderQueueFull
+
+
+def _unzip(chunks):
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    return archive, json.loads(archive.read("manifest.json"))
+
+
+def test_full_queue_gives_up_after_the_render_budget(monkeypatch):
+    def _refuse(kind, payload, timeout=None):
+        raise RenderQueueFull("Render queue is full")
+
+    monkeypatch.setattr(render_service, "submit", _refuse)
+    monkeypatch.setattr(render_service, "RENDER_TIMEOUT", 0.2)
+    monkeypatch.setattr(render_service, "RENDER_TIMEOUT_GRACE", 0)
+    items = [{"personal": {"name": f"Refused {i}"}} for i in range(2)]
+
+    started = time.monotonic()
+    archive, manifest = _unzip(bulk_export.stream_zip(items, "pdf"))
+    assert time.monotonic() - started < 2
+    assert manifest == [{"index": i, "ok": False, "error": "RenderQueueFull"} for i in range(2)]
+    assert archive.namelist() == ["manifest.json"]
+
+
+def test_etag_entries_are_named_after_the_cached_format():
+    render_cache.put("cached-pdf", b"%PDF-1.7 cached")
+    items = [{"etag": "cached-pdf", "personal": {"name": "Ada Example"}, "format": "docx"}]
+
+    archive, manifest = _unzip(bulk_export.stream_zip(items, "docx"))
+    assert manifest == [{"index": 0, "ok": True, "file": "Ada_Example.pdf", "mimeType": "application/pdf"}]
+    assert archive.read("Ada_Example.pdf") == b"%PDF-1.7 cached"
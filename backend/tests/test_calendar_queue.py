@@ -0,0 +1,90 @@
+# backend/tests/test_calendar_queue.py
+import pytest
+
+import calendar_queue
+from app import app
+
+EVENT = {
+    "summary": "Interview",
+    "startTime": "2030-03-04T10:00:00-05:00",
+    "endTime": "2030-03-04T11:00:00-05:00",
+    "attendees": ["ada@example.com"],
+}
+
+
+@pytest.fixture
+def client(sqlite_store, monkeypatch):
+    sqlite_store(calendar_queue, "CALENDAR_QUEUE_PATH")
+    monkeypatch.setattr(calendar_queue, "CALENDAR_QUEUE_WORKERS", 0)
+    app.config["TESTING"] = True
+    return app.test_client()
+
+
+def _queued():
+    return calendar_queue._connect().execute("SELECT COUNT(*) FROM calendar_jobs").fetchone()[0]
+
+
+def test_valid_event_is_queued(client):
+    response = client.post("/api/interviews/events", json=EVENT)
+    assert response.status_code == 202
+    assert response.get_json()["jobs"][0]["status"] == calendar_queue.QUEUED
+
+
+@pytest.mark.parametrize("change", [
+    {"attendees": "ada@example.com"},
+    {"attendees": ["ada@example.com", {"email": "bob@example.com"}]},
+    {"attendees": ["not an address"]},
+    {"startTime": "next monday"},
+    {"endTime": "2030-03-04T09:00:00-05:00"},
+    {"endTime": "2030-03-04T11:00:00"},
+])
+def test_invalid_event_gets_400_and_queues_nothing(client, change):
+    response = client.post("/api/interviews/events", json={"events": [EVENT, dict(EVENT, **change)]})
+    assert response.status_code == 400
+    assert response.get_json()["error"].startswith("events[1]: ")
+    assert _queued() == 0
+
+
+def test_backoff_grows_exponentially_up_to_the_cap(monkeypatch):
+    monkeypatch.setattr(calendar_queue.random, "uniform", lambda low, high: high)
+    assert [calendar_queue.backoff(n) for n in (1, 2, 3, 4)] == [2, 4, 8, 16]
+    assert calendar_queue.backoff(20) == calendar_queue.CALENDAR_QUEUE_BACKOFF_MAX
+
+
+def test_retryable_failures_back_off_then_fail(client, monkeypatch):
+    import httplib2
+    from googleapiclient.errors import HttpError
+
+    import google_calendar_utils
+
+    def unavailable(event, event_id=None):
+        raise HttpError(httplib2.Response({"status": 503}), b"backend unavailable")
+
+    monkeypatch.setattr(google_calendar_utils, "insert_event", unavailable)
+    monkeypatch.setattr(calendar_queue, "CALENDAR_QUEUE_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(calendar_queue, "backoff", lambda attempt: 0)
+    jid = client.post("/api/interviews/events", json=EVENT).get_json()["jobs"][0]["jobId"]
+
+    calendar_queue._run_job(calendar_queue._claim())
+    job = calendar_queue.get_job(jid)
+    assert (job["status"], job["attempts"]) == (calendar_queue.QUEUED, 1)
+    assert "503" in job["error"]
+
+    calendar_queue._run_job(calendar_queue._claim())
+    job = calendar_queue.get_job(jid)
+    assert (job["status"], job["attempts"]) == (calendar_queue.FAILED, 2)
+
+
+def test_idempotency_key_reuse(client):
+    first = client.post("/api/interviews/events", json=dict(EVENT, idempotencyKey="panel-7"))
+    again = client.post("/api/interviews/events", json=dict(EVENT, idempotencyKey="panel-7"))
+    assert again.status_code == 202
+    assert again.get_json()["jobs"][0]["jobId"] == first.get_json()["jobs"][0]["jobId"]
+
+    changed = client.post("/api/interviews/events", json=dict(EVENT, idempotencyKey="panel-7", summary="Other"))
+    assert changed.status_code == 409
+    assert changed.get_json() == {"error": "IDEMPOTENCY_KEY_REUSED", "jobId": first.get_json()["jobs"][0]["jobId"]}
+    event = {"summary": "Other", "start_time": EVENT["startTime"], "end_time": EVENT["endTime"]}
+    with pytest.raises(calendar_queue.IdempotencyConflict):
+        calendar_queue.enqueue_many([(event, None), (event, "panel-7")])
+    assert _queued() == 1
@@ -0,0 +1,32 @@
+# backend/tests/test_dedup_index.py
+import pytest
+
+import dedup_index
+
+RESUME = "Senior backend engineer building payment platforms in Python and Go for eight years at fintech startups"
+
+
+@pytest.fixture
+def index(sqlite_store):
+    sqlite_store(dedup_index, "DEDUP_INDEX_PATH")
+
+
+def test_rewritten_resume_is_a_text_match(index):
+    dedup_index.add("a", RESUME)
+    matches = dedup_index.check(RESUME + " Remote.")
+    assert [(m["candidateId"], m["reasons"]) for m in matches] == [("a", ["text"])]
+
+
+def test_resumes_without_words_do_not_match_each_other(index):
+    assert dedup_index.add("scan-1", "") == []
+    assert dedup_index.add("scan-2", "  • -- • ") == []
+    assert dedup_index.check("") == []
+    bands = dedup_index._connect().execute("SELECT COUNT(*) FROM dedup_bands").fetchone()[0]
+    assert bands == 0
+    assert dedup_index.duplicates_of("scan-1") == []
+
+
+def test_empty_resume_still_matches_on_contact(index):
+    dedup_index.add("a", RESUME, email="Jane@Example.com")
+    matches = dedup_index.add("scan", "", email="jane@example.com")
+    assert matches == [{"candidateId": "a", "similarity": None, "reasons": ["email"]}]
@@ -0,0 +1,79 @@
+# backend/tests/test_google_calendar_utils.py
+import datetime
+import threading
+
+import google.auth.credentials
+import google_auth_httplib2
+import httplib2
+import pytest
+
+import google_calendar_utils
+
+
+class FakeCredentials(google.auth.credentials.Credentials):
+    def __init__(self):
+        super().__init__()
+        self.token = "t0"
+        self.refresh_token = "r"
+        self.expiry = datetime.datetime.utcnow() - datetime.timedelta(minutes=1)
+        self.refreshes = 0
+
+    def refresh(self, request):
+        self.refreshes += 1
+        self.token = f"t{self.refreshes}"
+        self.expiry = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+
+
+class FakeHttp:
+    """httplib2.Http stand-in: 401 for tokens in `rejected`, else 200; records Authorization headers."""
+
+    def __init__(self, rejected=()):
+        self.rejected = set(rejected)
+        self.sent = []
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        token = headers["authorization"].split()[-1]
+        self.sent.append(token)
+        status = 401 if token in self.rejected else 200
+        return httplib2.Response({"status": status}), b"{}"
+
+
+@pytest.fixture
+def creds(monkeypatch):
+    creds = FakeCredentials()
+    saved = []
+    monkeypatch.setattr(google_calendar_utils, "_creds", creds)
+    monkeypatch.setattr(google_calendar_utils, "_save_credentials", saved.append)
+    creds.saved = saved
+    return creds
+
+
+def test_expired_token_is_refreshed_once_across_threads(creds):
+    barrier = threading.Barrier(8)
+    https = []
+
+    def call():
+        http = google_auth_httplib2.AuthorizedHttp(google_calendar_utils._thread_credentials(), http=FakeHttp())
+        https.append(http.http)
+        barrier.wait()
+        http.request("https://calendar.example/events")
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert creds.refreshes == 1
+    assert creds.saved == [creds]
+    assert all(http.sent == ["t1"] for http in https)
+
+
+def test_401_refreshes_once_then_retries(creds):
+    creds.refresh(None)  # valid "t1", which the server has revoked
+    first = google_auth_httplib2.AuthorizedHttp(google_calendar_utils._thread_credentials(), http=FakeHttp({"t1"}))
+    second = google_auth_httplib2.AuthorizedHttp(google_calendar_utils._thread_credentials(), http=FakeHttp({"t1"}))
+    first.request("https://calendar.example/events")
+    second.credentials.sent = "t1"  # sent before the first thread refreshed
+    second.credentials.refresh(None)
+    assert first.http.sent == ["t1", "t2"]
+    assert creds.refreshes == 2 and len(creds.saved) == 1
@@ -0,0 +1,65 @@
+# backend/tests/test_job_search.py
+import pytest
+
+import job_search
+
+
+@pytest.fixture
+def store(job_store):
+    job_search.put_jobs([{"id": f"py-{i}", "title": f"Python Developer {i}", "location": "Remote"} for i in range(200)])
+
+
+def test_cached_results_survive_unrelated_writes(store):
+    job_search.search("python")
+    (entry,) = job_search._results.values()
+    job_search.put_jobs([{"id": "cobol-1", "title": "COBOL Maintainer"}])
+    assert job_search.search("python")["total"] == 200
+    assert next(iter(job_search._results.values())) is entry
+
+
+def test_writes_touching_query_terms_refresh_results(store):
+    job_search.search("python")
+    job_search.put_jobs([{"id": "py-mars", "title": "Python Guru", "location": "Mars"}])
+    result = job_search.search("python")
+    assert result["total"] == 201
+    assert result["facets"]["location"] == {"Remote": 200, "Mars": 1}
+    job_search.delete_job("py-mars")
+    assert job_search.search("python")["total"] == 200
+
+
+def test_iso_created_at_is_accepted_and_orders_browse(store):
+    job_search.put_jobs([
+        {"id": "old", "title": "Python dev", "createdAt": "2024-05-01"},
+        {"id": "new", "title": "Python dev", "createdAt": "2030-01-01T09:30:00Z"},
+    ])
+    ids = [r["job"]["id"] for r in job_search.search("", limit=100)["results"]]
+    cursor = job_search.search("", limit=100, cursor=job_search.search("", limit=100)["nextCursor"])
+    ids += [r["job"]["id"] for r in cursor["results"]]
+    ids += [r["job"]["id"] for r in job_search.search("", limit=100, cursor=cursor["nextCursor"])["results"]]
+    assert ids[0] == "new" and ids[-1] == "old" and len(ids) == 202
+    assert job_search.get_job("old")["createdAt"] == "2024-05-01"
+
+
+@pytest.mark.parametrize("job", [
+    {"title": "Python dev", "createdAt": "last tuesday"},
+    {"title": "Python dev", "createdAt": True},
+    {"title": "Python dev", "location": {"city": "Austin"}},
+    {"title": "Python dev", "requirements": ["python", 3]},
+    {"title": ["Python dev"]},
+])
+def test_unindexable_jobs_are_rejected_before_writing(store, job):
+    with pytest.raises(ValueError):
+        job_search.put_jobs([{"id": "fine", "title": "Fine"}, job])
+    assert job_search.get_job("fine") is None
+    assert job_search.search("python")["total"] == 200
+
+
+def test_bad_stored_row_is_skipped_not_fatal(store):
+    conn = job_search._connect()
+    seq = conn.execute("SELECT MAX(seq) FROM jobs").fetchone()[0]
+    conn.execute("INSERT INTO jobs (id, seq, doc, deleted) VALUES (?, ?, ?, 0)",
+                 ("poison", seq + 1, '{"id": "poison", "title": "Python dev", "createdAt": "yesterday"}'))
+    assert job_search.search("python")["total"] == 200
+    assert job_search.get_job("poison") is None
+    job_search.put_jobs([{"id": "after", "title": "Python dev"}])
+    assert job_search.search("python")["total"] == 201
@@ -0,0 +1,93 @@
+# backend/tests/test_llm_endpoints.py
+import io
+
+import pytest
+from starlette.testclient import TestClient
+
+import async_api
+import file_parser
+import gemini_utils
+import resume_store
+from app import app
+
+RESUME = {"personal": {"name": "Ada Example"}, "skills": ["python"]}
+DOCX = b"PK\x03\x04" + b"\0" * 64
+
+
+class FlaskClient:
+    def __init__(self):
+        app.config["TESTING"] = True
+        self.client = app.test_client()
+
+    def pitch(self, body):
+        response = self.client.post("/api/generate-elevator-pitch", data=body, content_type="application/json")
+        return response.status_code, response.get_json()
+
+    def parse(self, files):
+        data = {name: (io.BytesIO(content), filename) for name, (filename, content) in files.items()}
+        response = self.client.post("/api/parse-resume", data=data, content_type="multipart/form-data")
+        return response.status_code, response.get_json()
+
+
+class AsgiClient:
+    def __init__(self):
+        self.client = TestClient(async_api.app)
+
+    def pitch(self, body):
+        response = self.client.post("/api/generate-elevator-pitch", content=body,
+                                    headers={"Content-Type": "application/json"})
+        return response.status_code, response.json()
+
+    def parse(self, files):
+        data = {name: (filename, io.BytesIO(content)) for name, (filename, content) in files.items()}
+        response = self.client.post("/api/parse-resume", files=data or {"other": ("x.txt", b"")})
+        return response.status_code, response.json()
+
+
+@pytest.fixture(params=[FlaskClient, AsgiClient], ids=["flask", "asgi"])
+def client(request, sqlite_store, monkeypatch):
+    sqlite_store(resume_store, "RESUME_STORE_PATH")
+    monkeypatch.setattr(gemini_utils, "generate_elevator_pitch", lambda resume: f"Meet {resume['personal']['name']}.")
+
+    async def pitch_async(resume):
+        return f"Meet {resume['personal']['name']}."
+
+    monkeypatch.setattr(gemini_utils, "generate_elevator_pitch_async", pitch_async)
+    return request.param()
+
+
+@pytest.mark.parametrize("body, expected", [
+    (b'{"resumeData": {"personal": {"name": "Ada Example"}}}', (200, {"elevatorPitch": "Meet Ada Example."})),
+    (b"not json", (400, {"error": "Missing or invalid resume data"})),
+    (b"[1, 2]", (400, {"error": "Missing or invalid resume data"})),
+    (b'{"resumeId": "missing"}', (404, {"error": "RESUME_NOT_FOUND"})),
+    (b'{"resumeId": "missing", "version": "x"}', (400, {"error": "version must be a positive integer"})),
+])
+def test_pitch_validation_matches(client, body, expected):
+    assert client.pitch(body) == expected
+
+
+def test_pitch_from_stored_resume(client):
+    resume_id = resume_store.save(RESUME)["resumeId"]
+    assert client.pitch(b'{"resumeId": "%s"}' % resume_id.encode()) == (200, {"elevatorPitch": "Meet Ada Example."})
+
+
+@pytest.mark.parametrize("files, expected", [
+    ({}, (400, {"error": "No file part in the request"})),
+    ({"file": ("", DOCX)}, (400, {"error": "No file selected"})),
+    ({"file": ("resume.pdf", b"just some text")}, (415, {"error": file_parser.UNSUPPORTED_FILE_TYPE})),
+])
+def test_parse_validation_matches(client, files, expected):
+    status, body = client.parse(files)
+    assert (status, body) == expected
+
+
+def test_async_failures_are_logged_as_errors(monkeypatch, caplog):
+    async def broken(resume):
+        raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr(gemini_utils, "generate_elevator_pitch_async", broken)
+    status, body = AsgiClient().pitch(b'{"resumeData": {"personal": {"name": "Ada Example"}}}')
+    assert (status, body) == (500, {"error": "ELEVATOR_PITCH_FAILED"})
+    (record,) = [r for r in caplog.records if r.name == "async_api"]
+    assert record.levelname == "ERROR" and record.exc_info[1].args == ("model unavailable",)
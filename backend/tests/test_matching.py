@@ -0,0 +1,61 @@
+# backend/tests/test_matching.py
+import pytest
+
+import job_search
+import matching
+
+
+def _resume(name, title, skills):
+    return {
+        "personal": {"name": name},
+        "experience": [{"jobTitle": title, "description": f"{title} work"}],
+        "skills": [{"category": "Technical", "skills_list": skills}],
+    }
+
+
+@pytest.fixture
+def indexed(job_store, sqlite_store, monkeypatch):
+    sqlite_store(matching, "MATCH_STORE_PATH")
+    monkeypatch.setattr(matching, "_matcher", matching.Matcher())
+    monkeypatch.setattr(matching, "_last_seq", 0)
+    monkeypatch.setattr(matching, "_jobs_seq", -1)
+    job_search.put_jobs([
+        {"id": "backend", "title": "Python Backend Engineer", "requirements": "Python, Django, PostgreSQL, AWS"},
+        {"id": "frontend", "title": "Frontend Developer", "requirements": "JavaScript, React, CSS"},
+        {"id": "data", "title": "Data Engineer", "requirements": "Python, Spark, AWS"},
+    ])
+    matching.add_resumes([
+        ("ada", _resume("Ada", "Backend Engineer", "Python, Django, PostgreSQL, Amazon Web Services")),
+        ("bob", _resume("Bob", "Data Engineer", "Python, Spark")),
+        ("cy", _resume("Cy", "Frontend Developer", "JS, React.js, CSS")),
+    ])
+
+
+def test_top_candidates_are_ranked_and_cut_at_k(indexed):
+    top = matching.top_candidates("backend", k=2)
+    assert [c["candidateId"] for c in top] == ["ada", "bob"]
+    assert top[0]["score"] > top[1]["score"] > 0
+    assert top[0]["matchedSkills"] == ["Amazon Web Services", "Django", "PostgreSQL", "Python"]
+    assert top[1]["matchedSkills"] == ["Python"]
+
+
+def test_top_jobs_skip_jobs_with_nothing_in_common(indexed):
+    assert [j["jobId"] for j in matching.top_jobs("bob", k=3)] == ["data", "backend"]
+    assert [j["jobId"] for j in matching.top_jobs("cy", k=3)] == ["frontend"]
+
+
+def test_both_rankings_come_from_one_pass(indexed):
+    result = matching.match(k=1)
+    assert {job: [c["candidateId"] for c in hits] for job, hits in result["candidatesByJob"].items()} == {
+        "backend": ["ada"], "frontend": ["cy"], "data": ["bob"],
+    }
+    assert {cid: [j["jobId"] for j in hits] for cid, hits in result["jobsByCandidate"].items()} == {
+        "ada": ["backend"], "bob": ["data"], "cy": ["frontend"],
+    }
+
+
+def test_unknown_and_removed_candidates(indexed):
+    with pytest.raises(ValueError):
+        matching.top_jobs("nobody")
+    matching.remove_candidate("cy")
+    assert [c["candidateId"] for c in matching.top_candidates("frontend")] == []
@@ -0,0 +1,81 @@
+# backend/tests/test_metrics.py
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+import metrics
+
+
+@pytest.fixture
+def store(sqlite_store, monkeypatch):
+    path = sqlite_store(metrics, "METRICS_STORE_PATH", local="_db")
+    # This process plays the gunicorn master: the workers below are its children
+    monkeypatch.setattr(metrics, "_generation", os.getpid)
+    for metric in metrics._registry:
+        monkeypatch.setattr(metric, "_values" if isinstance(metric, metrics.Counter) else "_series", {})
+    return path
+
+
+def _other_worker(path, errors):
+    """Records `errors` JSON errors in a child process and leaves its snapshot behind."""
+    code = (
+        "import metrics; metrics.METRICS_STORE_PATH = %r\n"
+        "metrics.LLM_JSON_ERRORS.inc(%d, provider='gemini')\n"
+        "metrics.STAGE_SECONDS.observe(0.02, stage='extraction')\n"
+        "metrics.flush()\n"
+        "import os; print(os.getpid())\n"
+    ) % (path, errors)
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, "-c", code], cwd=backend, capture_output=True, text=True, check=True)
+    return int(out.stdout)
+
+
+def _rows():
+    return metrics._connect().execute("SELECT generation, pid FROM process_metrics").fetchall()
+
+
+def test_scrape_sums_every_worker(store):
+    _other_worker(store, 2)
+    metrics.LLM_JSON_ERRORS.inc(provider="gemini")
+    metrics.STAGE_SECONDS.observe(0.2, stage="extraction")
+    text = metrics.render()
+    assert 'recruitedge_llm_json_errors_total{provider="gemini"} 3' in text
+    assert 'recruitedge_stage_duration_seconds_count{stage="extraction"} 2' in text
+    assert 'recruitedge_stage_duration_seconds_bucket{stage="extraction",le="0.025"} 1' in text
+
+
+def test_retired_workers_keep_counting(store):
+    metrics.retire(_other_worker(store, 2))
+    metrics.retire(_other_worker(store, 5))
+    assert 'recruitedge_llm_json_errors_total{provider="gemini"} 7' in metrics.render()
+    assert sorted(_rows()) == [(os.getpid(), metrics._RETIRED), (os.getpid(), os.getpid())]
+    body = metrics._connect().execute("SELECT body FROM process_metrics WHERE pid = 0").fetchone()[0]
+    assert json.loads(body)["recruitedge_stage_duration_seconds"][0][1][2] == 2
+
+
+def test_stale_rows_and_dead_generations_are_ignored(store, monkeypatch):
+    _other_worker(store, 2)
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    snapshot = {"recruitedge_llm_json_errors_total": [[["gemini"], 100]]}
+    conn = metrics._connect()
+    metrics._write_snapshot(conn, dead.pid, metrics._RETIRED, snapshot)  # an earlier server start
+    metrics._write_snapshot(conn, os.getpid(), 999999, snapshot)         # a worker that died unretired
+    conn.execute("UPDATE process_metrics SET updated_at = ? WHERE pid = 999999", (time.time() - 3600,))
+
+    assert 'recruitedge_llm_json_errors_total{provider="gemini"} 2' in metrics.render()
+    assert (dead.pid, metrics._RETIRED) not in _rows()
+    assert (os.getpid(), 999999) not in _rows()
+
+
+def test_observing_does_not_write_on_the_request_thread(store, monkeypatch):
+    writes = []
+    monkeypatch.setattr(metrics, "_write_snapshot", lambda *args: writes.append(args))
+    metrics.LLM_JSON_ERRORS.inc(provider="gemini")
+    metrics.STAGE_SECONDS.observe(0.1, stage="extraction")
+    assert writes == []
+    assert metrics._flusher is not None and metrics._flusher.daemon
@@ -0,0 +1,57 @@
+# backend/tests/test_profiling.py
+import asyncio
+
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+import async_api
+import gemini_utils
+import profiling
+
+
+def _busy(seconds):
+    deadline = asyncio.get_running_loop().time() + seconds
+    while asyncio.get_running_loop().time() < deadline:
+        pass
+
+
+async def _pitch(resume):
+    await asyncio.sleep(0.05)  # waiting on the LLM
+    _busy(0.05)                # shaping the answer on the loop thread
+    return "Pitch."
+
+
+def test_async_routes_are_profiled_per_task(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "ENABLED", True)
+    monkeypatch.setattr(profiling, "PROFILE_TOKEN", "secret")
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(profiling, "PROFILE_INTERVAL", 0.002)
+    monkeypatch.setattr(gemini_utils, "generate_elevator_pitch_async", _pitch)
+    app = Starlette(routes=async_api.app.routes, middleware=profiling.asgi_middleware())
+    client = TestClient(app)
+
+    response = client.post("/api/generate-elevator-pitch", json={"resumeData": {"skills": ["python"]}},
+                           headers={profiling.TOKEN_HEADER: "secret"})
+    assert response.status_code == 200
+    stacks = profiling.load(response.headers[profiling.ID_HEADER])
+    assert any(line.startswith("(awaiting);") and "_pitch (" in line for line in stacks.splitlines())
+    assert any("_busy (" in line for line in stacks.splitlines())
+
+    unprofiled = client.post("/api/generate-elevator-pitch", json={"resumeData": {"skills": ["python"]}})
+    assert profiling.ID_HEADER not in unprofiled.headers
+
+
+def test_disabled_profiling_adds_no_middleware(monkeypatch):
+    monkeypatch.setattr(profiling, "ENABLED", False)
+    assert profiling.asgi_middleware() == []
+
+
+def test_token_header_survives_cross_origin_preflight():
+    from app import app
+
+    headers = {"Origin": "http://localhost:3000", "Access-Control-Request-Method": "POST",
+               "Access-Control-Request-Headers": f"content-type,{profiling.TOKEN_HEADER.lower()}"}
+    flask_preflight = app.test_client().options("/api/render", headers=headers)
+    asgi_preflight = TestClient(async_api.app).options("/api/generate-elevator-pitch", headers=headers)
+    for response in (flask_preflight, asgi_preflight):
+        assert profiling.TOKEN_HEADER.lower() in response.headers["Access-Control-Allow-Headers"].lower()
@@ -0,0 +1,62 @@
+# backend/tests/test_resume_index.py
+import json
+
+import pytest
+
+import dedup_index
+import matching
+import resume_store
+from app import app
+
+RESUME = {
+    "personal": {"name": "Ada Example", "email": "ada@example.com"},
+    "experience": [{"jobTitle": "Data Engineer", "company": "Acme"}],
+    "skills": ["python", "spark"],
+}
+
+
+@pytest.fixture
+def client(sqlite_store):
+    for module, setting in ((resume_store, "RESUME_STORE_PATH"), (matching, "MATCH_STORE_PATH"),
+                            (dedup_index, "DEDUP_INDEX_PATH")):
+        sqlite_store(module, setting)
+    app.config["TESTING"] = True
+    return app.test_client()
+
+
+def _candidate(cid):
+    row = matching._connect().execute("SELECT doc, deleted FROM candidates WHERE id = ?", (cid,)).fetchone()
+    return None if row is None or row[1] else json.loads(row[0])
+
+
+def test_stored_resumes_are_indexed_under_their_resume_id(client):
+    resume_id = client.post("/api/resumes", json={"resumeData": RESUME}).get_json()["resumeId"]
+    assert _candidate(resume_id)["title"] == "Data Engineer"
+
+    experience = [{"jobTitle": "Staff Data Engineer", "company": "Acme"}]
+    assert client.patch(f"/api/resumes/{resume_id}", json={"sections": {"experience": experience}}).status_code == 200
+    assert _candidate(resume_id)["title"] == "Staff Data Engineer"
+
+    assert client.put(f"/api/resumes/{resume_id}", json={"resumeData": RESUME}).status_code == 200
+    assert _candidate(resume_id)["title"] == "Data Engineer"
+
+    assert client.delete(f"/api/resumes/{resume_id}").status_code == 204
+    assert _candidate(resume_id) is None
+
+
+def test_parsed_upload_uses_resume_id_as_candidate_id(client):
+    from file_parser import _post_process
+
+    result = _post_process({"parsedData": json.loads(json.dumps(RESUME))}, raw_text="Data engineer at Acme")
+    assert result["candidateId"] == result["resumeId"]
+    assert _candidate(result["resumeId"]) is not None
+    assert dedup_index.duplicates_of(result["resumeId"]) == []
+
+
+def test_patch_preflight_is_allowed(client):
+    response = client.options("/api/resumes/abc", headers={
+        "Origin": "http://localhost:3000",
+        "Access-Control-Request-Method": "PATCH",
+        "Access-Control-Request-Headers": "Content-Type",
+    })
+    assert "PATCH" in response.headers["Access-Control-Allow-Methods"]
@@ -0,0 +1,77 @@
+# backend/tests/test_scheduling.py
+import pytest
+
+import google_calendar_utils
+import scheduling
+from app import app
+
+WINDOW = ("2030-03-04T00:00:00-05:00", "2030-03-05T00:00:00-05:00")  # a Monday
+
+
+class _FakeFreeBusy:
+    def __init__(self, calendars):
+        self.calendars = calendars
+
+    def freebusy(self):
+        return self
+
+    def query(self, body):
+        self.body = body
+        return self
+
+    def execute(self):
+        return {"calendars": {item["id"]: self.calendars[item["id"]]
+                              for item in self.body["items"] if item["id"] in self.calendars}}
+
+
+@pytest.fixture
+def calendars(monkeypatch):
+    calendars = {}
+    monkeypatch.setattr(google_calendar_utils, "get_google_calendar_service", lambda: _FakeFreeBusy(calendars))
+    monkeypatch.setattr(scheduling, "_freebusy_cache", scheduling._TTLCache(0, 1))
+    return calendars
+
+
+def test_calendar_with_errors_is_not_reported_free(calendars):
+    calendars["ada@example.com"] = {"busy": []}
+    calendars["bob@example.com"] = {"busy": [], "errors": [{"domain": "global", "reason": "notFound"}]}
+    result = scheduling.find_slots(["ada@example.com", "bob@example.com", "eve@example.com"], *WINDOW)
+    assert result == {"slots": [], "errors": {"bob@example.com": ["notFound"], "eve@example.com": ["missing"]}}
+
+
+@pytest.mark.parametrize("change", [
+    {"workingDays": ["1"]},
+    {"workingDays": [7]},
+    {"workingDays": 1},
+    {"workingHours": {"start": "9am", "end": "17:00"}},
+    {"workingHours": {"start": 9, "end": 17}},
+    {"workingHours": "09:00-17:00"},
+])
+def test_bad_working_hours_or_days_get_400(calendars, change):
+    calendars["ada@example.com"] = {"busy": []}
+    body = dict({"participants": ["ada@example.com"], "timeMin": WINDOW[0], "timeMax": WINDOW[1]}, **change)
+    response = app.test_client().post("/api/interviews/slots", json=body)
+    assert response.status_code == 400
+    assert "working" in response.get_json()["error"]
+
+
+def test_merge_joins_overlapping_and_touching_blocks():
+    assert scheduling.merge_intervals([(5, 7), (1, 3), (3, 4), (6, 8), (10, 11)]) == [[1, 4], [5, 8], [10, 11]]
+
+
+def test_slots_avoid_everyone_busy_and_off_hours(calendars):
+    calendars["ada@example.com"] = {"busy": [{"start": "2030-03-04T14:00:00Z", "end": "2030-03-04T15:30:00Z"}]}
+    calendars["bob@example.com"] = {"busy": [{"start": "2030-03-04T16:00:00Z", "end": "2030-03-04T16:30:00Z"}]}
+    # Bob works 09:00-17:00 in London, i.e. until noon in New York
+    participants = ["ada@example.com", {"email": "bob@example.com", "timeZone": "Europe/London"}]
+    result = scheduling.find_slots(participants, *WINDOW, duration_minutes=30, limit=10)
+    assert result["errors"] == {}
+    assert [(s["start"], s["end"]) for s in result["slots"]] == [
+        ("2030-03-04T10:30:00-05:00", "2030-03-04T11:00:00-05:00"),
+        ("2030-03-04T11:30:00-05:00", "2030-03-04T12:00:00-05:00"),
+    ]
+
+
+def test_off_hours_cover_non_working_days(calendars):
+    calendars["ada@example.com"] = {"busy": []}
+    assert scheduling.find_slots(["ada@example.com"], *WINDOW, working_days=[1, 2, 3, 4])["slots"] == []
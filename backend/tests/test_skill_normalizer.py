@@ -0,0 +1,23 @@
+# backend/tests/test_skill_normalizer.py
+import pytest
+
+import skill_normalizer
+
+
+@pytest.mark.parametrize("skills_list, ids", [
+    ("JS, React.js, reactjs, Amazon Web Services", ("javascript", "react", "aws")),
+    ("Languages: Java, JavaScript", ("java", "javascript")),
+    ("Spring Boot; Node.js", ("spring", "nodejs")),
+    ("HTML/CSS, CI/CD", ("html", "css", "ci-cd")),
+])
+def test_aliases_and_multi_word_skills_normalize(skills_list, ids):
+    assert skill_normalizer.normalize_list(skills_list) == (ids, ())
+
+
+def test_unknown_entries_are_kept_apart():
+    assert skill_normalizer.normalize_list("Python, basket weaving, python") == (("python",), ("basket weaving",))
+
+
+def test_list_only_aliases_are_ignored_in_prose():
+    assert skill_normalizer.normalize_list("Go")[0] == ("go",)
+    assert skill_normalizer.find_in_text("We go to Google Cloud with Spring Boot") == ["gcp", "spring"]
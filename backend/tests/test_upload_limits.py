@@ -0,0 +1,78 @@
+# backend/tests/test_upload_limits.py
+import io
+
+import pytest
+
+import uploads
+from app import app
+
+
+@pytest.fixture
+def client():
+    app.config["TESTING"] = True
+    return app.test_client()
+
+
+def test_app_uses_spooling_request_class_and_body_cap():
+    assert app.request_class is uploads.UploadRequest
+    assert app.config["MAX_CONTENT_LENGTH"] == uploads.MAX_REQUEST_BYTES
+
+
+def test_oversized_request_body_gets_413(client, monkeypatch):
+    monkeypatch.setitem(app.config, "MAX_CONTENT_LENGTH", 1024)
+    response = client.post("/api/jobs", data=b"x" * 4096, content_type="application/json")
+    assert response.status_code == 413
+    assert response.get_json() == {"error": "UPLOAD_TOO_LARGE"}
+
+
+def test_oversized_resume_upload_gets_413(client, monkeypatch):
+    monkeypatch.setattr(uploads, "MAX_UPLOAD_BYTES", 1024)
+    response = client.post(
+        "/api/parse-resume",
+        data={"file": (io.BytesIO(b"%PDF-1.7\n" + b"0" * 4096), "resume.pdf")},
+        content_type="multipart/form-data",
+    )
+    assert response.status_code == 413
+    assert response.get_json() == {"error": "UPLOAD_TOO_LARGE"}
+
+
+def _chunked_upload(size):
+    head = (b'--b\r\nContent-Disposition: form-data; name="file"; filename="resume.pdf"\r\n'
+            b"Content-Type: application/pdf\r\n\r\n%PDF-1.7\n")
+    return head + b"0" * size + b"\r\n--b--\r\n"
+
+
+def test_chunked_upload_is_cut_off_at_the_cap(client, monkeypatch):
+    monkeypatch.setattr(uploads, "MAX_UPLOAD_BYTES", 1024)
+    # No Content-Length: only the stream limit stops the read
+    stream = io.BytesIO(_chunked_upload(1024 * 1024))
+    response = client.post("/api/parse-resume", input_stream=stream, content_type="multipart/form-data; boundary=b",
+                           environ_overrides={"wsgi.input_terminated": True})
+    assert response.status_code == 413
+    assert stream.tell() <= 64 * 1024
+
+
+def test_async_chunked_upload_is_cut_off_at_the_cap(monkeypatch):
+    import asyncio
+
+    import async_api
+
+    monkeypatch.setattr(uploads, "MAX_UPLOAD_BYTES", 1024)
+    data = _chunked_upload(1024 * 1024)
+    chunks = [data[i:i + 4096] for i in range(0, len(data), 4096)]
+    received, sent = [], []
+
+    async def receive():
+        chunk = chunks[len(received)]
+        received.append(chunk)
+        return {"type": "http.request", "body": chunk, "more_body": len(received) < len(chunks)}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": "/api/parse-resume", "raw_path": b"/api/parse-resume",
+             "root_path": "", "scheme": "http", "query_string": b"", "server": ("test", 80),
+             "headers": [(b"content-type", b"multipart/form-data; boundary=b")]}
+    asyncio.run(async_api.app(scope, receive, send))
+    assert sent[0]["status"] == 413
+    assert len(received) == 1
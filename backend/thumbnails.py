@@ -0,0 +1,114 @@
+# backend/thumbnails.py
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+from render_cache import ByteLRUCache
+
+# ------------------------------------------------------------
+# Low-DPI PNG thumbnails of a PDF's first page.
+# Thumbnails are keyed by sha256(PDF bytes + DPI) and kept in a
+# size-bounded LRU, so candidate lists re-requesting the same resume
+# are served from memory. Uploads are rasterized in the background
+# while the parser is still talking to the LLM.
+# ------------------------------------------------------------
+
+THUMBNAIL_DPI = int(os.getenv("THUMBNAIL_DPI", "48"))
+# Requested DPIs are clamped to this range (the raster grows with DPI squared)
+THUMBNAIL_MIN_DPI = int(os.getenv("THUMBNAIL_MIN_DPI", "24"))
+THUMBNAIL_MAX_DPI = int(os.getenv("THUMBNAIL_MAX_DPI", "300"))
+THUMBNAIL_CACHE_MAX_BYTES = int(os.getenv("THUMBNAIL_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+THUMBNAIL_WORKERS = int(os.getenv("THUMBNAIL_WORKERS", "2"))
+THUMBNAIL_WAIT_SECONDS = float(os.getenv("THUMBNAIL_WAIT_SECONDS", "10"))
+
+_cache = ByteLRUCache(THUMBNAIL_CACHE_MAX_BYTES)
+_lock = threading.Lock()
+_pending = {}  # thumbnail_id -> Future of a background render
+_executor = None
+
+
+def clamp_dpi(dpi) -> int:
+    """THUMBNAIL_DPI for None, else `dpi` as an int within THUMBNAIL_MIN_DPI..THUMBNAIL_MAX_DPI (ValueError if not a number)."""
+    if dpi is None:
+        return THUMBNAIL_DPI
+    if isinstance(dpi, bool) or not isinstance(dpi, (int, float, str)):
+        raise ValueError("dpi must be a number")
+    try:
+        dpi = int(float(dpi))
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError("dpi must be a number")
+    return min(max(dpi, THUMBNAIL_MIN_DPI), THUMBNAIL_MAX_DPI)
+
+
+def render_thumbnail(pdf_bytes: bytes, dpi: int = None) -> bytes:
+    """Rasterizes page one of `pdf_bytes` and returns PNG bytes."""
+    import fitz  # PyMuPDF
+
+    with metrics.time_stage("thumbnail"), fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        if doc.page_count == 0:
+            raise ValueError("PDF has no pages")
+        pix = doc.load_page(0).get_pixmap(dpi=clamp_dpi(dpi), alpha=False)
+        return pix.tobytes("png")
+
+
+def thumbnail_id(pdf_bytes: bytes, dpi: int = None) -> str:
+    h = hashlib.sha256(f"{clamp_dpi(dpi)}:".encode())
+    h.update(pdf_bytes)
+    return h.hexdigest()
+
+
+def thumbnail_for_pdf(pdf_bytes: bytes, dpi: int = None) -> str:
+    """Rasterizes (unless cached) and returns the thumbnail id."""
+    key = thumbnail_id(pdf_bytes, dpi)
+    if key not in _cache:
+        _cache.put(key, render_thumbnail(pdf_bytes, dpi))
+    return key
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=THUMBNAIL_WORKERS, thread_name_prefix="thumbnail")
+        return _executor
+
+
+def _finish(key, future):
+    with _lock:
+        _pending.pop(key, None)
+    if future.exception() is not None:
+        print(f"Thumbnail {key[:12]} failed: {future.exception()}")
+
+
+def submit_thumbnail(pdf_bytes: bytes, dpi: int = None) -> str:
+    """Queues a background rasterization and returns the id it will be stored under."""
+    key = thumbnail_id(pdf_bytes, dpi)
+    if key in _cache:
+        return key
+    with _lock:
+        if key in _pending:
+            return key
+    future = _get_executor().submit(thumbnail_for_pdf, pdf_bytes, dpi)
+    with _lock:
+        if not future.done():
+            _pending[key] = future
+    future.add_done_callback(lambda f: _finish(key, f))
+    return key
+
+
+def get_thumbnail(key: str, wait: float = None):
+    """PNG bytes for `key`; waits for an in-flight background render if there is one."""
+    body = _cache.get(key)
+    if body is not None:
+        return body
+    with _lock:
+        future = _pending.get(key)
+    if future is not None:
+        try:
+            future.result(timeout=THUMBNAIL_WAIT_SECONDS if wait is None else wait)
+        except Exception:
+            return None
+        return _cache.get(key)
+    return None
@@ -0,0 +1,57 @@
+# backend/uploads.py
+import os
+import tempfile
+import zipfile
+
+from flask import Request
+
+# ------------------------------------------------------------
+# Upload handling for resume files. Bodies over the cap are refused
+# from Content-Length before anything is read, and a body without one
+# (chunked) is cut off with a 413 as soon as the bytes read pass the
+# cap: Werkzeug wraps the input in a stream limited to the request's
+# max_content_length, async_api.py counts ASGI body messages. Multipart
+# files spool to disk past UPLOAD_SPOOL_BYTES, and the file type is
+# decided from magic bytes, not the filename, so extractors only ever
+# see a stream of the format they expect.
+# ------------------------------------------------------------
+
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+# Cap for every other request body (JSON payloads with inline images, bulk exports)
+MAX_REQUEST_BYTES = int(os.getenv("MAX_REQUEST_BYTES", str(64 * 1024 * 1024)))
+UPLOAD_SPOOL_BYTES = int(os.getenv("UPLOAD_SPOOL_BYTES", str(512 * 1024)))
+
+_PDF_MAGIC = b"%PDF-"
+_ZIP_MAGIC = b"PK\x03\x04"
+_PDF_HEADER_WINDOW = 1024  # readers accept a little junk before %PDF-
+
+
+class UploadRequest(Request):
+    """Flask request whose multipart files spool to disk past UPLOAD_SPOOL_BYTES."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_BYTES, mode="rb+")
+
+
+def sniff(stream):
+    """
+    Returns "pdf", "docx" or None from the stream's content. The stream must be
+    seekable; it is left at position 0.
+    """
+    stream.seek(0)
+    head = stream.read(_PDF_HEADER_WINDOW)
+    stream.seek(0)
+
+    if _PDF_MAGIC in head:
+        return "pdf"
+    if head.startswith(_ZIP_MAGIC):
+        try:
+            with zipfile.ZipFile(stream) as package:
+                names = package.namelist()
+        except zipfile.BadZipFile:
+            return None
+        finally:
+            stream.seek(0)
+        if "word/document.xml" in names:
+            return "docx"
+    return None
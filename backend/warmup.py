@@ -0,0 +1,70 @@
+# backend/warmup.py
+import os
+import threading
+import time
+
+# ------------------------------------------------------------
+# Heavy imports loaded once in the gunicorn master (preload_app),
+# so every forked web worker starts with weasyprint / genai /
+# python-docx already imported instead of paying for the imports on
+# its first request. Render pool processes don't inherit any of it:
+# they are spawned (RENDER_START_METHOD) as fresh interpreters and
+# warm themselves up in render_service._warm_worker.
+# Nothing here starts threads or opens sockets: that must happen
+# after fork (see post_fork in gunicorn.conf.py).
+#
+# WARMUP=preload     import everything before serving (default)
+# WARMUP=background  serve /api/health at once, warm up in a thread
+# WARMUP=off         each dependency loads on the first request using it
+# ------------------------------------------------------------
+
+WARMUP = os.getenv("WARMUP", "preload")
+
+_MODULES = (
+    "weasyprint",
+    "google.generativeai",
+    "docx",
+    "pypdf",
+    "fitz",
+    "jinja2",
+    "bs4",
+)
+
+
+def preload():
+    """Imports the heavy dependencies, compiles the resume template and the skill dictionary. Returns seconds spent."""
+    import importlib
+
+    start = time.perf_counter()
+    for name in _MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            print(f"Preload skipped {name}: {e}")
+
+    from document_generator import _get_template
+    _get_template()
+
+    from docx_engine import _get_template as _get_docx_template
+    _get_docx_template()
+
+    import skill_normalizer
+    skill_normalizer.automaton()
+
+    return time.perf_counter() - start
+
+
+def start_background():
+    """Preloads and starts the render pool in a daemon thread (call after fork)."""
+    def _run():
+        try:
+            seconds = preload()
+            import render_service
+            render_service.start()
+            print(f"Background warm-up finished in {seconds:.2f}s")
+        except Exception as e:
+            print(f"Background warm-up failed: {e}")
+
+    thread = threading.Thread(target=_run, name="warmup", daemon=True)
+    thread.start()
+    return thread
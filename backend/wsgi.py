@@ -0,0 +1,18 @@
+# backend/wsgi.py
+# Production WSGI entry point: `gunicorn -c gunicorn.conf.py wsgi:app`
+import logging
+
+import warmup
+
+if warmup.WARMUP == "preload":
+    print(f"Preloaded heavy modules in {warmup.preload():.2f}s")
+
+from app import app  # noqa: E402,F401
+
+# Route app.logger (route errors, render warnings) and the async routes' logger
+# (async_api.py, served under asgi.py) through gunicorn's error log
+_gunicorn_logger = logging.getLogger("gunicorn.error")
+if _gunicorn_logger.handlers:
+    for _logger in (app.logger, logging.getLogger("async_api")):
+        _logger.handlers = _gunicorn_logger.handlers
+        _logger.setLevel(_gunicorn_logger.level)